@@ -0,0 +1,11 @@
+"""
+Moved to gametheory.analysis_server, this keeps the old import and command line working
+"""
+import sys
+
+from gametheory import analysis_server
+
+if __name__ == '__main__':
+    analysis_server.main()
+else:
+    sys.modules[__name__] = analysis_server
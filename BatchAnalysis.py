@@ -0,0 +1,11 @@
+"""
+Moved to gametheory.batch_analysis, this keeps the old import and command line working
+"""
+import sys
+
+from gametheory import batch_analysis
+
+if __name__ == '__main__':
+    batch_analysis.main()
+else:
+    sys.modules[__name__] = batch_analysis
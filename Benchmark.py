@@ -0,0 +1,11 @@
+"""
+Moved to gametheory.benchmark, this keeps the old import and command line working
+"""
+import sys
+
+from gametheory import benchmark
+
+if __name__ == '__main__':
+    sys.exit(benchmark.main())
+else:
+    sys.modules[__name__] = benchmark
@@ -0,0 +1,9 @@
+"""
+Moved to gametheory.instrumentation, this keeps the old import working
+"""
+import sys
+
+from gametheory import instrumentation
+
+# Importing this module hands out the moved one, so both names refer to the same functions and module state
+sys.modules[__name__] = instrumentation
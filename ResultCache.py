@@ -0,0 +1,9 @@
+"""
+Moved to gametheory.result_cache, this keeps the old import working
+"""
+import sys
+
+from gametheory import result_cache
+
+# Importing this module hands out the moved one, so both names refer to the same functions and module state
+sys.modules[__name__] = result_cache
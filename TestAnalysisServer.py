@@ -0,0 +1,119 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from gametheory import analysis_server
+from gametheory.analysis_server import AnalysisService, start_server
+from gametheory.batch_analysis import game_record
+from gametheory.game_generators import format_payoff
+from gametheory.normal_form_game import NormalFormGame
+
+
+def small_games(num_games: int, rows: int, cols: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 3, (num_games, rows, cols, 2))
+
+
+class TestAnalysisService(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.service = AnalysisService(workers=1, batch_window=0.05)
+        self.server = await start_server(self.service, port=0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.service.close()
+
+    async def request(self, method: str, path: str, body: bytes = b"", content_type: str = "text/plain"):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(f"{method} {path} HTTP/1.1\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        status = int((await reader.readline()).split()[1])
+        headers = {}
+        while (line := await reader.readline()).strip():
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        response = json.loads(await reader.readexactly(int(headers["content-length"])))
+        writer.close()
+        await writer.wait_closed()
+        return status, response
+
+    async def test_batches_same_shape(self):
+        stack = small_games(12, 3, 3)
+        bodies = [format_payoff(payoff_array).encode() for payoff_array in stack]
+        responses = await asyncio.gather(*(self.request("POST", "/analyze", body) for body in bodies))
+        for payoff_array, (status, record) in zip(stack, responses):
+            self.assertEqual(status, 200)
+            expected = json.loads(json.dumps(game_record(NormalFormGame(payoff_array))))
+            self.assertEqual(record, expected)
+        status, metrics = await self.request("GET", "/metrics")
+        self.assertEqual(status, 200)
+        self.assertEqual(metrics["requests"], 12)
+        self.assertLess(metrics["batches"], 12)
+        self.assertEqual(metrics["latency"]["samples"], 12)
+        self.assertLessEqual(metrics["latency"]["p50_ms"], metrics["latency"]["p99_ms"])
+
+    async def test_json_and_mixed(self):
+        pennies = [[[1, -1], [-1, 1]], [[-1, 1], [1, -1]]]
+        body = json.dumps({"payoffs": pennies, "mixed": True}).encode()
+        status, record = await self.request("POST", "/analyze", body, "application/json")
+        self.assertEqual(status, 200)
+        self.assertTrue(record["zero_sum"])
+        self.assertAlmostEqual(record["value"], 0)
+        np.testing.assert_allclose(record["mixed_equilibria"], [[[0.5, 0.5], [0.5, 0.5]]], atol=1e-6)
+
+        status, record = await self.request("POST", "/analyze?mixed=true", b"2 2\n1 2 3 4\n4 3 2 1\n")
+        self.assertEqual(status, 200)
+        self.assertEqual(len(record["mixed_equilibria"]), 1)
+
+    async def test_errors(self):
+        self.assertEqual((await self.request("POST", "/analyze", b"2 2\n1 2\n"))[0], 400)
+        self.assertEqual((await self.request("POST", "/analyze", b"{", "application/json"))[0], 400)
+        for mixed in ("false", "0", False):
+            body = json.dumps({"game": "2 2\n1 2 3 4\n4 3 2 1", "mixed": mixed}).encode()
+            status, record = await self.request("POST", "/analyze", body, "application/json")
+            self.assertEqual(status, 200)
+            self.assertNotIn("mixed_equilibria", record)
+        for mixed in ("maybe", 1, None):
+            body = json.dumps({"game": "2 2\n1 2 3 4\n4 3 2 1", "mixed": mixed}).encode()
+            self.assertEqual((await self.request("POST", "/analyze", body, "application/json"))[0], 400)
+        self.assertEqual((await self.request("POST", "/analyze?mixed=maybe", b"2 2\n1 2 3 4\n4 3 2 1\n"))[0], 400)
+        self.assertEqual((await self.request("GET", "/analyze"))[0], 405)
+        self.assertEqual((await self.request("GET", "/nowhere"))[0], 404)
+
+    async def test_analysis_errors(self):
+        with mock.patch("gametheory.analysis_server._analyze_batch", side_effect=ValueError("no analysis")):
+            status, response = await self.request("POST", "/analyze", b"2 2\n1 2 3 4\n4 3 2 1\n")
+        self.assertEqual((status, response), (500, {"error": "ValueError: no analysis"}))
+        self.assertEqual(self.service.metrics()["errors"], 1)
+
+    async def test_bad_game_fails_alone(self):
+        analyze_batch = analysis_server._analyze_batch
+
+        def fail_on_bad_game(payoff_arrays):
+            if any((payoff_array == 99).any() for payoff_array in payoff_arrays):
+                raise ValueError("bad game")
+            return analyze_batch(payoff_arrays)
+
+        stack = small_games(6, 3, 3)
+        stack[2, 0, 0, 0] = 99
+        bodies = [format_payoff(payoff_array).encode() for payoff_array in stack]
+        with mock.patch("gametheory.analysis_server._analyze_batch", side_effect=fail_on_bad_game):
+            responses = await asyncio.gather(*(self.request("POST", "/analyze", body) for body in bodies))
+        self.assertEqual([status for status, _ in responses], [200, 200, 500, 200, 200, 200])
+        self.assertLess(self.service.metrics()["batches"], 6)
+        self.assertEqual(responses[0][1], json.loads(json.dumps(game_record(NormalFormGame(stack[0])))))
+
+    async def test_backpressure(self):
+        self.service.max_pending = 2
+        body = format_payoff(small_games(1, 2, 2)[0]).encode()
+        responses = await asyncio.gather(*(self.request("POST", "/analyze", body) for _ in range(5)))
+        self.assertEqual(sorted(status for status, _ in responses), [200, 200, 503, 503, 503])
+        self.assertEqual(self.service.metrics()["rejected"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+
+from gametheory.automaton import Automaton, play_automata
+from gametheory.player import AlwaysCooperate, AlwaysDefect, AutomatonPlayer, FictitiousPlay, Game, Grudge, \
+    PlaySpecificStrategy, Random, RandomChoice, TitForTat
+
+PRISONERS_DILEMMA = [[(2, 2), (-1, 3)], [(3, -1), (0, 0)]]
+
+
+# Players remember their opponent across games, so every match gets new ones
+DETERMINISTIC_PLAYERS = [TitForTat, Grudge, AlwaysDefect, AlwaysCooperate, lambda: PlaySpecificStrategy(1, "B"),
+                         lambda: RandomChoice([0], "Only A")]
+
+
+class TestAutomaton(unittest.TestCase):
+    def test_converted_strategies_play_the_same(self):
+        payoff_array = np.random.default_rng(0).integers(-5, 6, (2, 2, 2))
+        for player1 in DETERMINISTIC_PLAYERS:
+            for player2 in DETERMINISTIC_PLAYERS:
+                automaton1, automaton2 = player1().to_automaton(), player2().to_automaton()
+                expected = Game(50, player1(), player2(), payoff_array, quiet=True)
+                played = Game(50, AutomatonPlayer(automaton1), AutomatonPlayer(automaton2), payoff_array, quiet=True)
+                self.assertEqual((played.player1_score, played.player2_score),
+                                 (expected.player1_score, expected.player2_score))
+                self.assertEqual(play_automata(automaton1, automaton2, payoff_array, 50),
+                                 (expected.player1_score, expected.player2_score))
+
+    def test_cycles(self):
+        # Tit for Tat against a machine alternating its actions falls into a cycle of length two after one round
+        alternate = Automaton([0, 1], [[1, 1], [0, 0]], 0, "Alternate")
+        tit_for_tat = TitForTat().to_automaton()
+        for rounds in (0, 1, 2, 3, 10, 11, 1001):
+            expected = Game(rounds, AutomatonPlayer(tit_for_tat), AutomatonPlayer(alternate), PRISONERS_DILEMMA,
+                            quiet=True)
+            self.assertEqual(play_automata(tit_for_tat, alternate, PRISONERS_DILEMMA, rounds),
+                             (expected.player1_score, expected.player2_score))
+
+    def test_long_matches(self):
+        # Tit for Tat against a machine alternating its actions scores (2, 2) every two rounds once in its cycle
+        alternate = Automaton([0, 1], [[1, 1], [0, 0]], 0, "Alternate")
+        tit_for_tat = TitForTat().to_automaton()
+        replays = [Game(rounds, AutomatonPlayer(tit_for_tat), AutomatonPlayer(alternate), PRISONERS_DILEMMA, quiet=True)
+                   for rounds in (10_000, 10_002)]
+        scores = [(replay.player1_score, replay.player2_score) for replay in replays]
+        self.assertEqual(play_automata(tit_for_tat, alternate, PRISONERS_DILEMMA, 10_000), scores[0])
+        # Every further cycle adds what the replay scored in its last two rounds
+        cycles = (10 ** 9 - 10_000) // 2
+        expected = tuple(score + cycles * (longer - score) for score, longer in zip(*scores))
+        self.assertEqual(play_automata(tit_for_tat, alternate, PRISONERS_DILEMMA, 10 ** 9), expected)
+        self.assertEqual(play_automata(TitForTat().to_automaton(), AlwaysDefect().to_automaton(), PRISONERS_DILEMMA,
+                                       10 ** 9), (-1, 3))
+
+    def test_more_actions(self):
+        payoff_array = np.random.default_rng(1).integers(-5, 6, (3, 3, 2))
+        for player1 in (TitForTat, Grudge):
+            for player2 in (TitForTat, lambda: PlaySpecificStrategy(2, "C"), Grudge):
+                expected = Game(20, player1(), player2(), payoff_array, quiet=True)
+                self.assertEqual(play_automata(player1().to_automaton(3), player2().to_automaton(3), payoff_array, 20),
+                                 (expected.player1_score, expected.player2_score))
+
+    def test_not_convertible(self):
+        for player in (Random(), RandomChoice([0, 1], "Random"), FictitiousPlay()):
+            with self.assertRaises(ValueError):
+                player.to_automaton()
+        with self.assertRaises(ValueError):
+            Automaton([0, 1], [[0, 2], [1, 1]])
+        with self.assertRaises(ValueError):
+            play_automata(Automaton([0], [[0]]), AlwaysDefect().to_automaton(), PRISONERS_DILEMMA, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from gametheory.batch_analysis import analyze_game, run_batch
+
+
+class TestBatchAnalysis(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.directory.name, "results.jsonl")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def read_output(self) -> dict:
+        with open(self.output) as file:
+            return {record["path"]: record for record in map(json.loads, file)}
+
+    def test_analyze_game(self):
+        result = json.loads(json.dumps(analyze_game("data/prog4A.txt")))
+        self.assertEqual(result["strongly_dominated"], [[[], [2]]])
+        self.assertEqual(result["pure_equilibria"], ['AW', 'AX', 'BZ'])
+        self.assertEqual(result["maximin"]["col_value"], 3)
+
+    def test_zero_sum_game(self):
+        path = os.path.join(self.directory.name, "pennies.txt")
+        with open(path, "w") as file:
+            file.write("2 2\n1 -1 -1 1\n-1 1 1 -1\n")
+        result = analyze_game(path)
+        self.assertTrue(result["zero_sum"])
+        self.assertAlmostEqual(result["value"], 0)
+        self.assertEqual(len(result["mixed_equilibria"]), 1)
+        self.assertFalse(analyze_game("data/prog4A.txt", mixed=False)["zero_sum"])
+
+    def test_bad_file(self):
+        path = os.path.join(self.directory.name, "bad.txt")
+        with open(path, "w") as file:
+            file.write("2 2\n1 2\n")
+        self.assertIn("error", analyze_game(path))
+
+    def test_resume(self):
+        self.assertEqual(run_batch(["data"], self.output, workers=2, mixed=False), 3)
+        first = self.read_output()
+        self.assertEqual(sorted(first), ["data/prog4A.txt", "data/prog4B.txt", "data/prog4C.txt"])
+        self.assertEqual(run_batch(["data/*.txt"], self.output, workers=1, resume=True, mixed=False), 0)
+        self.assertEqual(self.read_output(), first)
+
+    def test_interrupted_resume_keeps_results(self):
+        games = os.path.join(self.directory.name, "games")
+        os.mkdir(games)
+        shutil.copy("data/prog4A.txt", games)
+        run_batch([games], self.output, workers=1, mixed=False)
+        first = self.read_output()
+        shutil.copy("data/prog4B.txt", games)
+        with mock.patch("gametheory.batch_analysis.analyze_game", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                run_batch([games], self.output, workers=1, resume=True, mixed=False)
+        self.assertEqual(self.read_output(), first)
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["games", "results.jsonl"])
+
+    def test_cache(self):
+        cache_directory = os.path.join(self.directory.name, "cache")
+        first = analyze_game("data/prog4A.txt", mixed=False, cache_directory=cache_directory)
+        second = analyze_game("data/prog4A.txt", mixed=False, cache_directory=cache_directory)
+        self.assertEqual((first.pop("cached"), second.pop("cached")), (False, True))
+        self.assertEqual(second, first)
+
+
+if __name__ == '__main__':
+    unittest.main()
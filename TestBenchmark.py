@@ -0,0 +1,87 @@
+import contextlib
+import copy
+import io
+import unittest
+
+import numpy as np
+
+from gametheory.benchmark import BENCHMARK_NAMES, compare_results, compare_startup, main, parse_importtime, \
+    run_benchmarks, run_startup_benchmarks
+from gametheory.game_generators import GAME_GENERATORS, coordination_game, dominance_solvable_game, format_payoff, \
+    zero_sum_game
+from gametheory.normal_form_game import NormalFormGame, parse_payoff_array
+
+
+class TestGameGenerators(unittest.TestCase):
+    def test_seeded(self):
+        for generator in GAME_GENERATORS.values():
+            self.assertEqual(generator(4, 5, 3).tolist(), generator(4, 5, 3).tolist())
+            self.assertEqual(generator(4, 5, 3).shape, (4, 5, 2))
+
+    def test_zero_sum(self):
+        payoff_array = zero_sum_game(6, 7, 0)
+        self.assertTrue((payoff_array.sum(axis=-1) == 0).all())
+
+    def test_coordination(self):
+        game = NormalFormGame(coordination_game(5, 5, 0))
+        self.assertEqual(game.find_pure_equilibrium_profiles(), [(i, i) for i in range(5)])
+
+    def test_dominance_solvable(self):
+        game = NormalFormGame(dominance_solvable_game(40, 40, 0))
+        eliminated = game.eliminate_dominated_strategies()
+        self.assertEqual(sum(len(rows) for rows, _ in eliminated), 39)
+        self.assertEqual(sum(len(cols) for _, cols in eliminated), 39)
+        self.assertEqual(len(game.find_nash_equilibria()), 1)
+
+    def test_format_payoff(self):
+        payoff_array = GAME_GENERATORS["random"](3, 4, 0)
+        self.assertEqual(parse_payoff_array(format_payoff(payoff_array)).tolist(), payoff_array.tolist())
+
+
+class TestBenchmark(unittest.TestCase):
+    def test_run_benchmarks(self):
+        results = run_benchmarks(["random"], [2, 5], repeats=2)
+        self.assertEqual(len(results["results"]), 2 * len(BENCHMARK_NAMES))
+        self.assertTrue(all(result["seconds"] <= result["median"] for result in results["results"]))
+
+    def test_compare_flags_regressions(self):
+        baseline = run_benchmarks(["zero-sum"], [3], ["find_nash_equilibria", "parse_payoff"], repeats=1)
+        current = copy.deepcopy(baseline)
+        self.assertEqual(compare_results(baseline, current), [])
+        current["results"][0]["seconds"] = baseline["results"][0]["seconds"] + 1
+        regressions = compare_results(baseline, current)
+        self.assertEqual([regression["benchmark"] for regression in regressions], ["find_nash_equilibria"])
+
+    def test_main(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main(["run", "-o", "/dev/null", "--generators", "random", "--sizes", "2",
+                                   "--benchmarks", "find_minimax_strategy", "--repeats", "1"]), 0)
+
+
+class TestStartupBenchmark(unittest.TestCase):
+    def test_parse_importtime(self):
+        seconds, modules = parse_importtime("import time: self [us] | cumulative | imported package\n"
+                                            "import time:       120 |        120 |   _io\n"
+                                            "import time:      1000 |       1120 | numpy\n")
+        self.assertAlmostEqual(seconds, 1120e-6)
+        self.assertEqual(modules, {"_io", "numpy"})
+
+    def test_commands_skip_heavy_imports(self):
+        results = run_startup_benchmarks(repeats=1)
+        self.assertEqual({result["command"]: result["forbidden"] for result in results["results"]},
+                         {"help": [], "analyze": [], "simulate": [], "tournament": [], "main": []})
+        self.assertEqual(compare_startup(None, results), [])
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": [{"command": "help", "seconds": 0.02, "forbidden": []},
+                                {"command": "simulate", "seconds": 0.1, "forbidden": []}]}
+        current = copy.deepcopy(baseline)
+        self.assertEqual(compare_startup(baseline, current), [])
+        current["results"][0]["seconds"] = 0.1
+        current["results"][1]["forbidden"] = ["scipy"]
+        self.assertEqual([regression["command"] for regression in compare_startup(baseline, current)],
+                         ["help", "simulate"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import contextlib
+import io
+import subprocess
+import sys
+import unittest
+
+import gametheory
+from gametheory.cli import PLAYERS, main
+
+
+class TestPackage(unittest.TestCase):
+    def test_import_is_lazy(self):
+        # A fresh interpreter, since this one has imported numpy already
+        code = "import sys, gametheory; print(sorted({'numpy', 'gametheory.normal_form_game', 'gametheory.player'} & set(sys.modules)))"
+        completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(completed.stdout.strip(), "[]")
+
+    def test_exports(self):
+        from gametheory.normal_form_game import NormalFormGame
+        from gametheory.player import TitForTat
+        self.assertIs(gametheory.NormalFormGame, NormalFormGame)
+        self.assertIs(gametheory.TitForTat, TitForTat)
+        self.assertIn("run_tournament", dir(gametheory))
+        for name in gametheory.__all__:
+            self.assertIsNotNone(getattr(gametheory, name))
+        with self.assertRaises(AttributeError):
+            gametheory.missing
+
+    def test_old_imports(self):
+        # The modules used to sit at the top of the repository, and those names still hand out the moved modules
+        import NormalFormGame
+        import Player
+        from gametheory import normal_form_game, player
+        self.assertIs(NormalFormGame, normal_form_game)
+        self.assertIs(Player, player)
+        self.assertIs(NormalFormGame.NormalFormGame, gametheory.NormalFormGame)
+
+
+class TestCli(unittest.TestCase):
+    def run_main(self, argv) -> str:
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(main(argv), 0)
+        return output.getvalue()
+
+    def test_analyze(self):
+        self.assertIn("Pure Strategy Equilibria: AW, AX, BZ", self.run_main(["analyze", "data/prog4A.txt"]))
+
+    def test_simulate(self):
+        output = self.run_main(["simulate", "tit-for-tat", "always-defect", "--rounds", "10"])
+        self.assertIn("Player 1 scored: -1 using Tit for Tat", output)
+        output = self.run_main(["simulate", "random", "grudge", "--game", "data/prog4B.txt", "--seed", "0"])
+        self.assertIn("End of 1000 simulations", output)
+
+    def test_tournament(self):
+        output = self.run_main(["tournament", "--players", "tit-for-tat", "always-defect", "--rounds", "10",
+                                "-j", "1"])
+        # Each meets itself and the other in both seats, Tit for Tat scores 20 a seat against itself and -1 against
+        # Always Defect, which scores 3 against Tit for Tat and 0 against itself
+        self.assertEqual(output.split()[3:], ["tit-for-tat", "38", "4", "always-defect", "6", "4"])
+
+    def test_tournament_on_data_games(self):
+        # Tit for Tat copies the column player's actions, which the row player of the 2x3 and 2x4 games lacks, so
+        # those pairings are skipped instead of crashing the tournament
+        output = self.run_main(["tournament", "--games", "data/*.txt", "--rounds", "5", "-j", "1"])
+        lines = output.splitlines()
+        self.assertEqual(sorted(line.split()[0] for line in lines[1:-1]), sorted(PLAYERS))
+        self.assertTrue(lines[-1].startswith("Skipped"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+from gametheory.batch_analysis import equilibrium_record
+from gametheory.equilibria import lemke_howson, lemke_howson_all_labels, solve_zero_sum, solve_zero_sum_iterative, \
+    solve_zero_sum_lp, support_enumeration
+from gametheory.game_generators import random_game
+from gametheory.normal_form_game import NormalFormGame
+
+
+def is_equilibrium(payoff_array, row_strategy, col_strategy, tolerance=1e-7):
+    player1_payoffs = payoff_array[:, :, 0]
+    player2_payoffs = payoff_array[:, :, 1]
+    row_value = row_strategy @ player1_payoffs @ col_strategy
+    col_value = row_strategy @ player2_payoffs @ col_strategy
+    return (player1_payoffs @ col_strategy).max() <= row_value + tolerance and \
+        (row_strategy @ player2_payoffs).max() <= col_value + tolerance
+
+
+class TestEquilibria(unittest.TestCase):
+    def setUp(self):
+        self.battle_of_the_sexes = np.array([
+            [(4, 3), (0, 0)],
+            [(0, 0), (3, 4)]
+        ])
+
+    def test_support_enumeration(self):
+        equilibria = support_enumeration(self.battle_of_the_sexes)
+        self.assertEqual(len(equilibria), 3)
+        np.testing.assert_allclose(equilibria[2][0], [4 / 7, 3 / 7])
+        np.testing.assert_allclose(equilibria[2][1], [3 / 7, 4 / 7])
+
+    def test_lemke_howson(self):
+        row_strategy, col_strategy = lemke_howson(self.battle_of_the_sexes, 0)
+        np.testing.assert_allclose(row_strategy, [1, 0])
+        np.testing.assert_allclose(col_strategy, [1, 0])
+        self.assertIsNone(lemke_howson(self.battle_of_the_sexes, 0, max_pivots=1))
+
+    def test_random_games(self):
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            payoff_array = rng.standard_normal(tuple(rng.integers(1, 5, 2)) + (2,))
+            equilibria = support_enumeration(payoff_array)
+            # A nondegenerate game has an odd number of equilibria
+            self.assertEqual(len(equilibria) % 2, 1)
+            for equilibrium in equilibria + lemke_howson_all_labels(payoff_array):
+                self.assertTrue(is_equilibrium(payoff_array, *equilibrium))
+
+    def test_long_path_does_not_starve_other_labels(self):
+        # Dropping label 0 takes 40 pivots, while labels 1 and 2 reach an equilibrium in 23 and 21
+        payoff_array = random_game(12, 12, 1)
+        equilibria = lemke_howson_all_labels(payoff_array, max_pivots=30)
+        self.assertTrue(equilibria)
+        self.assertTrue(equilibria.truncated)
+        for equilibrium in equilibria:
+            self.assertTrue(is_equilibrium(payoff_array, *equilibrium))
+        self.assertFalse(lemke_howson_all_labels(payoff_array, max_pivots=1000).truncated)
+        self.assertTrue(lemke_howson_all_labels(payoff_array, time_limit=0).truncated)
+
+    def test_truncated_searches_are_reported(self):
+        game = NormalFormGame(random_game(12, 12, 1))
+        self.assertFalse(game.find_mixed_equilibria('lemke-howson').truncated)
+        self.assertTrue(game.find_mixed_equilibria('lemke-howson', max_pivots=1).truncated)
+        self.assertTrue(equilibrium_record(game, time_limit=0)["truncated"])
+        self.assertFalse(equilibrium_record(NormalFormGame(self.battle_of_the_sexes))["truncated"])
+
+
+class TestZeroSum(unittest.TestCase):
+    def test_rock_paper_scissors(self):
+        rock_paper_scissors = np.array([[0, -1, 1], [1, 0, -1], [-1, 1, 0]])
+        for solver in (solve_zero_sum_lp, solve_zero_sum_iterative):
+            row_strategy, col_strategy, value = solver(rock_paper_scissors)
+            np.testing.assert_allclose(row_strategy, 1 / 3, atol=1e-6)
+            np.testing.assert_allclose(col_strategy, 1 / 3, atol=1e-6)
+            self.assertAlmostEqual(value, 0)
+
+    def test_solvers_agree(self):
+        rng = np.random.default_rng(0)
+        for shape in [(5, 8), (30, 7), (40, 40)]:
+            payoffs = rng.integers(-10, 11, shape)
+            row_strategy, col_strategy, value = solve_zero_sum_lp(payoffs)
+            # Neither player can do better against the other's optimal strategy
+            self.assertAlmostEqual((payoffs @ col_strategy).max(), value)
+            self.assertAlmostEqual((row_strategy @ payoffs).min(), value)
+            row_strategy, col_strategy, approximate_value = solve_zero_sum_iterative(payoffs)
+            self.assertLessEqual((payoffs @ col_strategy).max() - (row_strategy @ payoffs).min(), 1e-3)
+            self.assertAlmostEqual(approximate_value, value, delta=1e-3)
+        with self.assertRaises(ValueError):
+            solve_zero_sum(payoffs, 'unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import unittest
+
+import numpy as np
+
+from gametheory.batch_analysis import game_record
+from gametheory.game_batch import GameBatch
+from gametheory.game_generators import dominance_solvable_game, zero_sum_game
+from gametheory.normal_form_game import NormalFormGame
+
+
+def small_games(num_games: int, rows: int, cols: int, seed: int = 0) -> np.ndarray:
+    # A narrow payoff range gives plenty of ties, which is where the batched and per-game code could disagree
+    return np.random.default_rng(seed).integers(0, 3, (num_games, rows, cols, 2))
+
+
+class TestGameBatch(unittest.TestCase):
+    def test_matches_per_game(self):
+        for rows, cols in ((1, 1), (2, 3), (4, 4), (6, 2)):
+            batch = GameBatch(small_games(40, rows, cols, rows * cols))
+            nash = batch.pure_nash_mask()
+            pareto = batch.pareto_optimal_mask()
+            minimax = batch.minimax_regret()
+            maximin, values = batch.maximin()
+            for index in range(len(batch)):
+                game = batch.game(index)
+                self.assertTrue((nash[index] == game.pure_nash_mask()).all())
+                self.assertTrue((pareto[index] == game.pareto_optimal_mask()).all())
+                for player in range(2):
+                    self.assertEqual(np.flatnonzero(minimax[player][index]).tolist(), game.minimax_actions()[player])
+                    actions, value = game.maximin_actions()[player]
+                    self.assertEqual(np.flatnonzero(maximin[player][index]).tolist(), actions)
+                    self.assertEqual(values[index, player], value)
+
+    def test_records(self):
+        stack = small_games(30, 3, 4, 5)
+        for payoff_array, record in zip(stack, GameBatch(stack).records()):
+            self.assertEqual(json.dumps(record), json.dumps(game_record(NormalFormGame(payoff_array))))
+
+    def test_elimination(self):
+        games = [NormalFormGame(dominance_solvable_game(9, 9, seed)) for seed in range(5)]
+        batch = GameBatch(games)
+        for strongly in (True, False):
+            self.assertEqual(batch.eliminate_dominated_strategies(strongly),
+                             [game.eliminate_dominated_strategies(strongly) for game in games])
+
+    def test_identical_actions(self):
+        batch = GameBatch(np.ones((2, 3, 3, 2), dtype=int))
+        self.assertEqual(batch.eliminate_dominated_strategies(False), [[([1, 2], [1, 2])]] * 2)
+
+    def test_float_payoffs(self):
+        batch = GameBatch(np.random.default_rng(1).normal(size=(10, 5, 7, 2)).round(1))
+        for index, mask in enumerate(batch.pareto_optimal_mask()):
+            self.assertTrue((mask == batch.game(index).pareto_optimal_mask()).all())
+
+    def test_zero_sum(self):
+        batch = GameBatch([zero_sum_game(3, 3, 0), small_games(1, 3, 3)[0]])
+        self.assertEqual(batch.is_zero_sum().tolist(), [True, False])
+
+    def test_shapes(self):
+        with self.assertRaises(ValueError):
+            GameBatch(np.zeros((2, 3, 3, 3)))
+        with self.assertRaises(ValueError):
+            GameBatch([np.zeros((2, 2, 2)), np.zeros((2, 3, 2))])
+
+
+if __name__ == '__main__':
+    unittest.main()
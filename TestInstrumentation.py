@@ -0,0 +1,99 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from gametheory.game_generators import dominance_solvable_game
+from gametheory.instrumentation import Profile, active_profile, phase
+from gametheory.normal_form_game import NormalFormGame
+from gametheory.player import Game, RandomChoice
+
+
+class TestProfile(unittest.TestCase):
+    def test_records_phases(self):
+        with Profile() as profile:
+            game = NormalFormGame("data/prog4A.txt")
+            with contextlib.redirect_stdout(io.StringIO()):
+                game.report("A")
+        self.assertEqual(profile.phases["parse"].calls, 1)
+        self.assertEqual(profile.phases["parse"].items, game.payoff_array.size)
+        for name in ("dominance", "pure equilibria", "pareto", "minimax", "maximin", "report"):
+            self.assertGreaterEqual(profile.phases[name].calls, 1, name)
+        self.assertGreaterEqual(profile.seconds, profile.phases["report"].seconds)
+        self.assertIsNone(profile.peak_memory)
+
+    def test_dominance_rounds(self):
+        game = NormalFormGame(dominance_solvable_game(16, 16, 0))
+        with Profile() as profile:
+            trace = game.eliminate_dominated_strategies()
+        rounds = profile.phases["dominance round"]
+        # The last round finds nothing to eliminate and stops the loop
+        self.assertEqual(rounds.calls, len(trace) + 1)
+        self.assertEqual(rounds.items, sum(len(rows) + len(cols) for rows, cols in trace))
+
+    def test_simulation_rate(self):
+        with Profile() as profile:
+            Game(5000, RandomChoice([0, 1], "Random"), RandomChoice([0, 1], "Random"), seed=0, quiet=True)
+        simulate = profile.phases["simulate"]
+        self.assertEqual((simulate.calls, simulate.items), (1, 5000))
+        self.assertAlmostEqual(simulate.rate, 5000 / simulate.seconds)
+
+    def test_trace_memory(self):
+        with Profile(trace_memory=True) as profile:
+            payoffs = [0] * 100_000
+        del payoffs
+        self.assertGreater(profile.peak_memory, 0)
+        self.assertIn("Peak traced memory", profile.report())
+
+    def test_nested_trace_memory(self):
+        with Profile(trace_memory=True) as outer:
+            payoffs = bytearray(10 << 20)
+            del payoffs
+            with Profile(trace_memory=True) as inner:
+                payoffs = bytearray(1 << 20)
+                del payoffs
+        self.assertGreaterEqual(outer.peak_memory, 10 << 20)
+        self.assertGreaterEqual(inner.peak_memory, 1 << 20)
+        self.assertLess(inner.peak_memory, 10 << 20)
+
+    def test_inactive(self):
+        self.assertIsNone(active_profile())
+        with phase("unprofiled"):
+            pass
+        with Profile() as outer:
+            with Profile() as inner:
+                with phase("inner"):
+                    pass
+            self.assertIs(active_profile(), outer)
+        self.assertIsNone(active_profile())
+        self.assertEqual(list(inner.phases), ["inner"])
+        self.assertEqual(outer.phases, {})
+
+    def test_as_dict(self):
+        with Profile() as profile:
+            with phase("work", 3):
+                pass
+        record = json.loads(json.dumps(profile.as_dict()))
+        self.assertEqual(record["phases"]["work"]["calls"], 1)
+        self.assertEqual(record["phases"]["work"]["items"], 3)
+
+
+class TestMainProfile(unittest.TestCase):
+    def test_profile_json(self):
+        import main
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                main.main(["--profile", "--profile-json", path])
+            with open(path) as file:
+                record = json.load(file)
+        self.assertIn("Peak traced memory", output.getvalue())
+        self.assertEqual(record["phases"]["parse"]["calls"], 3)
+        self.assertGreater(record["phases"]["simulate"]["items"], 0)
+        self.assertGreater(record["peak_memory"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,14 @@
+import os
+import tempfile
 import unittest
-from NormalFormGame import NormalFormGame, parse_payoff
+from unittest import mock
+
+import numpy as np
+
+from gametheory.game_generators import dominance_solvable_game
+from gametheory.normal_form_game import NormalFormGame, _iterated_elimination_n_players, \
+    _pareto_optimal_mask_n_players, get_action_name, is_col_dominated, is_row_dominated, is_strongly_dominated, \
+    iterated_elimination, load_binary_game, parse_payoff, parse_payoff_array, stream_payoff_file, write_binary_game
 
 
 class TestParsePayoff(unittest.TestCase):
@@ -17,6 +26,58 @@ class TestParsePayoff(unittest.TestCase):
         result = parse_payoff(normal_form)
         self.assertEqual(result, expected_output)
 
+    def test_parse_payoff_array(self):
+        normal_form = """2 4
+4 4 -1 -1 0 3 0 3
+3 3 -1 -1 0 4 0 4"""
+
+        result = parse_payoff_array(normal_form)
+        self.assertEqual(result.shape, (2, 4, 2))
+        self.assertEqual(result.tolist(), [[list(cell) for cell in row] for row in parse_payoff(normal_form)])
+
+
+class TestGameFiles(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.expected = parse_payoff_array("""2 4
+4 4 -1 -1 0 3 0 3
+3 3 -1 -1 0 4 0 4""")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_stream_payoff_file(self):
+        for chunk_size in (1, 2, 5, 1 << 20):
+            result = stream_payoff_file("data/prog4A.txt", chunk_size)
+            self.assertEqual(result.tolist(), self.expected.tolist())
+
+    def test_stream_payoff_file_reads_each_line(self):
+        path = os.path.join(self.directory.name, "game.txt")
+        # A number too many on Player 1's line is ignored instead of shifting Player 2's payoffs
+        text = "2 2\n4 0 0 3 99\n3 0 0 4\n"
+        with open(path, 'w') as file:
+            file.write(text)
+        for chunk_size in (1, 3, 1 << 20):
+            self.assertEqual(stream_payoff_file(path, chunk_size).tolist(), parse_payoff_array(text).tolist())
+        for text in ("2 2\n4 0 0\n3 0 0 4 1\n", "2 2\n4 0 0 3\n3 0 0\n", "2 2\n4 0 0 3\n"):
+            with open(path, 'w') as file:
+                file.write(text)
+            for chunk_size in (1, 3, 1 << 20):
+                with self.assertRaises(ValueError):
+                    stream_payoff_file(path, chunk_size)
+
+    def test_binary_game(self):
+        path = os.path.join(self.directory.name, "game.nfg")
+        write_binary_game(path, self.expected)
+        result = load_binary_game(path)
+        self.assertIsInstance(result, np.memmap)
+        self.assertEqual(result.dtype, np.int32)
+        self.assertEqual(result.tolist(), self.expected.tolist())
+        self.assertEqual(NormalFormGame(path).find_nash_equilibria(), ['AW', 'AX', 'BZ'])
+
+        write_binary_game(path, self.expected / 2)
+        self.assertEqual(load_binary_game(path).dtype, np.float64)
+
 
 class TestNormalFormGame(unittest.TestCase):
     def setUp(self):
@@ -31,6 +92,225 @@ class TestNormalFormGame(unittest.TestCase):
         result = self.normalFormGame.find_pareto_optimal()
         self.assertEqual(result, expected_optimal_solutions)
 
+    def test_pareto_optimal_mask(self):
+        expected_mask = [[True, True, False, False], [False, True, False, True]]
+        self.assertEqual(self.normalFormGame.pareto_optimal_mask().tolist(), expected_mask)
+
+    def test_cached_quantities(self):
+        regret = self.normalFormGame.regret_player1
+        self.assertIs(regret, self.normalFormGame.regret_player1)
+        self.assertEqual(regret.tolist(), [[0, 0, 1, 4], [4, 1, 0, 0]])
+        self.assertFalse(regret.flags.writeable)
+        self.assertEqual(self.normalFormGame.row_maxima.tolist(), [3, 4])
+
+        self.normalFormGame.payoffs = [[(1, 2), (3, 0)]]
+        self.assertEqual(self.normalFormGame.regret_player1.tolist(), [[0, 0]])
+        self.assertEqual(self.normalFormGame.find_nash_equilibria(), ['AY'])
+        self.assertEqual(self.normalFormGame.eliminate_dominated_strategies(), [([], [1])])
+
+    def test_payoffs_view(self):
+        self.assertEqual(self.normalFormGame.payoff_array.shape, (2, 4, 2))
+        self.assertEqual(self.normalFormGame.payoffs[1][3], (3, 4))
+        self.normalFormGame.payoffs = [[(1, 2)]]
+        self.assertEqual(self.normalFormGame.payoff_array.tolist(), [[[1, 2]]])
+        self.assertEqual(self.normalFormGame.payoffs, [[(1, 2)]])
+
+    def test_find_nash_equilibria(self):
+        self.assertEqual(self.normalFormGame.find_nash_equilibria(), ['AW', 'AX', 'BZ'])
+
+    def test_find_minimax_strategy(self):
+        self.assertEqual(self.normalFormGame.find_minimax_strategy(), (['A', 'B'], ['X']))
+
+    def test_find_maximin_strategy(self):
+        self.assertEqual(self.normalFormGame.find_maximin_strategy(), ((['B'], 0), (['X'], 3)))
+
+    def test_eliminate_dominated_strategies(self):
+        self.assertEqual(self.normalFormGame.eliminate_dominated_strategies(), [([], [2])])
+        self.assertEqual(self.normalFormGame.eliminate_dominated_strategies(False), [([], [0, 2, 3]), ([1], [])])
+
+    def test_strong_and_weak_dominance(self):
+        # Row B and column Y tie with row A and column X in one cell and lose in the others, so they are only weakly
+        # dominated. Row C and column Z are beaten everywhere, so they are strongly dominated
+        payoff_matrix = [
+            [(3, 3), (3, 3), (3, 1)],
+            [(3, 2), (1, 1), (2, 0)],
+            [(1, 1), (0, 0), (0, 0)]
+        ]
+        for is_dominated, player in ((is_row_dominated, 0), (is_col_dominated, 1)):
+            self.assertEqual([is_dominated(payoff_matrix, [], action, True) for action in range(3)],
+                             [False, False, True])
+            self.assertEqual([is_dominated(payoff_matrix, [], action, False) for action in range(3)],
+                             [False, True, True])
+        self.assertEqual(iterated_elimination(payoff_matrix, True)[0], ([2], [2]))
+        self.assertEqual(iterated_elimination(payoff_matrix, False)[0], ([1, 2], [1, 2]))
+
+    def test_weak_dominance_keeps_one_of_identical_strategies(self):
+        # Identical strategies weakly dominate each other, so only the first of each group may survive
+        identical = np.ones((3, 3, 2), dtype=int)
+        self.assertEqual(iterated_elimination(identical, False), [([1, 2], [1, 2])])
+        self.assertEqual(_iterated_elimination_n_players(identical, False, False), [([1, 2], [1, 2])])
+        self.assertEqual([is_row_dominated(identical.tolist(), [], action, False) for action in range(3)],
+                         [False, True, True])
+        self.assertEqual([is_col_dominated(identical.tolist(), [], action, False) for action in range(3)],
+                         [False, True, True])
+
+        rng = np.random.default_rng(3)
+        for _ in range(300):
+            payoff_array = rng.integers(0, 2, (3, 3, 2))
+            for strongly in (True, False):
+                alive = [np.ones(3, dtype=bool), np.ones(3, dtype=bool)]
+                for eliminated in iterated_elimination(payoff_array, strongly):
+                    for player_alive, dominated in zip(alive, eliminated):
+                        player_alive[dominated] = False
+                self.assertTrue(all(player_alive.any() for player_alive in alive))
+
+    def test_iterated_elimination_matches_dominance_checks(self):
+        rng = np.random.default_rng(0)
+        for _ in range(200):
+            payoff_array = rng.integers(0, 3, (3, 3, 2))
+            payoff_matrix = NormalFormGame(payoff_array).payoffs
+            trace = iterated_elimination(payoff_array, False)
+            expected_rows = [i for i in range(3) if is_row_dominated(payoff_matrix, [], i, False)]
+            self.assertEqual(trace[0][0] if trace else [], expected_rows)
+
+    def test_iterated_elimination_matches_dominance_checks_every_round(self):
+        # Small blocks and chunks make the sweep split the candidates and check likely dominators part way through
+        rng = np.random.default_rng(1)
+        games = [rng.integers(0, 4, (12, 10, 2)) for _ in range(20)] + [dominance_solvable_game(12, 10, 0)]
+        with mock.patch("gametheory.normal_form_game.DOMINANCE_BLOCK_SIZE", 16), \
+                mock.patch("gametheory.normal_form_game.DOMINANCE_CHUNK_SIZE", 2):
+            for payoff_array in games:
+                payoff_matrix = NormalFormGame(payoff_array).payoffs
+                for strongly in (True, False):
+                    eliminated = []
+                    expected = []
+                    while True:
+                        rows = [i for i in range(12) if get_action_name(i, True, 12) not in eliminated and
+                                is_row_dominated(payoff_matrix, eliminated, i, strongly)]
+                        cols = [j for j in range(10) if get_action_name(j, False, 10) not in eliminated and
+                                is_col_dominated(payoff_matrix, eliminated, j, strongly)]
+                        if not rows and not cols:
+                            break
+                        expected.append((rows, cols))
+                        eliminated += [get_action_name(i, True, 12) for i in rows]
+                        eliminated += [get_action_name(j, False, 10) for j in cols]
+                    self.assertEqual(iterated_elimination(payoff_array, strongly), expected)
+
+    def test_mixed_dominance(self):
+        # The middle row is beaten by an even mix of the other two rows but by neither one alone
+        payoff_matrix = [
+            [(3, 1), (0, 0)],
+            [(1, 1), (1, 0)],
+            [(0, 0), (3, 1)]
+        ]
+        self.assertFalse(is_strongly_dominated(payoff_matrix, 1, True))
+        self.assertTrue(is_strongly_dominated(payoff_matrix, 1, True, mixed=True))
+        self.assertEqual(iterated_elimination(payoff_matrix), [])
+        self.assertEqual(iterated_elimination(payoff_matrix, mixed=True), [([1], [])])
+        with self.assertRaises(ValueError):
+            iterated_elimination(payoff_matrix, strongly=False, mixed=True)
+
+    def test_find_mixed_equilibria(self):
+        normal_form_game = NormalFormGame([
+            [(4, 3), (0, 0)],
+            [(0, 0), (3, 4)]
+        ])
+        for method in ('support', 'lemke-howson'):
+            equilibria = normal_form_game.find_mixed_equilibria(method)
+            self.assertIn(([1, 0], [1, 0]), [(row.tolist(), col.tolist()) for row, col in equilibria])
+        row_strategy, col_strategy = normal_form_game.find_mixed_equilibria()[2]
+        np.testing.assert_allclose(row_strategy, [4 / 7, 3 / 7])
+        np.testing.assert_allclose(col_strategy, [3 / 7, 4 / 7])
+
+    def test_find_mixed_equilibria_removes_dominated_strategies(self):
+        # Column Y is strictly dominated, so the equilibria never put weight on it
+        equilibria = self.normalFormGame.find_mixed_equilibria()
+        self.assertTrue(equilibria)
+        self.assertTrue(all(col[2] == 0 for _, col in equilibria))
+
+    def test_zero_sum(self):
+        self.assertFalse(self.normalFormGame.is_zero_sum)
+        with self.assertRaises(ValueError):
+            self.normalFormGame.solve_zero_sum()
+        # The payoffs always add up to 5, which is strategically the same as zero-sum
+        constant_sum = NormalFormGame([[(3, 2), (0, 5)], [(1, 4), (2, 3)]])
+        self.assertTrue(constant_sum.is_zero_sum)
+        for method in ('lp', 'iterative'):
+            row_strategy, col_strategy, value = constant_sum.solve_zero_sum(method)
+            np.testing.assert_allclose(row_strategy, [0.25, 0.75], atol=1e-3)
+            np.testing.assert_allclose(col_strategy, [0.5, 0.5], atol=1e-3)
+            self.assertAlmostEqual(value, 1.5, delta=1e-3)
+        (row_strategy, col_strategy), = constant_sum.find_mixed_equilibria('zero-sum')
+        np.testing.assert_allclose(row_strategy, [0.25, 0.75])
+
+    def test_rejects_malformed_matrix(self):
+        with self.assertRaises(ValueError):
+            NormalFormGame(np.zeros((2, 2, 3)))
+
+    def test_large_game_labels(self):
+        totals = np.add.outer(np.arange(30), np.arange(40))
+        payoff_array = np.stack((totals, totals), axis=-1)
+        normal_form_game = NormalFormGame(payoff_array)
+        self.assertEqual(normal_form_game.action_labels[0][29], 'R29')
+        self.assertEqual(normal_form_game.action_labels[1][0], 'C0')
+        self.assertEqual(normal_form_game.find_nash_equilibria(), ['R29C39'])
+        self.assertEqual(normal_form_game.action_index(1, 'C39'), 39)
+        with self.assertRaises(ValueError):
+            get_action_name(26, True)
+
+    def test_custom_action_labels(self):
+        normal_form_game = NormalFormGame([[(1, 1), (0, 0)], [(0, 0), (2, 2)]], [['Up', 'Down'], ['Left', 'Right']])
+        self.assertEqual(normal_form_game.find_nash_equilibria(), ['UpLeft', 'DownRight'])
+        self.assertEqual(normal_form_game.find_pareto_optimal(), [('Down', 'Right')])
+        with self.assertRaises(ValueError):
+            normal_form_game.action_labels = [['Up'], ['Left', 'Right']]
+        normal_form_game.payoffs = [[(1, 1)]]
+        self.assertEqual(normal_form_game.action_labels, [['A'], ['Z']])
+
+
+class TestNPlayerGame(unittest.TestCase):
+    def setUp(self):
+        # A three player public goods game: contributing (action 1) costs 3 and adds 2 to every player's payoff
+        contributions = np.array(np.meshgrid([0, 1], [0, 1], [0, 1], indexing='ij'))
+        payoff_array = 2 * contributions.sum(axis=0)[..., np.newaxis] - 3 * np.moveaxis(contributions, 0, -1)
+        self.normalFormGame = NormalFormGame(payoff_array)
+
+    def test_labels(self):
+        self.assertEqual(self.normalFormGame.num_players, 3)
+        self.assertEqual(self.normalFormGame.action_labels[2], ['P3.0', 'P3.1'])
+
+    def test_find_nash_equilibria(self):
+        self.assertEqual(self.normalFormGame.find_pure_equilibrium_profiles(), [(0, 0, 0)])
+        self.assertEqual(self.normalFormGame.find_nash_equilibria(), ['P1.0P2.0P3.0'])
+
+    def test_eliminate_dominated_strategies(self):
+        self.assertEqual(self.normalFormGame.eliminate_dominated_strategies(), [([1], [1], [1])])
+
+    def test_pareto_optimal_mask(self):
+        # Everyone contributing beats nobody contributing, so only the all-free-riding profile is not optimal
+        mask = self.normalFormGame.pareto_optimal_mask()
+        self.assertFalse(mask[0, 0, 0])
+        self.assertTrue(mask[1, 1, 1])
+        self.assertTrue(mask[0, 1, 1])
+
+    def test_minimax_and_maximin(self):
+        self.assertEqual(self.normalFormGame.find_minimax_strategy(), (['P1.0'], ['P2.0'], ['P3.0']))
+        self.assertEqual(self.normalFormGame.find_maximin_strategy(), ((['P1.0'], 0), (['P2.0'], 0), (['P3.0'], 0)))
+
+    def test_mixed_equilibria_need_two_players(self):
+        with self.assertRaises(ValueError):
+            self.normalFormGame.find_mixed_equilibria()
+
+    def test_general_paths_match_two_player_paths(self):
+        rng = np.random.default_rng(0)
+        for _ in range(100):
+            payoff_array = rng.integers(0, 4, (4, 3, 2))
+            for strongly in (True, False):
+                self.assertEqual(_iterated_elimination_n_players(payoff_array, strongly, False),
+                                 iterated_elimination(payoff_array, strongly))
+            self.assertEqual(_pareto_optimal_mask_n_players(payoff_array).tolist(),
+                             NormalFormGame(payoff_array).pareto_optimal_mask().tolist())
+
 
 if __name__ == '__main__':
     unittest.main()
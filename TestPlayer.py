@@ -0,0 +1,117 @@
+import contextlib
+import io
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from gametheory.player import AlwaysCooperate, AlwaysDefect, FictitiousPlay, Game, Grudge, Player, Random, \
+    RandomChoice, RegretMatching, TitForTat
+
+
+def play_quietly(*args, **kwargs) -> Game:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Game(*args, **kwargs)
+
+
+class TestGame(unittest.TestCase):
+    def test_memoryless_players(self):
+        game = play_quietly(1000, AlwaysCooperate(), AlwaysDefect())
+        self.assertEqual((game.player1_score, game.player2_score), (-1000, 3000))
+
+    def test_stateful_players(self):
+        game = play_quietly(1000, Grudge(), AlwaysDefect())
+        self.assertEqual((game.player1_score, game.player2_score), (-1, 3))
+        game = play_quietly(1000, TitForTat(), AlwaysCooperate())
+        self.assertEqual((game.player1_score, game.player2_score), (2000, 2000))
+
+    def test_memoryless_player_needs_play_rounds(self):
+        class Stubborn(Player):
+            memoryless = True
+
+            def play(self):
+                return 0
+
+        with self.assertRaisesRegex(TypeError, "Stubborn is memoryless but does not define play_rounds"):
+            play_quietly(10, Stubborn(), TitForTat())
+
+    def test_simulation_paths_record_the_same_rounds(self):
+        # Both players memoryless takes the vectorized path, a reacting opponent makes Game play round by round
+        class ReactingDefect(AlwaysDefect):
+            memoryless = False
+
+        with mock.patch("gametheory.player.SIMULATION_CHUNK_SIZE", 300):
+            fast = play_quietly(1000, Random(keep_history=True), AlwaysDefect(keep_history=True), seed=2)
+            slow = play_quietly(1000, Random(keep_history=True), ReactingDefect(keep_history=True), seed=2)
+        self.assertEqual((fast.player1_score, fast.player2_score), (slow.player1_score, slow.player2_score))
+        for fast_player, slow_player in [(fast.player1, slow.player1), (fast.player2, slow.player2)]:
+            self.assertEqual(fast_player.rounds_played, 1000)
+            self.assertEqual(fast_player.action_counts, slow_player.action_counts)
+            self.assertEqual(fast_player.their_previous_actions, slow_player.their_previous_actions)
+
+    def test_seeded_games_repeat(self):
+        first = play_quietly(10000, Random(), TitForTat(), seed=7)
+        second = play_quietly(10000, Random(), TitForTat(), seed=7)
+        self.assertEqual((first.player1_score, first.player2_score), (second.player1_score, second.player2_score))
+        first = play_quietly(10000, Random(), RandomChoice([0, 1], "Coin"), seed=7)
+        second = play_quietly(10000, Random(), RandomChoice([0, 1], "Coin"), seed=7)
+        self.assertEqual((first.player1_score, first.player2_score), (second.player1_score, second.player2_score))
+
+    def test_tit_for_tat_copies_previous_action(self):
+        game = play_quietly(1000, Random(), TitForTat(keep_history=True), seed=3)
+        random_actions = game.player2.their_previous_actions
+        tit_for_tat_actions = [0] + random_actions[:-1]
+        expected = [game.payoffs[a][b] for a, b in zip(random_actions, tit_for_tat_actions)]
+        self.assertEqual(game.player1_score, sum(reward[0] for reward in expected))
+        self.assertEqual(game.player2_score, sum(reward[1] for reward in expected))
+
+    def test_learning_players(self):
+        # Defecting is dominant in the default prisoner's dilemma, so both learners end up defecting
+        game = play_quietly(2000, RegretMatching(), FictitiousPlay(), seed=0)
+        self.assertGreater(game.player1.average_strategy[1], 0.9)
+        self.assertEqual(game.player2.play(), 1)
+        first = play_quietly(500, RegretMatching(plus=True), Random(), seed=4)
+        second = play_quietly(500, RegretMatching(plus=True), Random(), seed=4)
+        self.assertEqual(first.player1_score, second.player1_score)
+
+    def test_learning_player_seats(self):
+        # Matching pennies from the column player's side: they win when the actions differ
+        matching_pennies = [[(1, -1), (-1, 1)], [(-1, 1), (1, -1)]]
+        game = play_quietly(5000, RegretMatching(plus=True), RegretMatching(plus=True), matching_pennies, seed=1)
+        np.testing.assert_allclose(game.player1.average_strategy, 0.5, atol=0.1)
+        np.testing.assert_allclose(game.player2.average_strategy, 0.5, atol=0.1)
+
+
+class TestPlayer(unittest.TestCase):
+    def test_bounded_state(self):
+        player = TitForTat()
+        for action in [1, 0, 1, 1, 0]:
+            player.learn(action)
+        self.assertEqual(player.their_previous_actions, [0])
+        self.assertEqual(player.play(), 0)
+        self.assertEqual(player.action_counts, {1: 3, 0: 2})
+        self.assertEqual(player.rounds_played, 5)
+
+    def test_full_history(self):
+        player = Grudge(keep_history=True)
+        for action in [0, 0, 1, 0]:
+            player.learn(action)
+        self.assertEqual(player.their_previous_actions, [0, 0, 1, 0])
+        self.assertEqual(player.play(), 1)
+        self.assertEqual(Grudge().play(), 0)
+
+    def test_learn_rounds(self):
+        actions = [1, 0, 1, 1, 0, 2]
+        one_by_one = TitForTat(keep_history=True)
+        for action in actions:
+            one_by_one.learn(action)
+        at_once = TitForTat(keep_history=True)
+        at_once.learn_rounds(np.array(actions[:2], dtype=np.int8))
+        at_once.learn_rounds(np.array(actions[2:], dtype=np.int8))
+        self.assertEqual(at_once.action_counts, one_by_one.action_counts)
+        self.assertEqual(list(at_once.recent_actions), list(one_by_one.recent_actions))
+        self.assertEqual(at_once.their_previous_actions, one_by_one.their_previous_actions)
+
+
+if __name__ == '__main__':
+    unittest.main()
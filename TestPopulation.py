@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from gametheory.player import AlwaysCooperate, AlwaysDefect, Grudge, TitForTat
+from gametheory.population import Population
+
+
+class TestPopulation(unittest.TestCase):
+    def setUp(self):
+        self.population = Population([AlwaysCooperate(), AlwaysDefect(), TitForTat(), Grudge()], rounds=100, seed=0)
+
+    def test_payoff_matrix(self):
+        payoff_matrix = self.population.payoff_matrix
+        self.assertEqual(payoff_matrix.shape, (4, 4))
+        self.assertAlmostEqual(payoff_matrix[0, 0], 2)
+        self.assertAlmostEqual(payoff_matrix[0, 1], -1)
+        self.assertAlmostEqual(payoff_matrix[1, 0], 3)
+        self.assertIs(payoff_matrix, self.population.payoff_matrix)
+
+    def test_replicator_dynamics(self):
+        history = Population([AlwaysCooperate(), AlwaysDefect()]).replicator_dynamics(generations=200)
+        self.assertEqual(history.shape, (201, 2))
+        np.testing.assert_allclose(history.sum(axis=1), 1)
+        self.assertGreater(history[-1, 1], 0.99)
+
+    def test_moran_process(self):
+        history = self.population.moran_process([5, 5, 5, 5], generations=500, seed=1)
+        self.assertEqual(history.shape, (501, 4))
+        self.assertTrue((history.sum(axis=1) == 20).all())
+        self.assertTrue((history >= 0).all())
+        repeat = self.population.moran_process([5, 5, 5, 5], generations=500, seed=1)
+        self.assertEqual(history.tolist(), repeat.tolist())
+
+    def test_unplayable_game(self):
+        two_by_three = [[(1, 1), (0, 0), (2, 1)], [(0, 0), (1, 1), (1, 2)]]
+        with self.assertRaisesRegex(ValueError, "Tit for Tat"):
+            Population([AlwaysDefect(), TitForTat()], two_by_three).payoff_matrix
+
+
+if __name__ == '__main__':
+    unittest.main()
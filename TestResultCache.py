@@ -0,0 +1,124 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from gametheory.game_generators import dominance_solvable_game, random_game
+from gametheory.normal_form_game import NormalFormGame
+from gametheory.result_cache import CACHED_RESULTS, ResultCache, canonical_form
+
+
+def analyze(game: NormalFormGame) -> tuple:
+    return (game.eliminate_dominated_strategies(True), game.eliminate_dominated_strategies(False),
+            game.eliminate_dominated_strategies(True, True), game.find_pure_equilibrium_profiles(),
+            game.find_pareto_optimal(), game.find_minimax_strategy(), game.find_maximin_strategy())
+
+
+def reorder(payoff_array, seed: int, swap: bool) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    reordered = payoff_array[rng.permutation(payoff_array.shape[0])][:, rng.permutation(payoff_array.shape[1])]
+    return reordered.transpose(1, 0, 2)[..., ::-1] if swap else reordered
+
+
+class TestCanonicalForm(unittest.TestCase):
+    def test_reordered_games_share_a_key(self):
+        payoff_array = random_game(6, 6, 0)
+        key = canonical_form(payoff_array)[0]
+        for seed in range(5):
+            self.assertEqual(canonical_form(reorder(payoff_array, seed, seed % 2 == 1))[0], key)
+        self.assertNotEqual(canonical_form(random_game(6, 6, 1))[0], key)
+
+    def test_symmetric_games(self):
+        # Every action of rock paper scissors looks the same until one of them is singled out
+        rock_paper_scissors = [[(0, 0), (-1, 1), (1, -1)], [(1, -1), (0, 0), (-1, 1)], [(-1, 1), (1, -1), (0, 0)]]
+        payoff_array = np.array(rock_paper_scissors)
+        key = canonical_form(payoff_array)[0]
+        for seed in range(6):
+            self.assertEqual(canonical_form(reorder(payoff_array, seed, seed % 2 == 1))[0], key)
+        self.assertEqual(canonical_form(np.zeros((3, 4, 2)))[0], canonical_form(np.zeros((4, 3, 2)))[0])
+
+    def test_n_players(self):
+        payoff_array = np.random.default_rng(0).integers(0, 3, (2, 3, 2, 3))
+        reordered = payoff_array.transpose(2, 0, 1, 3)[..., [2, 0, 1]][::-1, :, ::-1]
+        self.assertEqual(canonical_form(reordered)[0], canonical_form(payoff_array)[0])
+
+    def test_order_maps_onto_canonical(self):
+        payoff_array = random_game(4, 5, 2)
+        _, players, orders = canonical_form(payoff_array)
+        _, swapped_players, swapped_orders = canonical_form(payoff_array.transpose(1, 0, 2)[..., ::-1])
+        self.assertEqual(swapped_players, (1, 0))
+        canonical = payoff_array.transpose(*players, 2)[..., list(players)][np.ix_(*orders)]
+        swapped = payoff_array.transpose(1, 0, 2)[..., ::-1]
+        swapped = swapped.transpose(*swapped_players, 2)[..., list(swapped_players)][np.ix_(*swapped_orders)]
+        self.assertTrue((canonical == swapped).all())
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = ResultCache(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        game = NormalFormGame("data/prog4A.txt")
+        self.assertFalse(self.cache.load(game))
+        expected = analyze(game)
+        self.cache.store(game)
+
+        cached = NormalFormGame("data/prog4A.txt")
+        self.assertTrue(self.cache.load(cached))
+        self.assertEqual(len(cached.cached_results(CACHED_RESULTS)), len(CACHED_RESULTS))
+        self.assertEqual(analyze(cached), expected)
+
+    def test_reordered_game(self):
+        for payoff_array in (random_game(8, 6, 3), dominance_solvable_game(7, 7, 1)):
+            game = NormalFormGame(payoff_array)
+            analyze(game)
+            self.cache.store(game)
+            for seed, swap in ((0, False), (1, True)):
+                reordered = reorder(payoff_array, seed, swap)
+                cached = NormalFormGame(reordered)
+                self.assertTrue(self.cache.load(cached))
+                self.assertEqual(analyze(cached), analyze(NormalFormGame(reordered)))
+
+    def test_merges_results(self):
+        game = NormalFormGame("data/prog4B.txt")
+        game.find_pareto_optimal()
+        self.cache.store(game)
+        game.find_minimax_strategy()
+        self.cache.store(game)
+        cached = NormalFormGame("data/prog4B.txt")
+        self.cache.load(cached)
+        self.assertEqual(set(cached.cached_results(['pareto_optimal_mask', 'minimax', 'maximin'])),
+                         {'pareto_optimal_mask', 'minimax'})
+
+    def test_eviction(self):
+        games = [NormalFormGame(random_game(10, 10, seed)) for seed in range(3)]
+        for game in games:
+            game.find_pareto_optimal()
+        self.cache.store(games[0])
+        entry_size = os.path.getsize(os.path.join(self.directory.name, games[0].canonical_form()[0] + ".json"))
+        cache = ResultCache(self.directory.name, max_bytes=2 * entry_size + entry_size // 2)
+        cache.store(games[1])
+        # Loading the first entry marks it as used, so the second one is the least recently used
+        os.utime(os.path.join(self.directory.name, games[0].canonical_form()[0] + ".json"), ns=(0, 0))
+        os.utime(os.path.join(self.directory.name, games[1].canonical_form()[0] + ".json"), ns=(1, 1))
+        self.assertTrue(cache.load(NormalFormGame(games[0].payoff_array)))
+        cache.store(games[2])
+        self.assertEqual([cache.load(NormalFormGame(game.payoff_array)) for game in games], [True, False, True])
+
+    def test_ignores_broken_entries(self):
+        game = NormalFormGame("data/prog4C.txt")
+        with open(os.path.join(self.directory.name, game.canonical_form()[0] + ".json"), "w") as file:
+            file.write('{"version": ')
+        self.assertFalse(self.cache.load(game))
+        game.find_pure_equilibrium_profiles()
+        self.cache.store(game)
+        self.assertTrue(self.cache.load(NormalFormGame("data/prog4C.txt")))
+
+
+if __name__ == '__main__':
+    unittest.main()
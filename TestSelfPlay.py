@@ -0,0 +1,53 @@
+import unittest
+
+import numpy as np
+
+from gametheory.normal_form_game import NormalFormGame
+from gametheory.selfplay import SELF_PLAY_METHODS, expected_payoffs, exploitability, fictitious_play, regret_matching, \
+    self_play
+
+
+class TestSelfPlay(unittest.TestCase):
+    def setUp(self):
+        # Rock paper scissors, whose only equilibrium is the uniform mixture
+        rock_paper_scissors = np.array([[0, -1, 1], [1, 0, -1], [-1, 1, 0]])
+        self.rock_paper_scissors = np.stack((rock_paper_scissors, -rock_paper_scissors), axis=-1)
+
+    def test_exploitability(self):
+        uniform = [np.full(3, 1 / 3)] * 2
+        self.assertAlmostEqual(exploitability(self.rock_paper_scissors, uniform), 0)
+        rock = [np.array([1., 0, 0]), np.array([1., 0, 0])]
+        self.assertEqual(expected_payoffs(self.rock_paper_scissors, rock)[0].tolist(), [0, 1, -1])
+        self.assertAlmostEqual(exploitability(self.rock_paper_scissors, rock), 2)
+
+    def test_methods_approach_equilibrium(self):
+        for method in SELF_PLAY_METHODS:
+            strategies, gap = self_play(self.rock_paper_scissors, method, 5000)
+            self.assertLess(gap, 0.05, method)
+            np.testing.assert_allclose(strategies[0], 1 / 3, atol=0.02)
+        with self.assertRaises(ValueError):
+            self_play(self.rock_paper_scissors, 'unknown')
+
+    def test_cfr_plus_beats_regret_matching(self):
+        payoffs = np.random.default_rng(0).integers(-9, 10, (20, 30))
+        zero_sum = np.stack((payoffs, -payoffs), axis=-1)
+        _, regret_matching_gap = regret_matching(zero_sum, 2000)
+        _, cfr_plus_gap = regret_matching(zero_sum, 2000, plus=True)
+        self.assertLess(cfr_plus_gap, regret_matching_gap)
+
+    def test_tolerance_stops_early(self):
+        strategies, gap = fictitious_play(self.rock_paper_scissors, 10 ** 9, tolerance=0.1)
+        self.assertLessEqual(gap, 0.1)
+
+    def test_three_player_game(self):
+        # Contributing costs 3 and adds 2 to every player's payoff, so free riding is the only equilibrium
+        contributions = np.array(np.meshgrid([0, 1], [0, 1], [0, 1], indexing='ij'))
+        payoff_array = 2 * contributions.sum(axis=0)[..., np.newaxis] - 3 * np.moveaxis(contributions, 0, -1)
+        strategies, gap = NormalFormGame(payoff_array).find_approximate_equilibrium(iterations=1000)
+        self.assertLess(gap, 0.01)
+        for strategy in strategies:
+            self.assertGreater(strategy[0], 0.99)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from gametheory.player import AlwaysCooperate, AlwaysDefect, FictitiousPlay, Grudge, PlaySpecificStrategy, Random, \
+    RegretMatching, TitForTat
+from gametheory.tournament import load_payoff_matrices, run_tournament
+
+
+class TestTournament(unittest.TestCase):
+    def setUp(self):
+        self.roster = [AlwaysCooperate(), AlwaysDefect(), TitForTat(), Grudge(), Random()]
+        self.prisoners_dilemma = [[(2, 2), (-1, 3)], [(3, -1), (0, 0)]]
+
+    def test_scores(self):
+        scores = run_tournament(self.roster, [self.prisoners_dilemma], simulations=100, seed=0, max_workers=1)
+        self.assertEqual(scores.shape, (1, 5, 5, 2))
+        self.assertEqual(scores[0, 0, 1].tolist(), [-100, 300])
+        self.assertEqual(scores[0, 2, 2].tolist(), [200, 200])
+        self.assertEqual(scores[0, 3, 1].tolist(), [-1, 3])
+
+    def test_parallel_matches_serial(self):
+        payoff_matrices = [self.prisoners_dilemma] + load_payoff_matrices()
+        serial = run_tournament(self.roster, payoff_matrices, simulations=200, seed=1, max_workers=1)
+        parallel = run_tournament(self.roster, payoff_matrices, simulations=200, seed=1, max_workers=2)
+        np.testing.assert_array_equal(serial, parallel)
+
+    def test_skips_unplayable_pairings(self):
+        # Tit for Tat as the row player of a 2x3 game would copy a third column it has no row for
+        two_by_three = [[(1, 1), (0, 0), (2, 1)], [(0, 0), (1, 1), (1, 2)]]
+        roster = [TitForTat(), RegretMatching(), FictitiousPlay(), PlaySpecificStrategy(2, "C")]
+        scores = run_tournament(roster, [two_by_three], simulations=20, seed=0, max_workers=1)[0]
+        unplayed = np.isnan(scores[:, :, 0])
+        # Tit for Tat can only sit in the column, and Always Play C only has a third action there too
+        expected = np.zeros((4, 4), dtype=bool)
+        expected[[0, 3], :] = True
+        expected[0, [0, 3]] = True
+        self.assertEqual(unplayed.tolist(), expected.tolist())
+        self.assertFalse(np.isnan(scores[1:3, 1:3]).any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+Normal form game analysis and repeated game simulation. Every name is imported from its module the first time it is
+used, so importing the package costs next to nothing and a command only pays for the modules it needs
+"""
+import importlib
+
+# The module each public name lives in
+_EXPORTS = {
+    "NormalFormGame": "normal_form_game",
+    "iterated_elimination": "normal_form_game",
+    "pareto_optimal_mask": "normal_form_game",
+    "parse_payoff": "normal_form_game",
+    "parse_payoff_array": "normal_form_game",
+    "read_payoff_file": "normal_form_game",
+    "write_binary_game": "normal_form_game",
+    "support_enumeration": "equilibria",
+    "lemke_howson": "equilibria",
+    "solve_zero_sum": "equilibria",
+    "self_play": "selfplay",
+    "GameBatch": "game_batch",
+    "ResultCache": "result_cache",
+    "Profile": "instrumentation",
+    "Game": "player",
+    "Player": "player",
+    "TitForTat": "player",
+    "Grudge": "player",
+    "Random": "player",
+    "RandomChoice": "player",
+    "AlwaysDefect": "player",
+    "AlwaysCooperate": "player",
+    "PlaySpecificStrategy": "player",
+    "RegretMatching": "player",
+    "FictitiousPlay": "player",
+    "AutomatonPlayer": "player",
+    "Automaton": "automaton",
+    "play_automata": "automaton",
+    "run_tournament": "tournament",
+    "Population": "population",
+    "GAME_GENERATORS": "game_generators",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    # Later lookups find the name directly and skip this function
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
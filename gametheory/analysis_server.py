@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .batch_analysis import equilibrium_record, game_record
+from .game_batch import GameBatch
+from .normal_form_game import NormalFormGame, parse_payoff_array, to_payoff_array
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# Seconds a request waits for others of the same shape before its batch is analyzed
+BATCH_WINDOW = 0.002
+MAX_BATCH_SIZE = 256
+# Requests being analyzed or waiting at once, beyond which new ones are turned away with 503
+MAX_PENDING = 1024
+MAX_BODY_BYTES = 64 << 20
+# Latencies kept for the percentiles reported by /metrics
+LATENCY_WINDOW = 10_000
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+def _analyze_batch(payoff_arrays: list[np.ndarray]) -> list[dict]:
+    if len(payoff_arrays) == 1:
+        return [game_record(NormalFormGame(payoff_arrays[0]))]
+    return GameBatch(payoff_arrays).records()
+
+
+def _solve(payoff_array, time_limit: float = None) -> dict:
+    # Runs in a worker process
+    return equilibrium_record(NormalFormGame(payoff_array), True, time_limit)
+
+
+def _parse_flag(value) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("1", "true", "yes", "0", "false", "no"):
+        return value.lower() in ("1", "true", "yes")
+    raise ValueError(f"Expected true or false for mixed, got {value!r}")
+
+
+def parse_request(body: bytes, content_type: str, query: str = "") -> tuple[np.ndarray, bool]:
+    """
+    Reads a two player game from a request body in the parse_payoff text format, or from a JSON object holding either
+    the text as "game" or the nested cells as "payoffs"
+    :param query: the query string of the request, where mixed=true asks for the mixed equilibria as well. A JSON body
+    can ask for them with "mixed": true instead. Anything but a boolean or one of 1, true, yes, 0, false and no is an
+    error
+    :return: the payoff array and whether the mixed equilibria were asked for
+    """
+    mixed = _parse_flag(parse_qs(query).get("mixed", ["false"])[-1])
+    if content_type.split(";")[0].strip() == "application/json":
+        request = json.loads(body)
+        payoff_array = parse_payoff_array(request["game"]) if "game" in request else to_payoff_array(request["payoffs"])
+        mixed = _parse_flag(request.get("mixed", mixed))
+    else:
+        payoff_array = parse_payoff_array(body.decode())
+    if payoff_array.shape[-1] != 2:
+        raise ValueError(f"Expected a two player game, got {payoff_array.shape[-1]} players")
+    if not np.issubdtype(payoff_array.dtype, np.number):
+        raise ValueError(f"Expected numeric payoffs, got {payoff_array.dtype}")
+    return payoff_array, mixed
+
+
+class Overloaded(Exception):
+    pass
+
+
+class LatencyStats:
+    """
+    Keeps the latest LATENCY_WINDOW request latencies for percentiles
+    """
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.latencies = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self.latencies.append(seconds)
+
+    def as_dict(self) -> dict:
+        if not self.latencies:
+            return {"samples": 0, "p50_ms": None, "p99_ms": None}
+        p50, p99 = np.percentile(self.latencies, [50, 99]) * 1000
+        return {"samples": len(self.latencies), "p50_ms": p50.item(), "p99_ms": p99.item()}
+
+
+class AnalysisService:
+    """
+    Analyzes two player games for concurrent requests. Requests for games of the same shape that arrive within
+    batch_window seconds of each other are stacked and analyzed together in a thread, and mixed equilibria are solved
+    in a pool of worker processes so neither blocks the event loop
+    :var max_pending is how many requests may be in progress at once before new ones are rejected with Overloaded
+    """
+    def __init__(self, workers: int = None, batch_window: float = BATCH_WINDOW, max_batch_size: int = MAX_BATCH_SIZE,
+                 max_pending: int = MAX_PENDING, time_limit: float = None):
+        self.executor = ProcessPoolExecutor(workers)
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.max_pending = max_pending
+        self.time_limit = time_limit
+        self.latency = LatencyStats()
+        self.pending = 0
+        self.requests = 0
+        self.rejected = 0
+        self.errors = 0
+        self.batches = 0
+        self.batched_games = 0
+        # The batch being gathered for each shape, as (payoff arrays, futures of their records)
+        self._gathering = {}
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+    async def analyze(self, payoff_array, mixed: bool = False) -> dict:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise Overloaded(f"{self.pending} requests are already in progress")
+        self.pending += 1
+        start = time.perf_counter()
+        try:
+            record = await self._gather(payoff_array)
+            if mixed:
+                loop = asyncio.get_running_loop()
+                record.update(await loop.run_in_executor(self.executor, _solve, payoff_array, self.time_limit))
+            self.latency.record(time.perf_counter() - start)
+            return record
+        finally:
+            self.pending -= 1
+
+    def _gather(self, payoff_array) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        key = (payoff_array.shape, payoff_array.dtype.kind)
+        batch = self._gathering.get(key)
+        if batch is None:
+            batch = self._gathering[key] = ([], [])
+            loop.call_later(self.batch_window, self._flush, key, batch)
+        future = loop.create_future()
+        batch[0].append(payoff_array)
+        batch[1].append(future)
+        if len(batch[0]) >= self.max_batch_size:
+            self._flush(key, batch)
+        return future
+
+    def _flush(self, key, batch):
+        # The timer of a batch that already filled up finds a newer batch, or none, under its key
+        if self._gathering.get(key) is not batch:
+            return
+        del self._gathering[key]
+        self.batches += 1
+        self.batched_games += len(batch[0])
+        asyncio.get_running_loop().create_task(self._run_batch(*batch))
+
+    async def _run_batch(self, payoff_arrays, futures):
+        try:
+            records = await asyncio.to_thread(_analyze_batch, payoff_arrays)
+        except Exception as error:
+            if len(payoff_arrays) == 1:
+                if not futures[0].done():
+                    futures[0].set_exception(error)
+                return
+            # One bad game fails the whole batch, so each game is analyzed again alone and only the bad ones fail
+            await asyncio.gather(*(self._run_batch([payoff_array], [future])
+                                   for payoff_array, future in zip(payoff_arrays, futures)))
+            return
+        for future, record in zip(futures, records):
+            if not future.done():
+                future.set_result(record)
+
+    def metrics(self) -> dict:
+        return {
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "pending": self.pending,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_games / self.batches if self.batches else 0.0,
+            "latency": self.latency.as_dict(),
+        }
+
+    async def _route(self, method: str, target: str, headers: dict, body: bytes) -> tuple[int, dict]:
+        url = urlsplit(target)
+        if url.path == "/metrics":
+            return (200, self.metrics()) if method == "GET" else (405, {"error": "Use GET"})
+        if url.path != "/analyze":
+            return 404, {"error": f"Unknown path {url.path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+        self.requests += 1
+        try:
+            payoff_array, mixed = parse_request(body, headers.get("content-type", "text/plain"), url.query)
+        except (ValueError, KeyError, IndexError, TypeError, UnicodeDecodeError) as error:
+            self.errors += 1
+            return 400, {"error": f"{type(error).__name__}: {error}"}
+        try:
+            return 200, await self.analyze(payoff_array, mixed)
+        except Overloaded as error:
+            return 503, {"error": str(error)}
+        except Exception as error:
+            self.errors += 1
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves HTTP/1.1 requests on one connection until the client closes it
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target = request_line.decode("latin-1").split()[:2]
+                headers = {}
+                while (line := await reader.readline()).strip():
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status, response = 413, {"error": f"Bodies are limited to {MAX_BODY_BYTES} bytes"}
+                    headers["connection"] = "close"
+                else:
+                    status, response = await self._route(method, target, headers, await reader.readexactly(length))
+                data = json.dumps(response).encode()
+                writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                # Waits while the client is slow to read, so responses do not pile up in memory
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def start_server(service: AnalysisService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                       unix_path: str = None) -> asyncio.AbstractServer:
+    """
+    Starts serving the service over HTTP on a TCP port, or on a Unix socket when unix_path is given
+    """
+    if unix_path is not None:
+        return await asyncio.start_unix_server(service.handle_connection, unix_path)
+    return await asyncio.start_server(service.handle_connection, host, port)
+
+
+async def serve(args):
+    service = AnalysisService(args.workers, args.batch_window, args.max_batch_size, args.max_pending, args.time_limit)
+    server = await start_server(service, args.host, args.port, args.unix)
+    where = args.unix or ", ".join(f"{address[0]}:{address[1]}" for address in
+                                   (sock.getsockname() for sock in server.sockets))
+    print(f"Serving game analyses on {where}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve game analyses over HTTP, batching requests of the same shape")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket instead of a TCP port")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="processes solving mixed equilibria")
+    parser.add_argument("--batch-window", type=float, default=BATCH_WINDOW,
+                        help="seconds a request waits for others of the same shape")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                        help="requests in progress before new ones get 503")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds allowed for each mixed search")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class Automaton:
+    """
+    A deterministic repeated game strategy written as a finite-state machine
+    :var outputs holds the action played in each state
+    :var transitions holds the next state for each state and action of the opponent, so transitions[s, a] is where the
+    machine goes from state s when the opponent plays a
+    :var initial_state is the state of the first round
+    """
+    def __init__(self, outputs, transitions, initial_state: int = 0, name: str = "Automaton"):
+        self.outputs = np.asarray(outputs, dtype=np.intp)
+        self.transitions = np.asarray(transitions, dtype=np.intp)
+        if self.transitions.ndim != 2 or self.outputs.shape != self.transitions.shape[:1]:
+            raise ValueError(f"Expected one output and one row of transitions per state, got outputs of shape "
+                             f"{self.outputs.shape} and transitions of shape {self.transitions.shape}")
+        if not (0 <= initial_state < self.num_states) or (self.transitions < 0).any() or \
+                (self.transitions >= self.num_states).any():
+            raise ValueError(f"States have to be between 0 and {self.num_states - 1}")
+        self.initial_state = initial_state
+        self.name = name
+
+    @property
+    def num_states(self) -> int:
+        return len(self.outputs)
+
+    @property
+    def num_opponent_actions(self) -> int:
+        return self.transitions.shape[1]
+
+    def __repr__(self):
+        return f"Automaton({self.outputs.tolist()}, {self.transitions.tolist()}, {self.initial_state}, {self.name!r})"
+
+
+def play_automata(automaton1: Automaton, automaton2: Automaton, payoff_array, rounds: int) -> tuple[int, int]:
+    """
+    Plays two automata against each other. The pair of their states decides everything that follows, so once a pair
+    repeats the match is in a cycle and the remaining rounds are scored in closed form. A match therefore takes at most
+    as many steps as there are pairs of states, however many rounds it has
+    :param automaton1: the row player
+    :param automaton2: the column player
+    :param payoff_array: the (rows, cols, 2) payoffs of the game
+    :return: the total score of each player
+    """
+    payoffs = np.asarray(payoff_array).tolist()
+    if automaton1.num_opponent_actions < len(payoffs[0]) or automaton2.num_opponent_actions < len(payoffs):
+        raise ValueError("Each automaton needs a transition for every action of its opponent")
+    # Plain lists are much faster than arrays when indexed one element at a time
+    outputs1, outputs2 = automaton1.outputs.tolist(), automaton2.outputs.tolist()
+    transitions1, transitions2 = automaton1.transitions.tolist(), automaton2.transitions.tolist()
+
+    # The rounds in which each pair of states was first seen, and the players' running totals before each round
+    first_seen = {}
+    totals1, totals2 = [0], [0]
+    states = (automaton1.initial_state, automaton2.initial_state)
+    played = 0
+    while played < rounds and states not in first_seen:
+        first_seen[states] = played
+        state1, state2 = states
+        action1, action2 = outputs1[state1], outputs2[state2]
+        reward1, reward2 = payoffs[action1][action2]
+        totals1.append(totals1[-1] + reward1)
+        totals2.append(totals2[-1] + reward2)
+        states = (transitions1[state1][action2], transitions2[state2][action1])
+        played += 1
+    if played == rounds:
+        return totals1[-1], totals2[-1]
+
+    cycle_start = first_seen[states]
+    cycles, remainder = divmod(rounds - played, played - cycle_start)
+    scores = []
+    for totals in (totals1, totals2):
+        cycle_score = totals[played] - totals[cycle_start]
+        scores.append(totals[played] + cycles * cycle_score + totals[cycle_start + remainder] - totals[cycle_start])
+    return scores[0], scores[1]
@@ -0,0 +1,167 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from .normal_form_game import NormalFormGame
+from .result_cache import ResultCache
+
+# File patterns picked up when a directory is given
+GAME_FILE_PATTERNS = ("*.txt", "*.nfg")
+
+
+def find_game_files(inputs: list[str]) -> list[str]:
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            for file_pattern in GAME_FILE_PATTERNS:
+                paths += glob.glob(os.path.join(pattern, file_pattern))
+        else:
+            paths += glob.glob(pattern)
+    return sorted(set(paths))
+
+
+def file_signature(path: str) -> dict:
+    status = os.stat(path)
+    return {"size": status.st_size, "mtime_ns": status.st_mtime_ns}
+
+
+def game_record(game: NormalFormGame) -> dict:
+    """
+    The results of the pure strategy analyses in NormalFormGame.report as a JSON friendly dict
+    """
+    (row_maximin, row_value), (col_maximin, col_value) = game.find_maximin_strategy()
+    row_minimax, col_minimax = game.find_minimax_strategy()
+    return {
+        "rows": game.payoff_array.shape[0],
+        "cols": game.payoff_array.shape[1],
+        "strongly_dominated": game.eliminate_dominated_strategies(True),
+        "weakly_dominated": game.eliminate_dominated_strategies(False),
+        "pure_equilibria": game.find_nash_equilibria(),
+        "pareto_optimal": game.find_pareto_optimal(),
+        "minimax": {"row": row_minimax, "col": col_minimax},
+        "maximin": {"row": row_maximin, "row_value": row_value, "col": col_maximin, "col_value": col_value},
+        "zero_sum": game.is_zero_sum,
+    }
+
+
+def equilibrium_record(game: NormalFormGame, mixed: bool = True, time_limit: float = None) -> dict:
+    """
+    The value of a zero-sum game and, when mixed is set, the mixed equilibria of the game as a JSON friendly dict.
+    Unless the game is zero-sum, truncated tells whether the equilibrium search stopped before it was done
+    """
+    record = {}
+    if game.is_zero_sum:
+        row_strategy, col_strategy, value = game.solve_zero_sum()
+        record["value"] = value
+        # Optimal strategies are exactly the equilibria of a zero-sum game, so the general search is skipped
+        if mixed:
+            record["mixed_equilibria"] = [[row_strategy.tolist(), col_strategy.tolist()]]
+    elif mixed:
+        equilibria = game.find_mixed_equilibria(time_limit=time_limit)
+        record["mixed_equilibria"] = [[row.tolist(), col.tolist()] for row, col in equilibria]
+        # The search stopped early, so the game may have equilibria missing from the list
+        record["truncated"] = equilibria.truncated
+    return record
+
+
+def analyze_game(path: str, mixed: bool = True, time_limit: float = None, cache_directory: str = None) -> dict:
+    """
+    Runs every analysis in NormalFormGame.report on one game file and returns the results as a JSON friendly dict
+    :param cache_directory: a ResultCache directory to reuse the results of the same game, or of a reordering of it,
+    from
+    """
+    result = {"path": path, **file_signature(path)}
+    try:
+        game = NormalFormGame(path)
+        cache = None if cache_directory is None else ResultCache(cache_directory)
+        if cache is not None:
+            result["cached"] = cache.load(game)
+        result.update(game_record(game))
+        result.update(equilibrium_record(game, mixed, time_limit))
+        if cache is not None:
+            cache.store(game)
+    except Exception as error:
+        result["error"] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def load_finished(output: str, paths: list[str]) -> list[dict]:
+    """
+    Reads the records of a previous run that are still up to date, meaning their file has not changed since and their
+    analysis did not fail
+    """
+    if not os.path.exists(output):
+        return []
+    wanted = set(paths)
+    finished = {}
+    with open(output) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # The previous run was interrupted in the middle of writing this line
+                continue
+            path = record.get("path")
+            if path in wanted and "error" not in record and os.path.exists(path) and \
+                    file_signature(path) == {"size": record["size"], "mtime_ns": record["mtime_ns"]}:
+                finished[path] = record
+    return list(finished.values())
+
+
+def run_batch(inputs: list[str], output: str, workers: int = None, resume: bool = False, mixed: bool = True,
+              time_limit: float = None, cache_directory: str = None) -> int:
+    """
+    Analyzes every game file matched by the inputs with a pool of worker processes and writes one JSON line per game
+    :param resume: keep the records of an earlier run for files that have not changed instead of analyzing them again
+    :return: the number of games analyzed in this run
+    """
+    paths = find_game_files(inputs)
+    finished = load_finished(output, paths) if resume else []
+    done = {record["path"] for record in finished}
+    pending = [path for path in paths if path not in done]
+
+    # The finished records replace the output in one step, so an interrupted run can never lose them
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output)), suffix=".tmp")
+    with os.fdopen(descriptor, "w") as file:
+        for record in finished:
+            file.write(json.dumps(record) + "\n")
+    if os.path.exists(output):
+        shutil.copymode(output, temporary)
+    os.replace(temporary, output)
+
+    with open(output, "a") as file:
+        if workers == 1:
+            for path in pending:
+                file.write(json.dumps(analyze_game(path, mixed, time_limit, cache_directory)) + "\n")
+                file.flush()
+        elif pending:
+            with ProcessPoolExecutor(workers) as executor:
+                futures = [executor.submit(analyze_game, path, mixed, time_limit, cache_directory) for path in pending]
+                # Results are written as soon as they finish, so an interrupted run can resume from them
+                for future in as_completed(futures):
+                    file.write(json.dumps(future.result()) + "\n")
+                    file.flush()
+    return len(pending)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze directories or globs of game files into JSON Lines")
+    parser.add_argument("inputs", nargs="+", help="directories or glob patterns of game files")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="the JSON Lines file to write")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--resume", action="store_true", help="skip files that are unchanged since the last run")
+    parser.add_argument("--no-mixed", action="store_true", help="skip the mixed equilibrium search")
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds allowed for each mixed search")
+    parser.add_argument("--cache", default=None, help="a directory of results kept across runs")
+    args = parser.parse_args(argv)
+    analyzed = run_batch(args.inputs, args.output, args.workers, args.resume, not args.no_mixed, args.time_limit,
+                         args.cache)
+    print(f"Analyzed {analyzed} games into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,300 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from .game_generators import GAME_GENERATORS, format_payoff
+from .normal_form_game import NormalFormGame, load_binary_game, parse_payoff, parse_payoff_array, stream_payoff_file, \
+    write_binary_game
+from .player import Game, RandomChoice
+
+# Square game sizes timed by default
+BENCHMARK_SIZES = (2, 10, 100, 500, 2000)
+DEFAULT_REPEATS = 5
+# A benchmark stops repeating once its runs add up to this many seconds, so the largest games are only timed once
+REPEAT_TIME_BUDGET = 2.0
+# Rounds played when timing Game.simulate
+SIMULATION_ROUNDS = 100_000
+# A benchmark is flagged when it got slower than the baseline by more than this fraction
+REGRESSION_THRESHOLD = 0.25
+# Differences below this many seconds are timer noise and never flagged
+NOISE_FLOOR = 1e-3
+# The command lines whose startup is timed, each run as python -X importtime followed by its arguments
+STARTUP_COMMANDS = {
+    "help": ["-m", "gametheory", "--help"],
+    "analyze": ["-m", "gametheory", "analyze", "data/prog4A.txt"],
+    "simulate": ["-m", "gametheory", "simulate", "tit-for-tat", "always-defect", "--rounds", "10"],
+    "tournament": ["-m", "gametheory", "tournament", "--rounds", "10", "-j", "1"],
+    "main": ["main.py", "--help"],
+}
+# Modules each command must not import, the heavy ones it has no use for
+FORBIDDEN_IMPORTS = {
+    "help": ("numpy", "scipy", "gametheory.normal_form_game", "gametheory.player"),
+    "analyze": ("scipy", "gametheory.result_cache", "gametheory.selfplay", "tracemalloc"),
+    "simulate": ("scipy", "gametheory.normal_form_game", "tracemalloc"),
+    "tournament": ("scipy", "gametheory.normal_form_game", "tracemalloc"),
+    "main": ("numpy", "scipy", "gametheory.normal_form_game", "gametheory.player", "gametheory.result_cache",
+             "tracemalloc"),
+}
+# Import time differences below this many seconds are noise between interpreter runs and never flagged
+STARTUP_NOISE_FLOOR = 0.01
+
+
+def time_call(function, repeats: int = DEFAULT_REPEATS, setup=None) -> list[float]:
+    """
+    Times the function at least once and up to repeats times, calling setup untimed before every run
+    :return: the duration of each run in seconds
+    """
+    timings = []
+    while len(timings) < repeats and sum(timings) < REPEAT_TIME_BUDGET:
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _benchmarks(payoff_array, directory: str = None) -> dict:
+    """
+    The benchmarks on one game, each as a function to time and an untimed setup to call before it
+    :param directory: where the game files read by the loading benchmarks are written, before their first run
+    """
+    # Each analysis is timed from a cold cache, since NormalFormGame would otherwise return the first run's results
+    game = NormalFormGame(payoff_array)
+    text = format_payoff(payoff_array)
+    num_actions_player1, num_actions_player2 = payoff_array.shape[:2]
+    text_path, binary_path = (None, None) if directory is None else \
+        (os.path.join(directory, "game.txt"), os.path.join(directory, "game.nfg"))
+
+    def write_text_file():
+        if not os.path.exists(text_path):
+            with open(text_path, "w") as file:
+                file.write(text)
+
+    def write_binary_file():
+        if not os.path.exists(binary_path):
+            write_binary_game(binary_path, payoff_array)
+
+    return {
+        "find_nash_equilibria": (game.find_nash_equilibria, game.invalidate_cache),
+        "find_pareto_optimal": (game.find_pareto_optimal, game.invalidate_cache),
+        "eliminate_strongly_dominated": (lambda: game.eliminate_dominated_strategies(True), game.invalidate_cache),
+        "eliminate_weakly_dominated": (lambda: game.eliminate_dominated_strategies(False), game.invalidate_cache),
+        "find_minimax_strategy": (game.find_minimax_strategy, game.invalidate_cache),
+        "parse_payoff": (lambda: parse_payoff(text), None),
+        "parse_payoff_array": (lambda: parse_payoff_array(text), None),
+        "stream_payoff_file": (lambda: stream_payoff_file(text_path), write_text_file),
+        # The file is only mapped into memory when loaded, so its payoffs are summed to read them all
+        "load_binary_game": (lambda: load_binary_game(binary_path).sum(), write_binary_file),
+        "Game.simulate": (lambda: Game(SIMULATION_ROUNDS, RandomChoice(range(num_actions_player1), "Random"),
+                                       RandomChoice(range(num_actions_player2), "Random"), payoff_array, seed=0,
+                                       quiet=True), None),
+    }
+
+
+BENCHMARK_NAMES = tuple(_benchmarks(np.zeros((1, 1, 2), dtype=int)))
+
+
+def run_benchmarks(generators=None, sizes=BENCHMARK_SIZES, benchmarks=None, repeats: int = DEFAULT_REPEATS,
+                   seed: int = 0, progress=None) -> dict:
+    """
+    Times every benchmark on a generated game of every generator and size
+    :param generators: names from GAME_GENERATORS, all of them by default
+    :param benchmarks: names from BENCHMARK_NAMES, all of them by default
+    :param seed: seeds the generators so every run times the same games
+    :param progress: called with each result as soon as it is measured
+    :return: a JSON friendly dict holding the run's metadata and one result per generator, size and benchmark, with the
+    fastest and median time in seconds
+    """
+    generators = list(GAME_GENERATORS) if generators is None else generators
+    benchmarks = list(BENCHMARK_NAMES) if benchmarks is None else benchmarks
+    results = []
+    for generator in generators:
+        for size in sizes:
+            payoff_array = GAME_GENERATORS[generator](size, size, seed)
+            with tempfile.TemporaryDirectory() as directory:
+                timed = _benchmarks(payoff_array, directory)
+                for benchmark in benchmarks:
+                    function, setup = timed[benchmark]
+                    timings = time_call(function, repeats, setup)
+                    result = {"generator": generator, "rows": size, "cols": size, "benchmark": benchmark,
+                              "seconds": min(timings), "median": float(np.median(timings)), "repeats": len(timings)}
+                    results.append(result)
+                    if progress is not None:
+                        progress(result)
+    metadata = {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+                "seed": seed, "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    return {"metadata": metadata, "results": results}
+
+
+def _result_key(result: dict) -> tuple:
+    return result["generator"], result["rows"], result["cols"], result["benchmark"]
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD) -> list[dict]:
+    """
+    Finds the benchmarks that got slower than the baseline by more than the threshold. Benchmarks missing from either
+    run are skipped
+    :return: one dict per regression with the baseline and current fastest times and their ratio
+    """
+    baseline_seconds = {_result_key(result): result["seconds"] for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        key = _result_key(result)
+        if key not in baseline_seconds:
+            continue
+        before, after = baseline_seconds[key], result["seconds"]
+        if after > before * (1 + threshold) and after - before > NOISE_FLOOR:
+            regressions.append({"generator": key[0], "rows": key[1], "cols": key[2], "benchmark": key[3],
+                                "baseline": before, "current": after, "ratio": after / before})
+    return regressions
+
+
+def parse_importtime(stderr: str) -> tuple[float, set[str]]:
+    """
+    Reads the report of python -X importtime, one "import time: self [us] | cumulative | name" line per module
+    :return: the seconds spent importing every module and the names of the imported modules
+    """
+    total = 0
+    modules = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, _, name = line[len("import time:"):].split("|")
+        # The header line holds column titles instead of times
+        if not self_time.strip().isdigit():
+            continue
+        total += int(self_time)
+        modules.add(name.strip())
+    return total / 1e6, modules
+
+
+def run_startup_benchmarks(commands=None, repeats: int = DEFAULT_REPEATS) -> dict:
+    """
+    Runs each command line of the gametheory CLI and main.py in a fresh interpreter and measures how long its imports
+    take
+    :param commands: names from STARTUP_COMMANDS, all of them by default
+    :return: a JSON friendly dict holding the run's metadata and one result per command, with the fastest import time in
+    seconds and the forbidden modules it imported
+    """
+    commands = list(STARTUP_COMMANDS) if commands is None else commands
+    # The commands name the package and the example games relative to the top of the repository
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for command in commands:
+        timings = []
+        for _ in range(repeats):
+            command_line = [sys.executable, "-X", "importtime", *STARTUP_COMMANDS[command]]
+            completed = subprocess.run(command_line, cwd=root, capture_output=True, text=True, check=True)
+            seconds, modules = parse_importtime(completed.stderr)
+            timings.append(seconds)
+        forbidden = sorted(module for module in FORBIDDEN_IMPORTS[command] if module in modules)
+        results.append({"command": command, "seconds": min(timings), "median": float(np.median(timings)),
+                        "modules": len(modules), "forbidden": forbidden})
+    metadata = {"python": platform.python_version(), "numpy": np.__version__, "platform": platform.platform(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    return {"metadata": metadata, "results": results}
+
+
+def compare_startup(baseline: dict, current: dict, threshold: float = REGRESSION_THRESHOLD) -> list[dict]:
+    """
+    Finds the commands whose imports got slower than the baseline by more than the threshold, or that import a module
+    they must not
+    :return: one dict per regression, forbidden imports are reported even without a baseline
+    """
+    baseline_seconds = {result["command"]: result["seconds"] for result in baseline["results"]} if baseline else {}
+    regressions = []
+    for result in current["results"]:
+        command, after = result["command"], result["seconds"]
+        if result["forbidden"]:
+            regressions.append({"command": command, "forbidden": result["forbidden"]})
+        before = baseline_seconds.get(command)
+        if before is not None and after > before * (1 + threshold) and after - before > STARTUP_NOISE_FLOOR:
+            regressions.append({"command": command, "baseline": before, "current": after, "ratio": after / before})
+    return regressions
+
+
+def _report_startup_regressions(regressions: list[dict]) -> int:
+    for regression in regressions:
+        if "forbidden" in regression:
+            print(f"REGRESSION {regression['command']:<12} imports {', '.join(regression['forbidden'])}")
+        else:
+            print(f"REGRESSION {regression['command']:<12} {regression['baseline']:.6f}s -> "
+                  f"{regression['current']:.6f}s ({regression['ratio']:.2f}x)")
+    print(f"{len(regressions)} regressions")
+    return 1 if regressions else 0
+
+
+def _format_result(result: dict) -> str:
+    size = f"{result['rows']}x{result['cols']}"
+    return f"{result['generator']:>18} {size:<10} {result['benchmark']:<30}"
+
+
+def _report_regressions(regressions: list[dict]) -> int:
+    for regression in regressions:
+        print(f"REGRESSION {_format_result(regression)} {regression['baseline']:.6f}s -> "
+              f"{regression['current']:.6f}s ({regression['ratio']:.2f}x)")
+    print(f"{len(regressions)} regressions")
+    return 1 if regressions else 0
+
+
+def _load(path: str) -> dict:
+    with open(path) as file:
+        return json.load(file)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Time the game analyses on generated games and track regressions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser("run", help="run the benchmarks and write their timings as JSON")
+    run_parser.add_argument("-o", "--output", default="benchmark.json", help="the JSON file to write")
+    run_parser.add_argument("--generators", nargs="+", choices=list(GAME_GENERATORS), default=None)
+    run_parser.add_argument("--sizes", nargs="+", type=int, default=list(BENCHMARK_SIZES))
+    run_parser.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARK_NAMES), default=None)
+    run_parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    run_parser.add_argument("--seed", type=int, default=0)
+    run_parser.add_argument("--baseline", default=None, help="a previous run to compare the new timings against")
+    run_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    compare_parser = subparsers.add_parser("compare", help="flag the regressions between two saved runs")
+    compare_parser.add_argument("baseline", help="the saved baseline run")
+    compare_parser.add_argument("current", help="the run to check")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    startup_parser = subparsers.add_parser("startup", help="time the imports of each command line of the CLI")
+    startup_parser.add_argument("-o", "--output", default="startup.json", help="the JSON file to write")
+    startup_parser.add_argument("--commands", nargs="+", choices=list(STARTUP_COMMANDS), default=None)
+    startup_parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    startup_parser.add_argument("--baseline", default=None, help="a previous run to compare the new timings against")
+    startup_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    if args.command == "startup":
+        results = run_startup_benchmarks(args.commands, args.repeats)
+        for result in results["results"]:
+            print(f"{result['command']:<12} {result['seconds']:.6f}s {result['modules']:>5} modules")
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=1)
+        baseline = None if args.baseline is None else _load(args.baseline)
+        return _report_startup_regressions(compare_startup(baseline, results, args.threshold))
+
+    if args.command == "compare":
+        return _report_regressions(compare_results(_load(args.baseline), _load(args.current), args.threshold))
+
+    results = run_benchmarks(args.generators, args.sizes, args.benchmarks, args.repeats, args.seed,
+                             lambda result: print(f"{_format_result(result)} {result['seconds']:.6f}s", flush=True))
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=1)
+    print(f"Wrote {len(results['results'])} timings to {args.output}")
+    if args.baseline is not None:
+        return _report_regressions(compare_results(_load(args.baseline), results, args.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import argparse
+import contextlib
+
+# Each strategy a command line can name, built from the player module once it has been imported
+PLAYERS = {
+    "tit-for-tat": lambda players: players.TitForTat(),
+    "grudge": lambda players: players.Grudge(),
+    "always-defect": lambda players: players.AlwaysDefect(),
+    "always-cooperate": lambda players: players.AlwaysCooperate(),
+    "random": lambda players: players.Random(),
+    "regret-matching": lambda players: players.RegretMatching(),
+    "regret-matching+": lambda players: players.RegretMatching(plus=True),
+    "fictitious-play": lambda players: players.FictitiousPlay(),
+}
+
+
+def _make_players(names: list[str]) -> list:
+    from . import player
+    return [PLAYERS[name](player) for name in names]
+
+
+def analyze(args) -> int:
+    from .instrumentation import Profile
+    from .normal_form_game import NormalFormGame
+    cache = None
+    if args.cache is not None:
+        from .result_cache import ResultCache
+        cache = ResultCache(args.cache)
+    with Profile(trace_memory=True) if args.profile else contextlib.nullcontext() as profile:
+        for path in args.files:
+            game = NormalFormGame(path)
+            if cache is not None:
+                cache.load(game)
+            game.report(path)
+            if cache is not None:
+                cache.store(game)
+    if args.profile:
+        print(profile.report())
+    return 0
+
+
+def simulate(args) -> int:
+    from .player import Game
+    player1, player2 = _make_players([args.player1, args.player2])
+    payoffs = None
+    if args.game is not None:
+        from .normal_form_game import read_payoff_file
+        payoffs = read_payoff_file(args.game)
+    Game(args.rounds, player1, player2, payoffs, args.seed)
+    return 0
+
+
+def tournament(args) -> int:
+    import numpy as np
+
+    from .tournament import load_payoff_matrices, run_tournament
+    payoff_matrices = [[[(2, 2), (-1, 3)], [(3, -1), (0, 0)]]] if args.games is None else \
+        load_payoff_matrices(args.games)
+    if not payoff_matrices:
+        print(f"No games match {args.games}")
+        return 1
+    roster = _make_players(args.players)
+    scores = run_tournament(roster, payoff_matrices, args.rounds, args.seed, args.workers)
+    # Pairings a player cannot play hold NaN, so each player's total only covers the matches they played
+    totals = np.nansum(scores[..., 0], axis=(0, 2)) + np.nansum(scores[..., 1], axis=(0, 1))
+    played = ~np.isnan(scores[..., 0])
+    matches = played.sum(axis=(0, 2)) + played.sum(axis=(0, 1))
+    print(f"{'Player':<20}{'Total':>12}{'Matches':>10}")
+    for name, total, count in sorted(zip(args.players, totals.tolist(), matches.tolist()), key=lambda item: -item[1]):
+        print(f"{name:<20}{total:>12.10g}{count:>10}")
+    if not played.all():
+        print(f"Skipped {(~played).sum()} pairings that need actions their game does not have")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="gametheory", description="Analyze normal form games and play them")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    analyze_parser = subparsers.add_parser("analyze", help="print the analysis of each game file")
+    analyze_parser.add_argument("files", nargs="+")
+    analyze_parser.add_argument("--cache", default=None, help="a directory of analysis results kept across runs")
+    analyze_parser.add_argument("--profile", action="store_true", help="time each analysis phase")
+    analyze_parser.set_defaults(run=analyze)
+
+    simulate_parser = subparsers.add_parser("simulate", help="play a repeated game between two strategies")
+    simulate_parser.add_argument("player1", choices=list(PLAYERS))
+    simulate_parser.add_argument("player2", choices=list(PLAYERS))
+    simulate_parser.add_argument("--game", default=None, help="a game file, the prisoner's dilemma by default")
+    simulate_parser.add_argument("--rounds", type=int, default=1000)
+    simulate_parser.add_argument("--seed", type=int, default=None)
+    simulate_parser.set_defaults(run=simulate)
+
+    tournament_parser = subparsers.add_parser("tournament", help="play every pairing of the strategies")
+    tournament_parser.add_argument("--games", default=None,
+                                   help="a glob pattern of game files, the prisoner's dilemma by default")
+    tournament_parser.add_argument("--players", nargs="+", choices=list(PLAYERS), default=list(PLAYERS))
+    tournament_parser.add_argument("--rounds", type=int, default=1000)
+    tournament_parser.add_argument("--seed", type=int, default=None)
+    tournament_parser.add_argument("-j", "--workers", type=int, default=None)
+    tournament_parser.set_defaults(run=tournament)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.run(args)
@@ -0,0 +1,308 @@
+import math
+import time
+from itertools import combinations
+
+import numpy as np
+
+# Tolerance used when checking probabilities and best response conditions
+EQUILIBRIUM_TOLERANCE = 1e-9
+# Number of support pairs solved together in one batched call
+SUPPORT_BATCH_SIZE = 4096
+# Games with more support pairs than this are solved with Lemke-Howson by default
+SUPPORT_ENUMERATION_LIMIT = 200_000
+# Default number of pivots allowed for each Lemke-Howson path
+DEFAULT_MAX_PIVOTS = 10_000
+# Default gap between the upper and lower bound on the value at which the iterative zero-sum solver stops
+ZERO_SUM_TOLERANCE = 1e-3
+# Default iteration budget of the iterative zero-sum solver
+ZERO_SUM_MAX_ITERATIONS = 1_000_000
+# Iterations between checks of the iterative zero-sum solver's gap
+ZERO_SUM_CHECK_INTERVAL = 100
+# Games with more cells than this are solved iteratively by default, since the dense linear program grows too slow
+ZERO_SUM_LP_LIMIT = 250_000
+
+
+def count_support_pairs(num_actions_player1: int, num_actions_player2: int) -> int:
+    return sum(math.comb(num_actions_player1, k) * math.comb(num_actions_player2, k)
+               for k in range(1, min(num_actions_player1, num_actions_player2) + 1))
+
+
+def _solve_indifference(payoffs, rows, cols):
+    """
+    Solves for the mixture over the given columns that makes the row player indifferent between the given rows
+    :param payoffs: the (rows, cols) payoffs of the player who has to be indifferent
+    :param rows: (batch, k) row supports
+    :param cols: (batch, k) column supports
+    :return: the (batch, k) column mixtures, the (batch,) indifference values and which systems were solvable
+    """
+    batch, k = rows.shape
+    system = np.zeros((batch, k + 1, k + 1))
+    system[:, :k, :k] = payoffs[rows[:, :, np.newaxis], cols[:, np.newaxis, :]]
+    system[:, :k, k] = -1
+    system[:, k, :k] = 1
+    rhs = np.zeros((batch, k + 1))
+    rhs[:, k] = 1
+
+    solvable = np.abs(np.linalg.det(system)) > EQUILIBRIUM_TOLERANCE
+    solution = np.zeros((batch, k + 1))
+    if solvable.any():
+        solution[solvable] = np.linalg.solve(system[solvable], rhs[solvable, :, np.newaxis])[:, :, 0]
+    return solution[:, :k], solution[:, k], solvable
+
+
+class EquilibriumList(list):
+    """
+    The equilibria a search found
+    :var truncated is whether the search ran out of time or pivots before it was done, so there may be more
+    """
+    def __init__(self, equilibria=(), truncated: bool = False):
+        super().__init__(equilibria)
+        self.truncated = truncated
+
+
+def _unique(equilibria, truncated: bool = False) -> EquilibriumList:
+    unique = EquilibriumList(truncated=truncated)
+    seen = set()
+    for row_strategy, col_strategy in equilibria:
+        key = tuple(np.round(np.concatenate((row_strategy, col_strategy)), 6))
+        if key not in seen:
+            seen.add(key)
+            unique.append((row_strategy, col_strategy))
+    return unique
+
+
+def support_enumeration(payoff_array, time_limit: float = None) -> EquilibriumList:
+    """
+    Finds the Nash equilibria of a bimatrix game by solving the indifference conditions of every pair of equally sized
+    supports. This finds every equilibrium of a nondegenerate game
+    :param payoff_array: a (rows, cols, 2) payoff array
+    :param time_limit: seconds after which the search stops and returns the equilibria found so far
+    :return: a list of (row strategy, column strategy) probability vectors, truncated when the time ran out
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    player1_payoffs = np.asarray(payoff_array[:, :, 0], dtype=float)
+    player2_payoffs = np.asarray(payoff_array[:, :, 1], dtype=float)
+    num_actions_player1, num_actions_player2 = player1_payoffs.shape
+
+    equilibria = []
+    for k in range(1, min(num_actions_player1, num_actions_player2) + 1):
+        row_supports = np.array(list(combinations(range(num_actions_player1), k)), dtype=int)
+        col_supports = np.array(list(combinations(range(num_actions_player2), k)), dtype=int)
+        num_pairs = len(row_supports) * len(col_supports)
+        for start in range(0, num_pairs, SUPPORT_BATCH_SIZE):
+            if deadline is not None and time.perf_counter() > deadline:
+                return _unique(equilibria, truncated=True)
+            pairs = np.arange(start, min(start + SUPPORT_BATCH_SIZE, num_pairs))
+            rows = row_supports[pairs // len(col_supports)]
+            cols = col_supports[pairs % len(col_supports)]
+
+            # The column mixture makes the row player indifferent over their support, and vice versa
+            col_mixtures, row_values, col_solvable = _solve_indifference(player1_payoffs, rows, cols)
+            row_mixtures, col_values, row_solvable = _solve_indifference(player2_payoffs.T, cols, rows)
+            valid = col_solvable & row_solvable
+            valid &= (col_mixtures >= -EQUILIBRIUM_TOLERANCE).all(axis=1)
+            valid &= (row_mixtures >= -EQUILIBRIUM_TOLERANCE).all(axis=1)
+            if not valid.any():
+                continue
+
+            batch = np.flatnonzero(valid)
+            row_strategies = np.zeros((len(batch), num_actions_player1))
+            col_strategies = np.zeros((len(batch), num_actions_player2))
+            np.put_along_axis(row_strategies, rows[batch], np.clip(row_mixtures[batch], 0, None), axis=1)
+            np.put_along_axis(col_strategies, cols[batch], np.clip(col_mixtures[batch], 0, None), axis=1)
+
+            # No action outside the support may do better than the indifference value
+            row_best = (col_strategies @ player1_payoffs.T).max(axis=1) <= row_values[batch] + EQUILIBRIUM_TOLERANCE
+            col_best = (row_strategies @ player2_payoffs).max(axis=1) <= col_values[batch] + EQUILIBRIUM_TOLERANCE
+            for i in np.flatnonzero(row_best & col_best):
+                equilibria.append((row_strategies[i], col_strategies[i]))
+
+    return _unique(equilibria)
+
+
+def _pivot(tableau, basis, entering: int, tie_breaking_columns) -> int:
+    """
+    Pivots the entering label into the basis using the lexicographic minimum ratio test
+    :param tie_breaking_columns: the columns of the starting basis, compared after the right hand side to break ties
+    :return: the label that left the basis
+    """
+    column = tableau[:, entering]
+    candidates = np.flatnonzero(column > EQUILIBRIUM_TOLERANCE)
+    ratios = tableau[candidates, -1] / column[candidates]
+    candidates = candidates[ratios <= ratios.min() + EQUILIBRIUM_TOLERANCE]
+    if len(candidates) > 1:
+        # Degenerate step: the columns of the starting basis break the tie lexicographically
+        ratios = tableau[candidates][:, tie_breaking_columns] / column[candidates, np.newaxis]
+        row = candidates[np.lexsort(ratios.T[::-1])[0]]
+    else:
+        row = candidates[0]
+
+    pivot_row = tableau[row] / tableau[row, entering]
+    tableau -= np.outer(tableau[:, entering], pivot_row)
+    tableau[row] = pivot_row
+    leaving = basis[row]
+    basis[row] = entering
+    return leaving
+
+
+def _lemke_howson_path(payoff_array, initial_label: int, max_pivots: int):
+    player1_payoffs = np.asarray(payoff_array[:, :, 0], dtype=float)
+    player2_payoffs = np.asarray(payoff_array[:, :, 1], dtype=float)
+    num_actions_player1, num_actions_player2 = player1_payoffs.shape
+    num_labels = num_actions_player1 + num_actions_player2
+
+    # Shifting the payoffs to be positive leaves the equilibria unchanged and keeps the polytopes bounded
+    player1_payoffs = player1_payoffs - player1_payoffs.min() + 1
+    player2_payoffs = player2_payoffs - player2_payoffs.min() + 1
+
+    # Tableau columns are indexed by label. The row tableau describes B^T x + s = 1 and starts with the slacks
+    # (column labels) in the basis, the column tableau describes r + A y = 1 and starts with the slacks (row labels)
+    row_tableau = np.hstack((player2_payoffs.T, np.eye(num_actions_player2), np.ones((num_actions_player2, 1))))
+    col_tableau = np.hstack((np.eye(num_actions_player1), player1_payoffs, np.ones((num_actions_player1, 1))))
+    row_basis = np.arange(num_actions_player1, num_labels)
+    col_basis = np.arange(num_actions_player1)
+    row_tie_breaking = row_basis.copy()
+    col_tie_breaking = col_basis.copy()
+
+    # The dropped label is a row action, nonbasic in the row tableau, or a column action, nonbasic in the column one
+    entering = initial_label
+    in_row_tableau = initial_label < num_actions_player1
+    for pivots in range(1, max_pivots + 1):
+        if in_row_tableau:
+            leaving = _pivot(row_tableau, row_basis, entering, row_tie_breaking)
+        else:
+            leaving = _pivot(col_tableau, col_basis, entering, col_tie_breaking)
+        if leaving == initial_label:
+            break
+        entering = leaving
+        in_row_tableau = not in_row_tableau
+    else:
+        return None, max_pivots
+
+    row_strategy = np.zeros(num_actions_player1)
+    col_strategy = np.zeros(num_actions_player2)
+    for row, label in enumerate(row_basis):
+        if label < num_actions_player1:
+            row_strategy[label] = row_tableau[row, -1]
+    for row, label in enumerate(col_basis):
+        if label >= num_actions_player1:
+            col_strategy[label - num_actions_player1] = col_tableau[row, -1]
+    return (row_strategy / row_strategy.sum(), col_strategy / col_strategy.sum()), pivots
+
+
+def lemke_howson(payoff_array, initial_label: int = 0, max_pivots: int = DEFAULT_MAX_PIVOTS):
+    """
+    Follows the Lemke-Howson path from the artificial equilibrium by dropping the given label
+    :param payoff_array: a (rows, cols, 2) payoff array
+    :param initial_label: the label to drop, row actions are numbered first and then column actions
+    :param max_pivots: the pivot budget for the path
+    :return: a (row strategy, column strategy) pair, or None if the pivot budget ran out
+    """
+    return _lemke_howson_path(payoff_array, initial_label, max_pivots)[0]
+
+
+def lemke_howson_all_labels(payoff_array, max_pivots: int = DEFAULT_MAX_PIVOTS,
+                            time_limit: float = None) -> EquilibriumList:
+    """
+    Runs Lemke-Howson from every initial label and collects the distinct equilibria it reaches
+    :param max_pivots: the pivot budget of each path, so a long path cannot starve the others
+    :param time_limit: seconds after which no further paths are started
+    :return: the equilibria, truncated when a path ran out of pivots or a label was skipped for time
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    num_labels = payoff_array.shape[0] + payoff_array.shape[1]
+    equilibria = []
+    truncated = False
+    for label in range(num_labels):
+        if deadline is not None and time.perf_counter() > deadline:
+            truncated = True
+            break
+        equilibrium, _ = _lemke_howson_path(payoff_array, label, max_pivots)
+        if equilibrium is None:
+            truncated = True
+        else:
+            equilibria.append(equilibrium)
+    return _unique(equilibria, truncated)
+
+
+def solve_zero_sum_lp(player1_payoffs) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    Solves a zero-sum game with one linear program. The row player maximizes v subject to x @ A >= v for every column,
+    and the column player's optimal strategy is read off the dual values of those constraints
+    :param player1_payoffs: the (rows, cols) payoffs of the row player, which the column player loses
+    :return: the optimal row and column strategies and the value of the game to the row player
+    """
+    from scipy.optimize import linprog
+
+    player1_payoffs = np.asarray(player1_payoffs, dtype=float)
+    num_actions_player1, num_actions_player2 = player1_payoffs.shape
+    objective = np.append(np.zeros(num_actions_player1), -1)
+    constraints = np.hstack((-player1_payoffs.T, np.ones((num_actions_player2, 1))))
+    result = linprog(objective, A_ub=constraints, b_ub=np.zeros(num_actions_player2),
+                     A_eq=np.append(np.ones(num_actions_player1), 0)[np.newaxis, :], b_eq=[1],
+                     bounds=[(0, None)] * num_actions_player1 + [(None, None)], method='highs')
+    if result.status != 0:
+        raise RuntimeError(f"Zero-sum linear program failed: {result.message}")
+    row_strategy = np.clip(result.x[:-1], 0, None)
+    col_strategy = np.clip(-result.ineqlin.marginals, 0, None)
+    return row_strategy / row_strategy.sum(), col_strategy / col_strategy.sum(), result.x[-1].item()
+
+
+def solve_zero_sum_iterative(player1_payoffs, tolerance: float = ZERO_SUM_TOLERANCE,
+                             max_iterations: int = ZERO_SUM_MAX_ITERATIONS) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    Approximates the solution of a zero-sum game by letting both players run regret matching+ against each other, taking
+    turns and weighing later iterations more in the average strategies. The average strategies bound the value from
+    both sides, and the search stops once the bounds are within tolerance
+    :param player1_payoffs: the (rows, cols) payoffs of the row player, which the column player loses
+    :param tolerance: the largest gap allowed between the bounds on the value, in payoff units
+    :return: the average row and column strategies and the middle of the bounds on the value
+    """
+    player1_payoffs = np.ascontiguousarray(player1_payoffs, dtype=float)
+    transposed = np.ascontiguousarray(player1_payoffs.T)
+    num_actions_player1, num_actions_player2 = player1_payoffs.shape
+    row_regrets = np.zeros(num_actions_player1)
+    col_regrets = np.zeros(num_actions_player2)
+    row_strategy = np.full(num_actions_player1, 1 / num_actions_player1)
+    col_strategy = np.full(num_actions_player2, 1 / num_actions_player2)
+    row_sum = np.zeros(num_actions_player1)
+    col_sum = np.zeros(num_actions_player2)
+
+    for iteration in range(1, max_iterations + 1):
+        values = player1_payoffs @ col_strategy
+        row_regrets += values - values @ row_strategy
+        np.maximum(row_regrets, 0, out=row_regrets)
+        total = row_regrets.sum()
+        row_strategy = row_regrets / total if total > 0 else np.full(num_actions_player1, 1 / num_actions_player1)
+        row_sum += iteration * row_strategy
+
+        # The column player responds to the row player's new strategy and wants to lose as little as possible
+        losses = transposed @ row_strategy
+        col_regrets += losses @ col_strategy - losses
+        np.maximum(col_regrets, 0, out=col_regrets)
+        total = col_regrets.sum()
+        col_strategy = col_regrets / total if total > 0 else np.full(num_actions_player2, 1 / num_actions_player2)
+        col_sum += iteration * col_strategy
+
+        if iteration % ZERO_SUM_CHECK_INTERVAL == 0 or iteration == max_iterations:
+            upper = (player1_payoffs @ (col_sum / col_sum.sum())).max()
+            lower = (transposed @ (row_sum / row_sum.sum())).min()
+            if upper - lower <= tolerance:
+                break
+
+    return row_sum / row_sum.sum(), col_sum / col_sum.sum(), ((upper + lower) / 2).item()
+
+
+def solve_zero_sum(player1_payoffs, method: str = 'auto',
+                   tolerance: float = ZERO_SUM_TOLERANCE) -> tuple[np.ndarray, np.ndarray, float]:
+    """
+    Solves a zero-sum game with solve_zero_sum_lp ('lp') or solve_zero_sum_iterative ('iterative'). 'auto' uses the
+    linear program for games with at most ZERO_SUM_LP_LIMIT cells
+    """
+    if method == 'auto':
+        method = 'lp' if np.size(player1_payoffs) <= ZERO_SUM_LP_LIMIT else 'iterative'
+    if method == 'lp':
+        return solve_zero_sum_lp(player1_payoffs)
+    if method == 'iterative':
+        return solve_zero_sum_iterative(player1_payoffs, tolerance)
+    raise ValueError(f"Unknown zero-sum method {method}")
@@ -0,0 +1,192 @@
+import numpy as np
+
+from .equilibria import EQUILIBRIUM_TOLERANCE
+from .normal_form_game import NormalFormGame, default_action_labels, to_payoff_array
+
+# Bound on the (games, actions, actions, opponent actions) comparison tensors of the batched dominance test
+DOMINANCE_BLOCK_SIZE = 1 << 24
+
+
+def _stacked_dominated(payoffs, alive, alive_opponents, strongly: bool) -> np.ndarray:
+    # payoffs[k, i, j] is what action i earns against opponent action j in game k. An alive action is dominated when
+    # another alive action earns more, or at least as much for weak domination, against every alive opponent action
+    num_games, num_actions, num_opponent_actions = payoffs.shape
+    compare = np.greater if strongly else np.greater_equal
+    dominated = np.zeros(alive.shape, dtype=bool)
+    not_itself = ~np.eye(num_actions, dtype=bool)
+    # earlier[i, r] is whether action r comes before action i, which breaks ties between identical actions
+    earlier = np.tri(num_actions, k=-1, dtype=bool)
+    block = max(1, DOMINANCE_BLOCK_SIZE // (num_actions * num_actions * num_opponent_actions))
+    for start in range(0, num_games, block):
+        games = slice(start, start + block)
+        # beats[k, i, r, j] is whether action r does better than action i against opponent action j
+        beats = compare(payoffs[games, np.newaxis, :, :], payoffs[games, :, np.newaxis, :])
+        beats |= ~alive_opponents[games, np.newaxis, np.newaxis, :]
+        dominators = beats.all(axis=3) & alive[games, np.newaxis, :] & not_itself
+        if not strongly:
+            # Only the first of several identical actions survives weak domination, as in NormalFormGame
+            differs = payoffs[games, np.newaxis, :, :] != payoffs[games, :, np.newaxis, :]
+            differs &= alive_opponents[games, np.newaxis, np.newaxis, :]
+            dominators &= differs.any(axis=3) | earlier
+        dominated[games] = dominators.any(axis=2) & alive[games]
+    return dominated
+
+
+class GameBatch:
+    """
+    Many two player games with the same number of actions, analyzed together. Every analysis runs on all the games in
+    one pass over the stacked payoffs and gives the same results as the NormalFormGame method it is named after
+    :var payoff_stack is a (games, rows, cols, 2) array holding the payoff_array of each game
+    """
+    def __init__(self, games):
+        """
+        :param games: a (games, rows, cols, 2) payoff array, or a sequence of payoff matrices or NormalFormGames of the
+        same shape
+        """
+        if isinstance(games, np.ndarray) and games.ndim == 4:
+            payoff_stack = np.ascontiguousarray(games)
+        else:
+            payoff_stack = np.stack([game.payoff_array if isinstance(game, NormalFormGame) else to_payoff_array(game)
+                                     for game in games])
+        if payoff_stack.ndim != 4 or payoff_stack.shape[-1] != 2 or 0 in payoff_stack.shape[1:]:
+            raise ValueError(f"Expected a (games, rows, cols, 2) payoff array, got shape {payoff_stack.shape}")
+        self.payoff_stack = payoff_stack
+
+    def __len__(self) -> int:
+        return len(self.payoff_stack)
+
+    @property
+    def action_counts(self) -> tuple[int, int]:
+        return self.payoff_stack.shape[1:3]
+
+    def game(self, index: int) -> NormalFormGame:
+        return NormalFormGame(self.payoff_stack[index])
+
+    def pure_nash_mask(self) -> np.ndarray:
+        """
+        :return: a (games, rows, cols) array marking the pure strategy Nash equilibria of each game
+        """
+        player1_payoffs = self.payoff_stack[..., 0]
+        player2_payoffs = self.payoff_stack[..., 1]
+        mask = player1_payoffs == player1_payoffs.max(axis=1, keepdims=True)
+        mask &= player2_payoffs == player2_payoffs.max(axis=2, keepdims=True)
+        return mask
+
+    def pareto_optimal_mask(self) -> np.ndarray:
+        """
+        :return: a (games, rows, cols) array marking the Pareto optimal cells of each game, from one sort of every
+        game's cells
+        """
+        num_games = len(self)
+        player1_payoffs = self.payoff_stack[..., 0].reshape(num_games, -1)
+        player2_payoffs = self.payoff_stack[..., 1].reshape(num_games, -1)
+        num_cells = player1_payoffs.shape[1]
+
+        # Each game's cells from the best Player 1 payoff down, and within the same Player 1 payoff from the best
+        # Player 2 payoff down, so the first cell of every group holds the group's best Player 2 payoff
+        order = np.lexsort((-player2_payoffs, -player1_payoffs), axis=-1)
+        sorted1 = np.take_along_axis(player1_payoffs, order, axis=1)
+        sorted2 = np.take_along_axis(player2_payoffs, order, axis=1)
+        group_start = np.ones(sorted1.shape, dtype=bool)
+        group_start[:, 1:] = sorted1[:, 1:] != sorted1[:, :-1]
+        start = np.maximum.accumulate(np.where(group_start, np.arange(num_cells), 0), axis=1)
+
+        # A cell survives when it has its group's best Player 2 payoff and beats the Player 2 payoff of every cell
+        # with a better Player 1 payoff
+        best_in_group = np.take_along_axis(sorted2, start, axis=1)
+        best_before = np.take_along_axis(np.maximum.accumulate(sorted2, axis=1), np.maximum(start - 1, 0), axis=1)
+        optimal = (sorted2 == best_in_group) & ((start == 0) | (best_in_group > best_before))
+
+        mask = np.empty(optimal.shape, dtype=bool)
+        np.put_along_axis(mask, order, optimal, axis=1)
+        return mask.reshape(self.payoff_stack.shape[:3])
+
+    def maximin(self) -> tuple[list[np.ndarray], np.ndarray]:
+        """
+        :return: for each player a (games, actions) mask of their maximin actions, and a (games, 2) array of each
+        player's maximin value
+        """
+        worst = [self.payoff_stack[..., 0].min(axis=2), self.payoff_stack[..., 1].min(axis=1)]
+        values = np.stack([player_worst.max(axis=1) for player_worst in worst], axis=1)
+        return [player_worst == values[:, player, np.newaxis] for player, player_worst in enumerate(worst)], values
+
+    def minimax_regret(self) -> list[np.ndarray]:
+        """
+        :return: for each player a (games, actions) mask of the actions with the smallest worst case regret
+        """
+        masks = []
+        for player in range(2):
+            payoffs = self.payoff_stack[..., player]
+            # Regret is what the player misses compared with their best response to the opponent's action
+            regret = np.subtract(payoffs.max(axis=1 + player, keepdims=True), payoffs)
+            worst_regret = regret.max(axis=2 - player)
+            masks.append(worst_regret == worst_regret.min(axis=1, keepdims=True))
+        return masks
+
+    def is_zero_sum(self) -> np.ndarray:
+        """
+        :return: whether each game's payoffs add up to the same constant in every cell
+        """
+        totals = self.payoff_stack.sum(axis=-1).reshape(len(self), -1)
+        return np.ptp(totals, axis=1) <= EQUILIBRIUM_TOLERANCE
+
+    def eliminate_dominated_strategies(self, strongly: bool = True) -> list[list[tuple[list[int], list[int]]]]:
+        """
+        Iterated elimination of dominated pure strategies in every game, one round of all the games at a time
+        :return: the elimination trace of each game
+        """
+        num_games, num_rows, num_cols = self.payoff_stack.shape[:3]
+        player1_payoffs = self.payoff_stack[..., 0]
+        player2_payoffs = self.payoff_stack[..., 1].transpose(0, 2, 1)
+        alive_rows = np.ones((num_games, num_rows), dtype=bool)
+        alive_cols = np.ones((num_games, num_cols), dtype=bool)
+        traces = [[] for _ in range(num_games)]
+        # Games drop out of the loop once a round eliminates nothing in them
+        active = np.arange(num_games)
+        while len(active):
+            eliminated_rows = _stacked_dominated(player1_payoffs[active], alive_rows[active], alive_cols[active],
+                                                 strongly)
+            eliminated_cols = _stacked_dominated(player2_payoffs[active], alive_cols[active], alive_rows[active],
+                                                 strongly)
+            changed = eliminated_rows.any(axis=1) | eliminated_cols.any(axis=1)
+            for index in np.flatnonzero(changed).tolist():
+                traces[active[index]].append((np.flatnonzero(eliminated_rows[index]).tolist(),
+                                              np.flatnonzero(eliminated_cols[index]).tolist()))
+            alive_rows[active] &= ~eliminated_rows
+            alive_cols[active] &= ~eliminated_cols
+            active = active[changed]
+        return traces
+
+    def records(self) -> list[dict]:
+        """
+        The BatchAnalysis.game_record of every game
+        """
+        row_labels, col_labels = default_action_labels(self.action_counts)
+        strongly_dominated = self.eliminate_dominated_strategies(True)
+        weakly_dominated = self.eliminate_dominated_strategies(False)
+        nash = self.pure_nash_mask()
+        pareto = self.pareto_optimal_mask()
+        row_minimax, col_minimax = self.minimax_regret()
+        (row_maximin, col_maximin), values = self.maximin()
+        values = values.tolist()
+        zero_sum = self.is_zero_sum().tolist()
+
+        def labels(names, mask) -> list[str]:
+            return [names[action] for action in np.flatnonzero(mask).tolist()]
+
+        records = []
+        for game in range(len(self)):
+            records.append({
+                "rows": len(row_labels),
+                "cols": len(col_labels),
+                "strongly_dominated": strongly_dominated[game],
+                "weakly_dominated": weakly_dominated[game],
+                "pure_equilibria": [row_labels[row] + col_labels[col] for row, col in np.argwhere(nash[game]).tolist()],
+                "pareto_optimal": [(row_labels[row], col_labels[col])
+                                   for row, col in np.argwhere(pareto[game]).tolist()],
+                "minimax": {"row": labels(row_labels, row_minimax[game]), "col": labels(col_labels, col_minimax[game])},
+                "maximin": {"row": labels(row_labels, row_maximin[game]), "row_value": values[game][0],
+                            "col": labels(col_labels, col_maximin[game]), "col_value": values[game][1]},
+                "zero_sum": zero_sum[game],
+            })
+        return records
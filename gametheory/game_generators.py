@@ -0,0 +1,65 @@
+import numpy as np
+
+# Payoffs are drawn from [-PAYOFF_RANGE, PAYOFF_RANGE]
+PAYOFF_RANGE = 100
+
+
+def random_game(num_actions_player1: int, num_actions_player2: int, seed=None) -> np.ndarray:
+    """
+    A game with independent uniformly random payoffs for both players
+    :return: a (rows, cols, 2) payoff array
+    """
+    rng = np.random.default_rng(seed)
+    return rng.integers(-PAYOFF_RANGE, PAYOFF_RANGE + 1, (num_actions_player1, num_actions_player2, 2))
+
+
+def zero_sum_game(num_actions_player1: int, num_actions_player2: int, seed=None) -> np.ndarray:
+    """
+    A game where Player 2 always loses what Player 1 wins
+    """
+    rng = np.random.default_rng(seed)
+    player1_payoffs = rng.integers(-PAYOFF_RANGE, PAYOFF_RANGE + 1, (num_actions_player1, num_actions_player2))
+    return np.stack((player1_payoffs, -player1_payoffs), axis=-1)
+
+
+def coordination_game(num_actions_player1: int, num_actions_player2: int, seed=None) -> np.ndarray:
+    """
+    A game where both players get the same payoff, which is higher when they pick matching actions. Every matching pair
+    of actions is a pure Nash equilibrium
+    """
+    rng = np.random.default_rng(seed)
+    payoffs = rng.integers(0, PAYOFF_RANGE // 2, (num_actions_player1, num_actions_player2))
+    matching = np.arange(min(num_actions_player1, num_actions_player2))
+    payoffs[matching, matching] = rng.integers(PAYOFF_RANGE // 2, PAYOFF_RANGE + 1, len(matching))
+    return np.stack((payoffs, payoffs), axis=-1)
+
+
+def dominance_solvable_game(num_actions_player1: int, num_actions_player2: int, seed=None) -> np.ndarray:
+    """
+    A game where each player names a number and wants it to be a quarter below half of the other player's, which keeps
+    best responses unique. The largest numbers are strictly dominated, so iterated strict elimination takes about
+    log2(actions) rounds to leave only both picking 0. The actions are shuffled so the dominated ones are not in order
+    """
+    rng = np.random.default_rng(seed)
+    rows = rng.permutation(num_actions_player1)[:, np.newaxis]
+    cols = rng.permutation(num_actions_player2)[np.newaxis, :]
+    return np.stack((-(4 * rows - 2 * cols + 1) ** 2, -(4 * cols - 2 * rows + 1) ** 2), axis=-1)
+
+
+GAME_GENERATORS = {
+    "random": random_game,
+    "zero-sum": zero_sum_game,
+    "coordination": coordination_game,
+    "dominance-solvable": dominance_solvable_game,
+}
+
+
+def format_payoff(payoff_array) -> str:
+    """
+    Writes a two player game in the text format read by parse_payoff
+    """
+    payoff_array = np.asarray(payoff_array)
+    num_actions_player1, num_actions_player2 = payoff_array.shape[:2]
+    lines = [f"{num_actions_player1} {num_actions_player2}"]
+    lines += [" ".join(map(str, payoff_array[:, :, player].ravel().tolist())) for player in range(2)]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,138 @@
+import contextlib
+import time
+
+# Returned by phase while no profile is active, so instrumented code only pays for a global lookup
+_NO_PHASE = contextlib.nullcontext()
+_active_profile = None
+
+
+class PhaseStats:
+    """
+    What a profile recorded about one phase
+    :var calls is how many times the phase ran
+    :var seconds is the wall time spent in it, including any phases nested inside
+    :var items counts the work done in it, such as rounds simulated or strategies eliminated
+    """
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.items = 0
+
+    @property
+    def rate(self) -> float:
+        """Items handled per second"""
+        return self.items / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {"calls": self.calls, "seconds": self.seconds, "items": self.items, "rate": self.rate}
+
+
+class Profile:
+    """
+    Records the wall time, call count and work done in each instrumented phase while it is active, which it is inside a
+    with block. Only phases run in this process are recorded, not those in worker processes
+    :var phases maps each phase name to its PhaseStats, in the order the phases first ran
+    :var seconds is the wall time spent inside the with block
+    :var peak_memory is the peak memory traced by tracemalloc in bytes, or None when memory was not traced
+    """
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.phases = {}
+        self.seconds = 0.0
+        self.peak_memory = None
+        self._start = None
+        self._started_tracing = False
+        self._previous = None
+        # The peak traced before a nested profile reset it, which still counts towards this profile's peak
+        self._peak_before_reset = 0
+
+    def __enter__(self):
+        global _active_profile
+        self._previous = _active_profile
+        _active_profile = self
+        if self.trace_memory:
+            # Only imported once memory is traced, so instrumented modules load without it
+            import tracemalloc
+            self._started_tracing = not tracemalloc.is_tracing()
+            self._peak_before_reset = 0
+            if self._started_tracing:
+                tracemalloc.start()
+            else:
+                # Resetting the peak would erase the peaks of the enclosing profiles, so they are handed it first
+                peak = tracemalloc.get_traced_memory()[1]
+                profile = self._previous
+                while profile is not None:
+                    if profile.trace_memory:
+                        profile._peak_before_reset = max(profile._peak_before_reset, peak)
+                    profile = profile._previous
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active_profile
+        self.seconds += time.perf_counter() - self._start
+        if self.trace_memory:
+            import tracemalloc
+            self.peak_memory = max(self.peak_memory or 0, self._peak_before_reset, tracemalloc.get_traced_memory()[1])
+            if self._started_tracing:
+                tracemalloc.stop()
+        _active_profile = self._previous
+        return False
+
+    def record(self, name: str, seconds: float, items: int = 0):
+        self.count(name, items)
+        stats = self.phases[name]
+        stats.calls += 1
+        stats.seconds += seconds
+
+    def count(self, name: str, items: int):
+        """Adds work done in a phase once it is known, without counting another call"""
+        stats = self.phases.get(name)
+        if stats is None:
+            stats = self.phases[name] = PhaseStats()
+        stats.items += items
+
+    @contextlib.contextmanager
+    def phase(self, name: str, items: int = 0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, items)
+
+    def as_dict(self) -> dict:
+        return {"seconds": self.seconds, "peak_memory": self.peak_memory,
+                "phases": {name: stats.as_dict() for name, stats in self.phases.items()}}
+
+    def report(self) -> str:
+        lines = [f"{'Phase':<24}{'Calls':>8}{'Seconds':>12}{'Mean ms':>12}{'Items/s':>14}"]
+        for name, stats in self.phases.items():
+            rate = f"{stats.rate:14.0f}" if stats.items else f"{'':14}"
+            lines.append(f"{name:<24}{stats.calls:8d}{stats.seconds:12.6f}{1000 * stats.seconds / max(stats.calls, 1):12.3f}{rate}")
+        lines.append(f"Total wall time: {self.seconds:.6f}s")
+        if self.peak_memory is not None:
+            lines.append(f"Peak traced memory: {self.peak_memory / 2 ** 20:.2f} MiB")
+        return "\n".join(lines)
+
+
+def active_profile():
+    return _active_profile
+
+
+def phase(name: str, items: int = 0):
+    """
+    Times a block of code as the named phase of the active profile, and does nothing when no profile is active
+    :param items: the amount of work the block does, such as rounds simulated, used for the phase's rate
+    """
+    if _active_profile is None:
+        return _NO_PHASE
+    return _active_profile.phase(name, items)
+
+
+def count(name: str, items: int):
+    """
+    Adds work done in the named phase of the active profile, and does nothing when no profile is active
+    """
+    if _active_profile is not None:
+        _active_profile.count(name, items)
@@ -0,0 +1,1029 @@
+import operator
+import struct
+import time
+
+import numpy as np
+
+from .equilibria import DEFAULT_MAX_PIVOTS, EQUILIBRIUM_TOLERANCE, SUPPORT_ENUMERATION_LIMIT, ZERO_SUM_TOLERANCE, \
+    EquilibriumList, count_support_pairs, lemke_howson_all_labels, solve_zero_sum, support_enumeration
+from .instrumentation import count, phase
+
+# Smallest margin by which a mixture has to beat a strategy to strictly dominate it
+MIXED_DOMINANCE_TOLERANCE = 1e-9
+# Rough number of constraint matrix entries in each batch of mixed dominance linear programs
+MIXED_DOMINANCE_BATCH_SIZE = 100_000
+# Number of random opponent mixtures used to rule out dominance before solving any linear programs
+MIXED_DOMINANCE_SAMPLES = 1024
+# Rough number of strategy pairs compared at once when looking for dominated strategies
+DOMINANCE_BLOCK_SIZE = 1 << 22
+# Opponent actions swept between checks of each candidate's likeliest dominator
+DOMINANCE_CHUNK_SIZE = 16
+# Rough number of payoff comparisons in each block of the N player Pareto sweep
+PARETO_BLOCK_SIZE = 1 << 22
+# Bytes read at a time when streaming a text game file
+PARSE_CHUNK_SIZE = 1 << 20
+# Binary game files start with this header: magic, version, payoff type code, padding, rows and cols
+BINARY_HEADER = struct.Struct('<4sBBxxQQ')
+BINARY_MAGIC = b'NFG1'
+BINARY_VERSION = 1
+BINARY_DTYPES = {0: np.dtype('<i4'), 1: np.dtype('<f8')}
+
+
+def get_action_name(action_index: int, is_row: bool, total_actions: int = 0) -> chr:
+    if is_row:
+        name = chr(ord('A') + action_index)
+    else:
+        name = chr(ord('Z') - total_actions + action_index + 1)
+    # Single letters run out after 26 actions, larger games are named by NormalFormGame.action_labels instead
+    if not 'A' <= name <= 'Z':
+        raise ValueError(f"Action {action_index} has no single letter name, use NormalFormGame.action_labels")
+    return name
+
+
+def get_action_index(action: chr, total_row_actions: int) -> (bool, int):
+    is_row = ord(action) - ord('A') < total_row_actions
+    if is_row:
+        return True, ord(action) - ord('A')
+    return False, ord('Z') - ord(action)
+
+
+def is_col_dominated(payoff_matrix, eliminated, action: int, strongly: bool = True) -> bool:
+    comparator = operator.le if strongly else operator.lt
+    eliminated = set(eliminated)
+    for j in range(len(payoff_matrix[0])):
+        if j == action or get_action_name(j, False, len(payoff_matrix[0])) in eliminated:
+            continue
+
+        # Check if strategy at action is strongly dominated by strategy j
+        is_dominated = True
+        identical = True
+
+        for k in range(len(payoff_matrix)):  # For each opponent's strategy
+            if get_action_name(k, True, len(payoff_matrix)) in eliminated:
+                continue
+            p2_payoff_current = payoff_matrix[k][action][1]
+            p2_payoff_other = payoff_matrix[k][j][1]
+
+            if comparator(p2_payoff_other, p2_payoff_current):
+                is_dominated = False
+                break  # No need to check further
+            identical = identical and p2_payoff_other == p2_payoff_current
+
+        # Identical strategies weakly dominate each other, so only the first of them counts as a dominator
+        if is_dominated and (strongly or not identical or j < action):
+            return True  # The strategy is strongly dominated
+
+    return False  # The strategy is not strongly dominated
+
+
+def is_row_dominated(payoff_matrix, eliminated: list[chr], action: int, strongly: bool = True) -> bool:
+    comparator = operator.lt if strongly else operator.le
+    eliminated = set(eliminated)
+    for i in range(len(payoff_matrix)):
+        if i == action or get_action_name(i, True, len(payoff_matrix)) in eliminated:
+            continue
+
+        # Check if strategy at action is strongly dominated by strategy j
+        is_dominated = True
+        identical = True
+
+        for k in range(len(payoff_matrix[0])):  # For each opponent's strategy
+            if get_action_name(k, False, len(payoff_matrix[0])) in eliminated:
+                continue
+            p1_payoff_current = payoff_matrix[action][k][0]
+            p1_payoff_other = payoff_matrix[i][k][0]
+
+            if not comparator(p1_payoff_current, p1_payoff_other):
+                is_dominated = False
+                break  # No need to check further
+            identical = identical and p1_payoff_other == p1_payoff_current
+
+        # Identical strategies weakly dominate each other, so only the first of them counts as a dominator
+        if is_dominated and (strongly or not identical or i < action):
+            return True  # The strategy is strongly dominated
+
+    return False  # The strategy is not strongly dominated
+
+
+def is_strongly_dominated(payoff_matrix, action: int, is_row: bool, mixed: bool = False) -> bool:
+    if is_row:
+        dominated = is_row_dominated(payoff_matrix, [], action)
+    else:
+        dominated = is_col_dominated(payoff_matrix, [], action)
+    if dominated or not mixed:
+        return dominated
+
+    # Only fall back to the linear program when no pure strategy dominates the action
+    payoff_array = to_payoff_array(payoff_matrix)
+    payoffs = payoff_array[:, :, 0] if is_row else payoff_array[:, :, 1].T
+    alive = np.ones(payoffs.shape[0], dtype=bool)
+    alive_opponent = np.ones(payoffs.shape[1], dtype=bool)
+    return len(_find_mixed_dominated(payoffs, alive, alive_opponent, np.array([action]), {})) > 0
+
+
+def is_weakly_dominated(payoff_matrix, eliminated, action: int, is_row: bool) -> bool:
+    if is_row:
+        return is_row_dominated(payoff_matrix, eliminated,  action, False)
+    else:
+        return is_col_dominated(payoff_matrix, eliminated, action, False)
+
+
+def _find_dominated(payoffs, alive, alive_opponent, strongly: bool):
+    """
+    Finds the alive strategies dominated by another alive strategy, against the alive opponent actions only
+    :param payoffs: the player's payoffs with their own actions on the first axis and the opponent's on the second
+    :return: the indices of the dominated strategies
+    """
+    own = np.flatnonzero(alive)
+    opponent = np.flatnonzero(alive_opponent)
+    dominated = []
+    if not strongly and len(own) > 1:
+        # Identical strategies weakly dominate each other, and removing all of them could leave a player with no
+        # strategies. Only the first of each group survives, and it stands in for the others as a dominator
+        _, first, inverse = np.unique(payoffs[np.ix_(own, opponent)], axis=0, return_index=True, return_inverse=True)
+        copies = first[inverse.ravel()] != np.arange(len(own))
+        dominated.append(own[copies])
+        own = own[~copies]
+    comparator = operator.gt if strongly else operator.ge
+    # Strategies that do better on the whole are the likeliest dominators, so they are verified first
+    totals = payoffs[np.ix_(own, opponent)].sum(axis=1)
+    block_size = max(1, DOMINANCE_BLOCK_SIZE // max(len(own), 1))
+    for block_start in range(0, len(own), block_size):
+        # possible[c, r] holds while strategy cols[r] could still dominate candidate rows[c]. Most pairs fail within
+        # a few opponent actions, so the pairs left shrink quickly and a candidate is dropped as soon as none are left
+        rows = own[block_start:block_start + block_size]
+        cols = np.arange(len(own))
+        possible = own[cols][np.newaxis, :] != rows[:, np.newaxis]
+        for chunk_start in range(0, len(opponent), DOMINANCE_CHUNK_SIZE):
+            for k in opponent[chunk_start:chunk_start + DOMINANCE_CHUNK_SIZE]:
+                column = payoffs[:, k]
+                possible &= comparator(column[own[cols]][np.newaxis, :], column[rows][:, np.newaxis])
+            keep_rows = possible.any(axis=1)
+            keep_cols = possible.any(axis=0)
+            rows, cols, possible = rows[keep_rows], cols[keep_cols], possible[np.ix_(keep_rows, keep_cols)]
+            rest = opponent[chunk_start + DOMINANCE_CHUNK_SIZE:]
+            if not len(rows) or not len(rest):
+                break
+            # When a strategy is dominated many others usually are too, so their pairs never fail. Checking the best
+            # remaining dominator of each candidate on the rest of the opponent actions settles it or rules that
+            # dominator out, which keeps the sweep from carrying those pairs through every column
+            best = np.where(possible, totals[cols][np.newaxis, :], -np.inf).argmax(axis=1)
+            holds = comparator(payoffs[np.ix_(own[cols[best]], rest)], payoffs[np.ix_(rows, rest)]).all(axis=1)
+            dominated.append(rows[holds])
+            possible[np.flatnonzero(~holds), best[~holds]] = False
+            keep_rows = ~holds & possible.any(axis=1)
+            rows, possible = rows[keep_rows], possible[keep_rows]
+        dominated.append(rows[possible.any(axis=1)])
+    return np.sort(np.concatenate(dominated)).astype(int) if dominated else np.array([], dtype=int)
+
+
+def _find_mixed_dominated(payoffs, alive, alive_opponent, candidates, mixtures: dict):
+    """
+    Finds the candidates that are strictly dominated by a mixture of the other alive strategies
+    :param payoffs: the player's payoffs with their own actions on the first axis
+    :param mixtures: the best dominating mixture found so far for each strategy, updated in place
+    """
+    own = np.flatnonzero(alive)
+    opponent = np.flatnonzero(alive_opponent)
+    if len(own) < 2 or not len(candidates):
+        return np.array([], dtype=int)
+    if not len(opponent):
+        return candidates
+    payoffs = payoffs[np.ix_(own, opponent)].astype(float)
+    num_own, num_opponent = payoffs.shape
+    local = np.searchsorted(own, candidates)
+    dominated = np.zeros(len(candidates), dtype=bool)
+
+    # A best response to any opponent mixture cannot be strictly dominated, so checking the opponent's pure
+    # actions and a fixed sample of their mixtures rules most strategies out without a linear program
+    sample = np.random.default_rng(0).dirichlet(np.full(num_opponent, 0.1), MIXED_DOMINANCE_SAMPLES)
+    values = np.hstack((payoffs, payoffs @ sample.T))
+    undecided = ~(values[local] >= values.max(axis=0) - MIXED_DOMINANCE_TOLERANCE).any(axis=1)
+    # Also try mixtures tilted towards the opponent actions where each remaining candidate is closest to the best
+    shortfall = payoffs - payoffs.max(axis=0)
+    scale = max(np.ptp(payoffs).item(), 1)
+    for sharpness in (1, 3, 10, 30, 100):
+        remaining = np.flatnonzero(undecided)
+        if not len(remaining):
+            break
+        tilted = np.exp(sharpness / scale * shortfall[local[remaining]])
+        values = payoffs @ (tilted / tilted.sum(axis=1, keepdims=True)).T
+        best_response = values[local[remaining], np.arange(len(remaining))] >= values.max(axis=0) - MIXED_DOMINANCE_TOLERANCE
+        undecided[remaining[best_response]] = False
+
+    # Warm start from the previous rounds: a mixture that was not enough before may dominate now that the
+    # opponent has fewer actions, and checking it is far cheaper than solving the linear program again
+    warm = np.array([i for i, candidate in enumerate(candidates) if undecided[i] and candidate in mixtures], dtype=int)
+    if len(warm):
+        warm_mixtures = np.array([mixtures[candidate][own] for candidate in candidates[warm]])
+        usable = np.isclose(warm_mixtures.sum(axis=1), 1)
+        margins = (warm_mixtures @ payoffs - payoffs[local[warm]]).min(axis=1)
+        dominated[warm[usable & (margins > MIXED_DOMINANCE_TOLERANCE)]] = True
+        undecided[dominated] = False
+
+    # A uniform mixture over the strategies that do at least as well on average is often enough to dominate
+    remaining = np.flatnonzero(undecided)
+    if len(remaining):
+        average = payoffs.mean(axis=1)
+        better = average[np.newaxis, :] >= average[local[remaining], np.newaxis]
+        better[np.arange(len(remaining)), local[remaining]] = False
+        counts = better.sum(axis=1)
+        margins = ((better @ payoffs) / np.maximum(counts, 1)[:, np.newaxis] - payoffs[local[remaining]]).min(axis=1)
+        dominated[remaining[(counts > 0) & (margins > MIXED_DOMINANCE_TOLERANCE)]] = True
+        undecided[dominated] = False
+
+    # Each candidate's program maximizes the margin e subject to mixture @ payoffs - candidate payoffs >= e,
+    # and the programs are stacked block diagonally so one solver call handles a whole batch
+    from scipy import sparse
+    from scipy.optimize import linprog
+
+    pending = np.flatnonzero(undecided)
+    block_ub = sparse.hstack([sparse.csr_matrix(-payoffs.T), np.ones((num_opponent, 1))])
+    block_eq = sparse.csr_matrix(np.append(np.ones(num_own), 0))
+    objective = np.append(np.zeros(num_own), -1)
+    batch_size = max(1, MIXED_DOMINANCE_BATCH_SIZE // ((num_own + 1) * num_opponent))
+    for start in range(0, len(pending), batch_size):
+        batch = pending[start:start + batch_size]
+        identity = sparse.identity(len(batch), format='csr')
+        bounds = np.tile(np.append(np.tile([0, 1], (num_own, 1)), [[-np.inf, np.inf]], axis=0), (len(batch), 1))
+        # A strategy cannot take part in the mixture that dominates it
+        bounds[np.arange(len(batch)) * (num_own + 1) + local[batch], 1] = 0
+        result = linprog(np.tile(objective, len(batch)),
+                         A_ub=sparse.kron(identity, block_ub, format='csr'), b_ub=-payoffs[local[batch]].ravel(),
+                         A_eq=sparse.kron(identity, block_eq, format='csr'), b_eq=np.ones(len(batch)),
+                         bounds=bounds, method='highs')
+        if result.status != 0:
+            raise RuntimeError(f"Mixed dominance linear program failed: {result.message}")
+        solution = result.x.reshape(len(batch), num_own + 1)
+        dominated[batch] = solution[:, -1] > MIXED_DOMINANCE_TOLERANCE
+        for candidate, mixture in zip(candidates[batch], solution[:, :-1]):
+            mixtures[candidate] = np.zeros(len(alive))
+            mixtures[candidate][own] = mixture
+
+    return candidates[dominated]
+
+
+def _opponent_profiles(alive, player: int) -> np.ndarray:
+    """
+    Marks the opponent action profiles where every opponent action is still alive, flattened in the order the other
+    players' axes are left in by np.moveaxis(payoffs, player, 0)
+    """
+    mask = np.ones((), dtype=bool)
+    for opponent, opponent_alive in enumerate(alive):
+        if opponent != player:
+            mask = np.logical_and.outer(mask, opponent_alive)
+    return mask.ravel()
+
+
+def _iterated_elimination_n_players(payoff_array, strongly: bool, mixed: bool) -> list[tuple[list[int], ...]]:
+    num_players = payoff_array.shape[-1]
+    payoffs = [np.moveaxis(payoff_array[..., player], player, 0).reshape(payoff_array.shape[player], -1)
+               for player in range(num_players)]
+    alive = [np.ones(num_actions, dtype=bool) for num_actions in payoff_array.shape[:-1]]
+    mixtures = [{} for _ in range(num_players)]
+
+    trace = []
+    while True:
+        with phase("dominance round"):
+            # Every player is checked against the same surviving profiles, so a round removes strategies simultaneously
+            eliminated = []
+            for player in range(num_players):
+                alive_opponents = _opponent_profiles(alive, player)
+                dominated = _find_dominated(payoffs[player], alive[player], alive_opponents, strongly)
+                if mixed:
+                    survivors = np.setdiff1d(np.flatnonzero(alive[player]), dominated)
+                    dominated = np.union1d(dominated, _find_mixed_dominated(
+                        payoffs[player], alive[player], alive_opponents, survivors, mixtures[player]))
+                eliminated.append(dominated)
+            if not any(len(dominated) for dominated in eliminated):
+                break
+            count("dominance round", sum(map(len, eliminated)))
+            trace.append(tuple(dominated.tolist() for dominated in eliminated))
+            for player_alive, dominated in zip(alive, eliminated):
+                player_alive[dominated] = False
+
+    return trace
+
+
+def iterated_elimination(payoff_array, strongly: bool = True, mixed: bool = False) -> list[tuple[list[int], ...]]:
+    """
+    Repeatedly eliminates dominated strategies, using the same dominance tests as is_row_dominated and is_col_dominated
+    :param payoff_array: a (rows, cols, 2) payoff array, or an N player (actions of player 1, ..., actions of player N,
+    N) payoff array
+    :param strongly: whether to test for strong or weak domination
+    :param mixed: whether to also eliminate strategies strictly dominated by a mixture of the other strategies. Only
+    supported with strong domination
+    :return: the elimination trace, one entry per round holding the action indices each player lost
+    """
+    if mixed and not strongly:
+        raise ValueError("Mixed dominance is only supported for strong domination")
+    payoff_array = to_payoff_array(payoff_array)
+    if payoff_array.shape[-1] != 2:
+        return _iterated_elimination_n_players(payoff_array, strongly, mixed)
+    player1_payoffs = payoff_array[:, :, 0]
+    player2_payoffs = payoff_array[:, :, 1]
+    num_actions_player1, num_actions_player2 = player1_payoffs.shape
+    alive_rows = np.ones(num_actions_player1, dtype=bool)
+    alive_cols = np.ones(num_actions_player2, dtype=bool)
+
+    # Removing strategies of its own never makes a survivor dominated, so a player only needs rechecking after the
+    # opponent loses an action
+    check_rows = check_cols = True
+    row_mixtures = {}
+    col_mixtures = {}
+
+    trace = []
+    while check_rows or check_cols:
+        with phase("dominance round"):
+            eliminated_rows = eliminated_cols = np.array([], dtype=int)
+            if check_rows:
+                eliminated_rows = _find_dominated(player1_payoffs, alive_rows, alive_cols, strongly)
+            if check_cols:
+                eliminated_cols = _find_dominated(player2_payoffs.T, alive_cols, alive_rows, strongly)
+            # The pure strategy checks act as a cheap filter so the linear programs only run on their survivors
+            if check_rows and mixed:
+                survivors = np.setdiff1d(np.flatnonzero(alive_rows), eliminated_rows)
+                eliminated_rows = np.union1d(eliminated_rows, _find_mixed_dominated(
+                    player1_payoffs, alive_rows, alive_cols, survivors, row_mixtures))
+            if check_cols and mixed:
+                survivors = np.setdiff1d(np.flatnonzero(alive_cols), eliminated_cols)
+                eliminated_cols = np.union1d(eliminated_cols, _find_mixed_dominated(
+                    player2_payoffs.T, alive_cols, alive_rows, survivors, col_mixtures))
+            if not len(eliminated_rows) and not len(eliminated_cols):
+                break
+            count("dominance round", len(eliminated_rows) + len(eliminated_cols))
+            trace.append((eliminated_rows.tolist(), eliminated_cols.tolist()))
+            alive_rows[eliminated_rows] = False
+            alive_cols[eliminated_cols] = False
+            check_rows = len(eliminated_cols) > 0
+            check_cols = len(eliminated_rows) > 0
+
+    return trace
+
+
+def _dominated_by(points, candidates) -> np.ndarray:
+    # Whether each candidate payoff vector is Pareto dominated by one of the points
+    no_worse = (points[np.newaxis, :, :] >= candidates[:, np.newaxis, :]).all(axis=2)
+    better = (points[np.newaxis, :, :] > candidates[:, np.newaxis, :]).any(axis=2)
+    return (no_worse & better).any(axis=1)
+
+
+def _pareto_optimal_mask_n_players(payoff_array) -> np.ndarray:
+    cells = payoff_array.reshape(-1, payoff_array.shape[-1])
+    # Cells with identical payoffs stand or fall together, so only the distinct payoff vectors are compared
+    distinct, inverse = np.unique(cells, axis=0, return_inverse=True)
+    # A dominating vector has a larger payoff total, so sweeping from the largest total down means each block only has
+    # to be compared with the optimal vectors already found and with itself
+    order = np.argsort(-distinct.sum(axis=1), kind='stable')
+    optimal = np.zeros(len(distinct), dtype=bool)
+    frontier = distinct[:0]
+    block_size = max(1, PARETO_BLOCK_SIZE // (len(distinct) * distinct.shape[1]))
+    for start in range(0, len(order), block_size):
+        block = order[start:start + block_size]
+        block = block[~_dominated_by(frontier, distinct[block])]
+        block = block[~_dominated_by(distinct[block], distinct[block])]
+        optimal[block] = True
+        frontier = np.concatenate((frontier, distinct[block]))
+    return optimal[inverse.ravel()].reshape(payoff_array.shape[:-1])
+
+
+def pareto_optimal_mask(payoff_array) -> np.ndarray:
+    """
+    Marks the cells where no other cell improves one player's payoff without hurting another's. Cells with identical
+    payoffs do not dominate each other, so they are either all Pareto optimal or none are
+    :return: a boolean array with one axis per player
+    """
+    payoff_array = to_payoff_array(payoff_array)
+    if payoff_array.shape[-1] != 2:
+        return _pareto_optimal_mask_n_players(payoff_array)
+    player1_payoffs = payoff_array[:, :, 0].ravel()
+    player2_payoffs = payoff_array[:, :, 1].ravel()
+
+    # Sweep the cells from the best Player 1 payoff down, grouping cells with the same Player 1 payoff
+    order = np.argsort(player1_payoffs, kind='stable')[::-1]
+    sorted1 = player1_payoffs[order]
+    sorted2 = player2_payoffs[order]
+    group_start = np.ones(len(order), dtype=bool)
+    group_start[1:] = sorted1[1:] != sorted1[:-1]
+    starts = np.flatnonzero(group_start)
+    group = np.cumsum(group_start) - 1
+
+    # A cell survives when it has the best Player 2 payoff among cells with the same Player 1 payoff, and beats the
+    # Player 2 payoff of every cell with a better Player 1 payoff
+    best_in_group = np.maximum.reduceat(sorted2, starts)
+    best_before = np.maximum.accumulate(best_in_group)
+    beats_better = np.ones(len(starts), dtype=bool)
+    beats_better[1:] = best_in_group[1:] > best_before[:-1]
+    optimal = (sorted2 == best_in_group[group]) & beats_better[group]
+
+    mask = np.empty(len(order), dtype=bool)
+    mask[order] = optimal
+    return mask.reshape(payoff_array.shape[:2])
+
+
+def best_response_mask(payoff_array, player: int) -> np.ndarray:
+    """
+    Marks the cells where the player's action is a best response to the other players' actions in the cell
+    """
+    payoffs = payoff_array[..., player]
+    return payoffs == payoffs.max(axis=player, keepdims=True)
+
+
+def default_action_labels(action_counts) -> list[list[str]]:
+    """
+    Names every player's actions. Two player games with at most 26 actions keep the single letter names of
+    get_action_name, larger two player games number the rows R0, R1, ... and the columns C0, C1, ..., and the actions of
+    player p in an N player game are numbered P{p}.0, P{p}.1, ...
+    """
+    action_counts = list(action_counts)
+    if len(action_counts) == 2 and sum(action_counts) <= 26:
+        num_actions_player1, num_actions_player2 = action_counts
+        return [[get_action_name(i, True) for i in range(num_actions_player1)],
+                [get_action_name(j, False, num_actions_player2) for j in range(num_actions_player2)]]
+    prefixes = ["R", "C"] if len(action_counts) == 2 else [f"P{player + 1}." for player in range(len(action_counts))]
+    return [[f"{prefix}{i}" for i in range(num_actions)] for prefix, num_actions in zip(prefixes, action_counts)]
+
+
+def _nested_cells(values: list, depth: int):
+    return tuple(values) if depth == 0 else [_nested_cells(value, depth - 1) for value in values]
+
+
+class NormalFormGame:
+    """
+    A class to represent a Normal Form game in the context of game theory
+    :var payoffs is a double list of tuples representing the rewards. Player 1's action is the first index and Player 2's action is the second index In the tuple, the first entry is the first player's reward and the second entry is the second player's reward
+    :var payoff_array is the same rewards as a contiguous ndarray with one axis per player followed by an axis of each player's payoff, so (rows, cols, 2) for two players. All analyses run on this array; payoffs is a view of it kept for compatibility
+    :var action_labels names each player's actions. Actions are identified by their integer index everywhere else, the labels are only used for output
+    Derived quantities such as best responses, regrets and dominance traces are computed once and cached until the payoffs are replaced. Call invalidate_cache after changing payoff_array in place
+    """
+    def __init__(self, input_matrix, action_labels: list[list[str]] = None):
+        self._action_labels = None
+        if isinstance(input_matrix, str):
+            self.payoff_array = read_payoff_file(input_matrix)
+        else:
+            self.payoff_array = to_payoff_array(input_matrix)
+        if action_labels is not None:
+            self.action_labels = action_labels
+
+    @property
+    def payoffs(self) -> list[list[tuple[int, int]]]:
+        if self._payoff_list is None:
+            self._payoff_list = _nested_cells(self.payoff_array.tolist(), self.num_players)
+        return self._payoff_list
+
+    @payoffs.setter
+    def payoffs(self, input_matrix):
+        self.payoff_array = to_payoff_array(input_matrix)
+
+    @property
+    def payoff_array(self) -> np.ndarray:
+        return self._payoff_array
+
+    @payoff_array.setter
+    def payoff_array(self, payoff_array):
+        self._payoff_array = to_payoff_array(payoff_array)
+        # Custom labels only survive a change of payoffs that keeps the number of actions
+        if self._action_labels is not None and list(map(len, self._action_labels)) != list(self.action_counts):
+            self._action_labels = None
+        self.invalidate_cache()
+
+    @property
+    def num_players(self) -> int:
+        return self.payoff_array.shape[-1]
+
+    @property
+    def action_counts(self) -> tuple[int, ...]:
+        return self.payoff_array.shape[:-1]
+
+    @property
+    def action_labels(self) -> list[list[str]]:
+        if self._action_labels is not None:
+            return self._action_labels
+        return self._cached('action_labels', lambda: default_action_labels(self.action_counts))
+
+    @action_labels.setter
+    def action_labels(self, action_labels: list[list[str]]):
+        action_labels = [list(map(str, labels)) for labels in action_labels]
+        if list(map(len, action_labels)) != list(self.action_counts):
+            raise ValueError(f"Expected labels for {self.action_counts} actions, got {list(map(len, action_labels))}")
+        if any(len(set(labels)) != len(labels) for labels in action_labels):
+            raise ValueError("Each player's action labels must be unique")
+        self._action_labels = action_labels
+        self.invalidate_cache()
+
+    def action_index(self, player: int, label: str) -> int:
+        indices = self._cached(('action_index', player),
+                               lambda: {name: i for i, name in enumerate(self.action_labels[player])})
+        return indices[label]
+
+    def profile_name(self, profile) -> str:
+        return "".join(labels[action] for labels, action in zip(self.action_labels, profile))
+
+    def __player_name(self, player: int) -> str:
+        if self.num_players == 2:
+            return ("Row Player", "Column Player")[player]
+        return f"Player {player + 1}"
+
+    def invalidate_cache(self):
+        self._payoff_list = None
+        self._cache = {}
+
+    def canonical_form(self) -> tuple[str, tuple[int, ...], list[np.ndarray]]:
+        """
+        The key shared by every reordering of this game's players and actions, with the order that maps this game onto
+        the canonical one. See ResultCache.canonical_form
+        """
+        # Only caching needs the canonical form, so its module is not imported with this one
+        from .result_cache import canonical_form
+        return self._cached('canonical_form', lambda: canonical_form(self.payoff_array))
+
+    def cached_results(self, keys) -> dict:
+        """
+        The results under the given cache keys that have already been computed, for saving with a ResultCache
+        """
+        return {key: self._cache[key] for key in keys if key in self._cache}
+
+    def restore_results(self, results: dict):
+        """
+        Fills the cache with results computed earlier, such as the ones loaded by a ResultCache. Results that were
+        already computed are kept
+        """
+        for key, value in results.items():
+            self._cached(key, lambda: value)
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            value = compute()
+            if isinstance(value, np.ndarray):
+                # Cached arrays are shared between callers, so nobody may change them
+                value.setflags(write=False)
+            self._cache[key] = value
+        return self._cache[key]
+
+    def best_payoffs(self, player: int) -> np.ndarray:
+        """The player's best payoff against each profile of the other players' actions, with the player's axis kept"""
+        return self._cached(('best_payoffs', player),
+                            lambda: self.payoff_array[..., player].max(axis=player, keepdims=True))
+
+    def worst_payoffs(self, player: int) -> np.ndarray:
+        """The player's worst payoff for each of their actions"""
+        other_axes = tuple(axis for axis in range(self.num_players) if axis != player)
+        return self._cached(('worst_payoffs', player), lambda: self.payoff_array[..., player].min(axis=other_axes))
+
+    def best_responses(self, player: int) -> np.ndarray:
+        """Whether each cell's action of the player is a best response to the other players' actions in the cell"""
+        return self._cached(('best_responses', player), lambda: best_response_mask(self.payoff_array, player))
+
+    def regret(self, player: int) -> np.ndarray:
+        """How much better the player could have done in each cell against the same actions of the other players"""
+        return self._cached(('regret', player), lambda: self.best_payoffs(player) - self.payoff_array[..., player])
+
+    @property
+    def column_maxima(self) -> np.ndarray:
+        """Player 1's best payoff against each of Player 2's actions"""
+        return self._cached('column_maxima', lambda: self.best_payoffs(0)[0])
+
+    @property
+    def row_maxima(self) -> np.ndarray:
+        """Player 2's best payoff against each of Player 1's actions"""
+        return self._cached('row_maxima', lambda: self.best_payoffs(1)[:, 0])
+
+    @property
+    def row_minima(self) -> np.ndarray:
+        """Player 1's worst payoff for each of their actions"""
+        return self.worst_payoffs(0)
+
+    @property
+    def column_minima(self) -> np.ndarray:
+        """Player 2's worst payoff for each of their actions"""
+        return self.worst_payoffs(1)
+
+    @property
+    def best_responses_player1(self) -> np.ndarray:
+        """Whether each cell's row is a best response of Player 1 to the cell's column"""
+        return self.best_responses(0)
+
+    @property
+    def best_responses_player2(self) -> np.ndarray:
+        """Whether each cell's column is a best response of Player 2 to the cell's row"""
+        return self.best_responses(1)
+
+    @property
+    def regret_player1(self) -> np.ndarray:
+        """How much better Player 1 could have done in each cell against the same column"""
+        return self.regret(0)
+
+    @property
+    def regret_player2(self) -> np.ndarray:
+        """How much better Player 2 could have done in each cell against the same row"""
+        return self.regret(1)
+
+    def pareto_optimal_mask(self) -> np.ndarray:
+        return self._cached('pareto_optimal_mask', lambda: pareto_optimal_mask(self.payoff_array))
+
+    def find_pareto_optimal(self) -> list[tuple[str, ...]]:
+        with phase("pareto"):
+            pareto_optimal = np.argwhere(self.pareto_optimal_mask()).tolist()
+        pareto_optimal_solutions = []
+        for profile in pareto_optimal:
+            pareto_optimal_solutions.append(tuple(labels[action] for labels, action in zip(self.action_labels, profile)))
+        return pareto_optimal_solutions
+
+    def print_pareto_optimal_solutions(self):
+        print("Pareto Optimal: ", end='')
+        strategies = self.find_pareto_optimal()
+        print(", ".join("".join(strategy) for strategy in strategies))
+
+    def find_strongly_dominated_strategies(self, payoff_matrix, eliminated=None) -> list[chr]:
+        if eliminated is None:
+            eliminated = []
+        strongly_dominated = []
+        for i in range(len(payoff_matrix)):
+            if get_action_name(i, True, len(payoff_matrix)) not in eliminated and is_strongly_dominated(payoff_matrix, i, True):
+                strongly_dominated.append(get_action_name(i, True))
+        for j in range(len(payoff_matrix[0])):
+            if get_action_name(j, False, len(payoff_matrix[0])) not in eliminated and is_strongly_dominated(payoff_matrix, j, False):
+                strongly_dominated.append(get_action_name(j, False, len(self.payoffs[0])))
+
+        return strongly_dominated
+
+    def find_weakly_dominated_strategies(self, payoff_matrix, eliminated=None) -> list[chr]:
+        if eliminated is None:
+            eliminated = []
+        weakly_dominated = []
+        for i in range(len(payoff_matrix)):
+            if get_action_name(i, True, len(payoff_matrix)) not in eliminated and is_weakly_dominated(payoff_matrix, eliminated, i, True):
+                weakly_dominated.append(get_action_name(i, True))
+        for j in range(len(payoff_matrix[0])):
+            if get_action_name(j, False, len(payoff_matrix[0])) not in eliminated and is_weakly_dominated(payoff_matrix, eliminated, j, False):
+                weakly_dominated.append(get_action_name(j, False, len(self.payoffs[0])))
+
+        return weakly_dominated
+
+    def eliminate_dominated_strategies(self, strongly: bool = True, mixed: bool = False) -> list[tuple[list[int], ...]]:
+        with phase("dominance"):
+            trace = self._cached(('elimination', strongly, mixed),
+                                 lambda: iterated_elimination(self.payoff_array, strongly, mixed))
+        return [tuple(list(actions) for actions in eliminated) for eliminated in trace]
+
+    def __print_elimination(self, strongly: bool, mixed: bool = False):
+        trace = self.eliminate_dominated_strategies(strongly, mixed)
+        if not trace:
+            print(f"\tNo {'Strongly' if strongly else 'Weakly'} Dominated Strategies")
+        for eliminated in trace:
+            strategies = [labels[action] for labels, actions in zip(self.action_labels, eliminated) for action in actions]
+            print("\tELIMINATE: " + ", ".join(map(str, strategies)))
+
+    def print_weakly_dominated_solutions(self):
+        print("Weakly Dominated: ")
+        self.__print_elimination(False)
+
+    def print_strongly_dominated_solutions(self, mixed: bool = False):
+        print("Strongly Dominated: ")
+        self.__print_elimination(True, mixed)
+
+    def pure_nash_mask(self) -> np.ndarray:
+        # A cell is an equilibrium when no player can do better by changing their action
+        return self._cached('pure_nash_mask', lambda: np.logical_and.reduce(
+            [self.best_responses(player) for player in range(self.num_players)]))
+
+    def find_pure_equilibrium_profiles(self) -> list[tuple[int, ...]]:
+        with phase("pure equilibria"):
+            return [tuple(profile) for profile in np.argwhere(self.pure_nash_mask()).tolist()]
+
+    def find_nash_equilibria(self) -> list[str]:
+        return [self.profile_name(profile) for profile in self.find_pure_equilibrium_profiles()]
+
+    @property
+    def is_zero_sum(self) -> bool:
+        """
+        Whether this is a two player game whose payoffs add up to the same constant in every cell. Such games are
+        strategically zero-sum, so solve_zero_sum applies and the general bimatrix solvers can be skipped
+        """
+        return self._cached('is_zero_sum', lambda: self.num_players == 2 and
+                            np.ptp(self.payoff_array.sum(axis=-1)).item() <= EQUILIBRIUM_TOLERANCE)
+
+    def solve_zero_sum(self, method: str = 'auto', tolerance: float = ZERO_SUM_TOLERANCE):
+        """
+        Finds the mixed value of a zero-sum game and optimal strategies for both players
+        :param method: 'lp' for one linear program, 'iterative' for regret matching+ self-play until the bounds on the
+        value are within tolerance, or 'auto' to use the linear program unless the game is large
+        :return: the optimal row and column strategies and the value of the game to the row player
+        """
+        if not self.is_zero_sum:
+            raise ValueError("The payoffs do not add up to a constant, so the game is not zero-sum")
+
+        def solve():
+            row_strategy, col_strategy, value = solve_zero_sum(self.payoff_array[:, :, 0], method, tolerance)
+            row_strategy.setflags(write=False)
+            col_strategy.setflags(write=False)
+            return row_strategy, col_strategy, value
+        with phase("zero-sum"):
+            return self._cached(('zero_sum', method, tolerance), solve)
+
+    def print_zero_sum_value(self):
+        if not self.is_zero_sum:
+            return
+        row_strategy, col_strategy, value = self.solve_zero_sum()
+        # Adding zero turns a negative zero from the solver into a plain zero
+        print(f"Zero-Sum Value: {value + 0.0:g}")
+        for player, strategy in enumerate((row_strategy, col_strategy)):
+            mixture = [f"{self.action_labels[player][action]} {strategy[action]:.3g}"
+                       for action in np.flatnonzero(strategy > EQUILIBRIUM_TOLERANCE)]
+            print(f"\t{self.__player_name(player)}: Mix " + ", ".join(mixture))
+
+    def find_mixed_equilibria(self, method: str = 'auto', time_limit: float = None,
+                              max_pivots: int = DEFAULT_MAX_PIVOTS, mixed_dominance: bool = False):
+        """
+        Finds mixed strategy Nash equilibria after removing the strictly dominated strategies, which are never played.
+        Only supported for two player games
+        :param method: 'support' for support enumeration, 'lemke-howson' for Lemke-Howson from every label, 'zero-sum' for
+        one optimal strategy pair of a zero-sum game, or 'auto' to use support enumeration when the reduced game is small
+        enough and otherwise the zero-sum solver when it applies
+        :param time_limit: seconds the whole search may take, after which the equilibria found so far are returned
+        :param max_pivots: the Lemke-Howson pivot budget of each path
+        :param mixed_dominance: whether to also remove strategies strictly dominated by a mixture before solving
+        :return: a list of (row strategy, column strategy) probability vectors over all of the game's actions, whose
+        truncated attribute tells whether the search stopped early
+        """
+        if self.num_players != 2:
+            raise ValueError(f"Mixed equilibria are only supported for two player games, not {self.num_players}")
+        deadline = None if time_limit is None else time.perf_counter() + time_limit
+        alive_rows = np.ones(self.payoff_array.shape[0], dtype=bool)
+        alive_cols = np.ones(self.payoff_array.shape[1], dtype=bool)
+        for rows, cols in self.eliminate_dominated_strategies(True, mixed_dominance):
+            alive_rows[rows] = False
+            alive_cols[cols] = False
+        reduced = self.payoff_array[alive_rows][:, alive_cols]
+
+        if method == 'auto':
+            if count_support_pairs(*reduced.shape[:2]) <= SUPPORT_ENUMERATION_LIMIT:
+                method = 'support'
+            else:
+                method = 'zero-sum' if self.is_zero_sum else 'lemke-howson'
+        remaining = None if deadline is None else max(deadline - time.perf_counter(), 0)
+        with phase("mixed equilibria"):
+            if method == 'support':
+                reduced_equilibria = support_enumeration(reduced, remaining)
+            elif method == 'lemke-howson':
+                reduced_equilibria = lemke_howson_all_labels(reduced, max_pivots, remaining)
+            elif method == 'zero-sum':
+                if not self.is_zero_sum:
+                    raise ValueError("The payoffs do not add up to a constant, so the game is not zero-sum")
+                reduced_equilibria = EquilibriumList([solve_zero_sum(reduced[:, :, 0])[:2]])
+            else:
+                raise ValueError(f"Unknown equilibrium method {method}")
+
+        equilibria = EquilibriumList(truncated=reduced_equilibria.truncated)
+        for reduced_row_strategy, reduced_col_strategy in reduced_equilibria:
+            row_strategy = np.zeros(len(alive_rows))
+            col_strategy = np.zeros(len(alive_cols))
+            row_strategy[alive_rows] = reduced_row_strategy
+            col_strategy[alive_cols] = reduced_col_strategy
+            equilibria.append((row_strategy, col_strategy))
+        return equilibria
+
+    def find_approximate_equilibrium(self, method: str = 'cfr+', iterations: int = None,
+                                     tolerance: float = None) -> tuple[list[np.ndarray], float]:
+        """
+        Approximates an equilibrium by self-play, for games of any number of players that are too large for the exact
+        solvers of find_mixed_equilibria
+        :param method: 'cfr+', 'regret-matching' or 'fictitious-play'
+        :param iterations: SelfPlay.DEFAULT_ITERATIONS when not given
+        :param tolerance: stop early once the exploitability is at most this
+        :return: each player's strategy and how much the players could gain in total by deviating from them
+        """
+        from .selfplay import DEFAULT_ITERATIONS, self_play
+        iterations = DEFAULT_ITERATIONS if iterations is None else iterations
+        with phase("self-play", iterations):
+            return self_play(self.payoff_array, method, iterations, tolerance)
+
+    def print_pure_strategy_equilibria(self):
+        print("Pure Strategy Equilibria: ", end='')
+        nash_equilibria = self.find_nash_equilibria()
+        print(", ".join(map(str, nash_equilibria)))
+
+    def minimax_actions(self) -> tuple[list[int], ...]:
+        # Determine each player's actions with the minimum worst-case regret
+        def compute():
+            best_actions = []
+            with phase("minimax"):
+                for player in range(self.num_players):
+                    other_axes = tuple(axis for axis in range(self.num_players) if axis != player)
+                    worst_regret = self.regret(player).max(axis=other_axes)
+                    best_actions.append(np.flatnonzero(worst_regret == worst_regret.min()).tolist())
+            return tuple(best_actions)
+        return self._cached('minimax', compute)
+
+    def find_minimax_strategy(self) -> tuple[list[str], ...]:
+        return tuple([labels[action] for action in actions]
+                     for labels, actions in zip(self.action_labels, self.minimax_actions()))
+
+    def print_minimax_strategy(self):
+        print("Minimax Strategy:")
+        for player, actions in enumerate(self.find_minimax_strategy()):
+            print(f"\t{self.__player_name(player)}: Choose " + " or ".join(map(str, actions)))
+
+    def maximin_actions(self) -> tuple[tuple[list[int], int], ...]:
+        # Worst case payoff of each action over the opponents' actions
+        def compute():
+            strategies = []
+            with phase("maximin"):
+                for player in range(self.num_players):
+                    min_payoffs = self.worst_payoffs(player)
+                    max_of_mins = min_payoffs.max()
+                    strategies.append((np.flatnonzero(min_payoffs == max_of_mins).tolist(), max_of_mins.item()))
+            return tuple(strategies)
+        return self._cached('maximin', compute)
+
+    def find_maximin_strategy(self) -> tuple[tuple[list[str], int], ...]:
+        return tuple(([labels[action] for action in actions], value)
+                     for labels, (actions, value) in zip(self.action_labels, self.maximin_actions()))
+
+    def print_maximin_strategy(self):
+        print("Maximin Strategy:")
+        strategies = self.find_maximin_strategy()
+        for player, (actions, _) in enumerate(strategies):
+            print(f"\t{self.__player_name(player)}: Choose " + " or ".join(map(str, actions)))
+        return strategies
+
+    def __format_table(self, payoffs) -> str:
+        row_labels, col_labels = self.action_labels[:2]
+        output = ""
+        format_specifier = "^11s"
+        output += format(" ", format_specifier)
+        for action2 in range(len(payoffs[0])):
+            output += format(col_labels[action2], format_specifier)
+        output += "\n"
+        for action1 in range(len(payoffs)):
+            output += format(row_labels[action1], format_specifier)
+            for action2 in range(len(payoffs[0])):
+                output += format(str(payoffs[action1][action2]), format_specifier)
+            output += "\n"
+        return output
+
+    def print_table(self):
+        if self.num_players == 2:
+            print(self.__format_table(self.payoffs))
+            return
+        # Games with more players are printed as one table of the first two players per profile of the others
+        for profile in np.ndindex(*self.action_counts[2:]):
+            others = ", ".join(labels[action] for labels, action in zip(self.action_labels[2:], profile))
+            payoffs = self.payoffs
+            for action in profile:
+                payoffs = [[cell[action] for cell in row] for row in payoffs]
+            print(f"Others play {others}:")
+            print(self.__format_table(payoffs))
+
+    def report(self, title):
+        with phase("report"):
+            print(format(title, "-^70s"))
+            self.print_table()
+            self.print_strongly_dominated_solutions()
+            self.print_weakly_dominated_solutions()
+            self.print_pure_strategy_equilibria()
+            self.print_pareto_optimal_solutions()
+            self.print_minimax_strategy()
+            self.print_maximin_strategy()
+            self.print_zero_sum_value()
+            print("\n")
+
+
+def parse_payoff(normal_form: str) -> list[list[tuple[int, int]]]:
+    lines = normal_form.strip().split('\n')
+
+    # The first line contains the number of actions for both players
+    action_counts = list(map(int, lines[0].split()))
+    num_actions_player1, num_actions_player2 = action_counts[0], action_counts[1]
+
+    # Initialize the payoff matrix
+    payoff_matrix = []
+
+    # Retrieve payoffs for Player 1 and Player 2
+    player1_payoffs = list(map(int, lines[1].split()))
+    player2_payoffs = list(map(int, lines[2].split()))
+
+    for i in range(num_actions_player1):
+        row = []
+        for j in range(num_actions_player2):
+            index = j + i * num_actions_player2
+            row.append((player1_payoffs[index], player2_payoffs[index]))
+        payoff_matrix.append(row)
+
+    return payoff_matrix
+
+
+def to_payoff_array(payoff_matrix) -> np.ndarray:
+    payoff_array = np.ascontiguousarray(payoff_matrix)
+    # An N player game has one axis per player and a last axis holding the N payoffs
+    if payoff_array.ndim < 3 or payoff_array.shape[-1] != payoff_array.ndim - 1 or 0 in payoff_array.shape:
+        raise ValueError(f"Expected a non-empty (actions of player 1, ..., actions of player N, N) payoff matrix, "
+                         f"got shape {payoff_array.shape}")
+    return payoff_array
+
+
+def parse_payoff_array(normal_form: str) -> np.ndarray:
+    lines = normal_form.strip().split('\n')
+    num_actions_player1, num_actions_player2 = map(int, lines[0].split()[:2])
+
+    # Player 1's payoffs are on the second line and Player 2's on the third, both in row major order
+    player1_payoffs = np.fromstring(lines[1], dtype=np.int64, sep=' ')[:num_actions_player1 * num_actions_player2]
+    player2_payoffs = np.fromstring(lines[2], dtype=np.int64, sep=' ')[:num_actions_player1 * num_actions_player2]
+    payoff_array = np.stack((player1_payoffs, player2_payoffs), axis=-1)
+    return payoff_array.reshape(num_actions_player1, num_actions_player2, 2)
+
+
+def _is_binary_game(path: str) -> bool:
+    with open(path, 'rb') as file:
+        return file.read(len(BINARY_MAGIC)) == BINARY_MAGIC
+
+
+def read_payoff_file(path: str) -> np.ndarray:
+    """
+    Loads a game file in either the text format read by parse_payoff or the binary format written by write_binary_game
+    """
+    with phase("parse"):
+        payoff_array = load_binary_game(path) if _is_binary_game(path) else stream_payoff_file(path)
+    count("parse", payoff_array.size)
+    return payoff_array
+
+
+def _stream_payoff_line(file, buffer: bytes, values: np.ndarray, chunk_size: int, dtype) -> tuple[int, bytes]:
+    """
+    Parses the next line of the file chunk by chunk into values, ignoring any numbers past the ones values holds
+    :param buffer: the bytes already read past the end of the previous line
+    :return: how many values the line filled and the bytes read past its end
+    """
+    filled = 0
+    while True:
+        newline = buffer.find(b'\n')
+        chunk = b''
+        if newline < 0:
+            chunk = file.read(chunk_size)
+            buffer += chunk
+            newline = buffer.find(b'\n')
+        if newline >= 0:
+            end, rest, done = newline, newline + 1, True
+        elif not chunk:
+            end, rest, done = len(buffer), len(buffer), True
+        else:
+            # A token cut off at the end of the chunk is kept for the next one
+            end = max(buffer.rfind(whitespace) for whitespace in (b' ', b'\t', b'\r')) + 1
+            rest, done = end, False
+        text = buffer[:end].decode().strip()
+        buffer = buffer[rest:]
+        parsed = np.fromstring(text, dtype=dtype, sep=' ') if text else np.empty(0, dtype=dtype)
+        parsed = parsed[:len(values) - filled]
+        values[filled:filled + len(parsed)] = parsed
+        filled += len(parsed)
+        if done:
+            return filled, buffer
+
+
+def stream_payoff_file(path: str, chunk_size: int = PARSE_CHUNK_SIZE, dtype=np.int64) -> np.ndarray:
+    """
+    Parses a text game file chunk by chunk straight into a (rows, cols, 2) array, without holding the file in memory.
+    Like parse_payoff_array, each player's payoffs are read from their own line, so a line with a number too many or too
+    few cannot shift the payoffs of the other player
+    """
+    with open(path, 'rb') as file:
+        num_actions_player1, num_actions_player2 = map(int, file.readline().split()[:2])
+        num_cells = num_actions_player1 * num_actions_player2
+        payoff_array = np.empty((num_actions_player1, num_actions_player2, 2), dtype=dtype)
+        cells = payoff_array.reshape(num_cells, 2)
+        buffer = b''
+        # Player 1's payoffs are on the second line and Player 2's on the third, both in row major order
+        for player in range(2):
+            filled, buffer = _stream_payoff_line(file, buffer, cells[:, player], chunk_size, dtype)
+            if filled < num_cells:
+                raise ValueError(f"{path} has {filled} payoffs for Player {player + 1} but "
+                                 f"{num_actions_player1}x{num_actions_player2} needs {num_cells}")
+    return payoff_array
+
+
+def write_binary_game(path: str, payoff_matrix):
+    """
+    Writes a game as a header followed by its (rows, cols, 2) payoffs as little endian int32, or float64 when they do
+    not fit
+    """
+    payoff_array = to_payoff_array(payoff_matrix)
+    int32 = np.iinfo(np.int32)
+    fits_int32 = np.issubdtype(payoff_array.dtype, np.integer) and \
+        int32.min <= payoff_array.min() and payoff_array.max() <= int32.max
+    type_code = 0 if fits_int32 else 1
+    with open(path, 'wb') as file:
+        file.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, type_code, *payoff_array.shape[:2]))
+        file.write(np.ascontiguousarray(payoff_array, dtype=BINARY_DTYPES[type_code]).tobytes())
+
+
+def load_binary_game(path: str) -> np.ndarray:
+    """
+    Maps a binary game file into memory, so the payoffs are read lazily from the file instead of being copied
+    """
+    with open(path, 'rb') as file:
+        magic, version, type_code, num_actions_player1, num_actions_player2 = BINARY_HEADER.unpack(
+            file.read(BINARY_HEADER.size))
+    if magic != BINARY_MAGIC or version != BINARY_VERSION or type_code not in BINARY_DTYPES:
+        raise ValueError(f"{path} is not a version {BINARY_VERSION} binary game file")
+    return np.memmap(path, dtype=BINARY_DTYPES[type_code], mode='r', offset=BINARY_HEADER.size,
+                     shape=(num_actions_player1, num_actions_player2, 2))
@@ -0,0 +1,402 @@
+import random
+from array import array
+from collections import Counter, deque
+
+import numpy as np
+
+from .automaton import Automaton
+from .instrumentation import phase
+
+# Number of rounds Game plays at once, which bounds the memory used by the action arrays
+SIMULATION_CHUNK_SIZE = 1 << 20
+# Type code of the optional full history, actions have to fit in a signed byte
+HISTORY_TYPECODE = 'b'
+
+
+class Player:
+    """
+    A player of a repeated game. Players only keep a bounded state about their opponent, so a match uses constant memory
+    :var recent_actions holds the opponent's last history_length actions, the most recent last
+    :var action_counts counts how many times the opponent played each action
+    :var history is the opponent's full history, only kept when the player is created with keep_history
+    """
+    # Memoryless players ignore what the opponent did, so Game draws all of their actions at once with
+    # play_rounds(rounds, rng), which every memoryless strategy has to define
+    memoryless = False
+    # How many of the opponent's most recent actions the strategy needs to decide
+    history_length = 0
+
+    def __init__(self, keep_history: bool = False):
+        self.recent_actions = deque(maxlen=self.history_length)
+        self.action_counts = Counter()
+        self.history = array(HISTORY_TYPECODE) if keep_history else None
+        self.your_previous_actions = []
+
+    @property
+    def their_previous_actions(self) -> list[int]:
+        # The full history when it is kept, otherwise only the actions the strategy still remembers
+        return list(self.recent_actions if self.history is None else self.history)
+
+    @property
+    def rounds_played(self) -> int:
+        return self.action_counts.total()
+
+    def play(self):
+        pass
+
+    def start_game(self, payoff_array: np.ndarray, seat: int, rng: np.random.Generator):
+        """
+        Called by Game before the first round
+        :param payoff_array: the (rows, cols, 2) payoffs of the game
+        :param seat: 0 when the player picks the row, 1 when they pick the column
+        :param rng: the player's own random stream for the game
+        """
+        pass
+
+    def get_strategy(self):
+        pass
+
+    def to_automaton(self, num_actions: int = 2) -> Automaton:
+        """
+        Writes the strategy as a finite-state machine
+        :param num_actions: the number of actions of the opponent
+        :raises ValueError: when the strategy is random or its state is unbounded
+        """
+        raise ValueError(f"{type(self).__name__} cannot be written as a finite-state machine")
+
+    def can_play(self, num_actions: int, num_opponent_actions: int) -> bool:
+        """
+        Whether every action the strategy may pick exists in a game where it has num_actions actions and the opponent
+        has num_opponent_actions
+        """
+        return True
+
+    def learn(self, their_action):
+        self.recent_actions.append(their_action)
+        self.action_counts[their_action] += 1
+        if self.history is not None:
+            self.history.append(their_action)
+
+    def learn_rounds(self, their_actions: np.ndarray):
+        """
+        Records a block of the opponent's actions at once, leaving the same counts and histories as calling learn on
+        each of them. Game only uses it for memoryless players, whose strategy never reads what it records
+        """
+        counts = np.bincount(their_actions).tolist()
+        self.action_counts.update({action: count for action, count in enumerate(counts) if count})
+        if self.history_length:
+            self.recent_actions.extend(their_actions[-self.history_length:].tolist())
+        if self.history is not None:
+            self.history.extend(their_actions.tolist())
+
+
+class TitForTat(Player):
+    history_length = 1
+
+    def play(self):
+        if not self.recent_actions:
+            return 0
+        return self.recent_actions[-1]
+
+    def get_strategy(self):
+        return "Tit for Tat"
+
+    def can_play(self, num_actions: int, num_opponent_actions: int) -> bool:
+        # Copies the opponent, so it needs every action the opponent has
+        return num_opponent_actions <= num_actions
+
+    def to_automaton(self, num_actions: int = 2) -> Automaton:
+        # One state per action of the opponent, which is the action to copy
+        actions = np.arange(num_actions)
+        return Automaton(actions, np.tile(actions, (num_actions, 1)), 0, self.get_strategy())
+
+
+class Random(Player):
+    memoryless = True
+
+    def play(self):
+        return random.randint(0, 1)
+
+    def play_rounds(self, rounds: int, rng: np.random.Generator) -> np.ndarray:
+        return rng.integers(0, 2, rounds, dtype=np.int8)
+
+    def get_strategy(self):
+        return "Random"
+
+    def can_play(self, num_actions: int, num_opponent_actions: int) -> bool:
+        return num_actions >= 2
+
+
+class RandomChoice(Player):
+    memoryless = True
+
+    def __init__(self, choices, strategy_name, keep_history: bool = False):
+        super().__init__(keep_history)
+        self.choices = choices
+        self.strategy_name = strategy_name
+
+    def play(self):
+        return random.choice(self.choices)
+
+    def play_rounds(self, rounds: int, rng: np.random.Generator) -> np.ndarray:
+        return rng.choice(np.asarray(self.choices, dtype=np.intp), rounds)
+
+    def get_strategy(self):
+        return self.strategy_name
+
+    def can_play(self, num_actions: int, num_opponent_actions: int) -> bool:
+        return max(self.choices) < num_actions
+
+    def to_automaton(self, num_actions: int = 2) -> Automaton:
+        if len(set(self.choices)) != 1:
+            return super().to_automaton(num_actions)
+        return Automaton([self.choices[0]], np.zeros((1, num_actions)), 0, self.get_strategy())
+
+
+class Grudge(Player):
+    def play(self):
+        return 0 if self.action_counts[1] == 0 else 1
+
+    def get_strategy(self):
+        return "Grudge"
+
+    def can_play(self, num_actions: int, num_opponent_actions: int) -> bool:
+        return num_actions >= 2
+
+    def to_automaton(self, num_actions: int = 2) -> Automaton:
+        # Cooperates in state 0 until the opponent defects, then defects in state 1 forever
+        transitions = np.ones((2, num_actions))
+        transitions[0, 0] = 0
+        transitions[0, 2:] = 0
+        return Automaton([0, 1], transitions, 0, self.get_strategy())
+
+
+class AlwaysDefect(Player):
+    memoryless = True
+
+    def play(self):
+        return 1
+
+    def play_rounds(self, rounds: int, rng: np.random.Generator) -> np.ndarray:
+        return np.ones(rounds, dtype=np.int8)
+
+    def get_strategy(self):
+        return "Always Defect"
+
+    def can_play(self, num_actions: int, num_opponent_actions: int) -> bool:
+        return num_actions >= 2
+
+    def to_automaton(self, num_actions: int = 2) -> Automaton:
+        return Automaton([1], np.zeros((1, num_actions)), 0, self.get_strategy())
+
+
+class AlwaysCooperate(Player):
+    memoryless = True
+
+    def play(self):
+        return 0
+
+    def play_rounds(self, rounds: int, rng: np.random.Generator) -> np.ndarray:
+        return np.zeros(rounds, dtype=np.int8)
+
+    def get_strategy(self):
+        return "Always Cooperate"
+
+    def to_automaton(self, num_actions: int = 2) -> Automaton:
+        return Automaton([0], np.zeros((1, num_actions)), 0, self.get_strategy())
+
+
+class PlaySpecificStrategy(Player):
+    memoryless = True
+
+    def __init__(self, strategy_index, strategy_name, keep_history: bool = False):
+        super().__init__(keep_history)
+        self.strategy_index = strategy_index
+        self.strategy_name = strategy_name
+
+    def play(self):
+        return self.strategy_index
+
+    def play_rounds(self, rounds: int, rng: np.random.Generator) -> np.ndarray:
+        return np.full(rounds, self.strategy_index, dtype=np.intp)
+
+    def get_strategy(self):
+        return f"Always Play {self.strategy_name}"
+
+    def can_play(self, num_actions: int, num_opponent_actions: int) -> bool:
+        return self.strategy_index < num_actions
+
+    def to_automaton(self, num_actions: int = 2) -> Automaton:
+        return Automaton([self.strategy_index], np.zeros((1, num_actions)), 0, self.get_strategy())
+
+
+class AutomatonPlayer(Player):
+    """
+    Plays a finite-state machine strategy
+    """
+    def __init__(self, automaton: Automaton, keep_history: bool = False):
+        super().__init__(keep_history)
+        self.automaton = automaton
+        self.state = automaton.initial_state
+
+    def start_game(self, payoff_array: np.ndarray, seat: int, rng: np.random.Generator):
+        self.state = self.automaton.initial_state
+
+    def play(self):
+        return self.automaton.outputs[self.state].item()
+
+    def learn(self, their_action):
+        super().learn(their_action)
+        self.state = self.automaton.transitions[self.state, their_action].item()
+
+    def get_strategy(self):
+        return self.automaton.name
+
+    def can_play(self, num_actions: int, num_opponent_actions: int) -> bool:
+        return self.automaton.outputs.max() < num_actions and \
+            self.automaton.num_opponent_actions >= num_opponent_actions
+
+    def to_automaton(self, num_actions: int = 2) -> Automaton:
+        return self.automaton
+
+
+class LearningPlayer(Player):
+    """
+    A player that learns from the payoffs its actions would have earned against the opponent's actions
+    :var payoffs holds the player's own payoffs with their actions on the first axis and the opponent's on the second
+    """
+    def start_game(self, payoff_array: np.ndarray, seat: int, rng: np.random.Generator):
+        payoff_array = np.asarray(payoff_array)
+        self.payoffs = payoff_array[:, :, 0] if seat == 0 else payoff_array[:, :, 1].T
+        self.rng = rng
+
+
+class RegretMatching(LearningPlayer):
+    """
+    Plays each action in proportion to the positive regret for not having played it in the past rounds. With plus the
+    regrets are floored at zero after every round, which is the CFR+ form of regret matching and adapts faster
+    """
+    def __init__(self, plus: bool = False, keep_history: bool = False):
+        super().__init__(keep_history)
+        self.plus = plus
+        self.regrets = None
+        self.strategy_sum = None
+        self.last_action = None
+
+    def start_game(self, payoff_array: np.ndarray, seat: int, rng: np.random.Generator):
+        super().start_game(payoff_array, seat, rng)
+        self.regrets = np.zeros(len(self.payoffs))
+        self.strategy_sum = np.zeros(len(self.payoffs))
+
+    @property
+    def current_strategy(self) -> np.ndarray:
+        positive = np.maximum(self.regrets, 0)
+        total = positive.sum()
+        return positive / total if total > 0 else np.full(len(positive), 1 / len(positive))
+
+    @property
+    def average_strategy(self) -> np.ndarray:
+        return self.strategy_sum / max(self.strategy_sum.sum(), 1)
+
+    def play(self):
+        strategy = self.current_strategy
+        # CFR+ weighs later rounds more when averaging
+        self.strategy_sum += (self.rounds_played + 1 if self.plus else 1) * strategy
+        self.last_action = min(int(np.searchsorted(np.cumsum(strategy), self.rng.random(), side='right')),
+                               len(strategy) - 1)
+        return self.last_action
+
+    def learn(self, their_action):
+        super().learn(their_action)
+        if self.last_action is None:
+            return
+        values = self.payoffs[:, their_action]
+        self.regrets += values - values[self.last_action]
+        if self.plus:
+            np.maximum(self.regrets, 0, out=self.regrets)
+
+    def get_strategy(self):
+        return "Regret Matching+" if self.plus else "Regret Matching"
+
+
+class FictitiousPlay(LearningPlayer):
+    """
+    Best responds to the frequencies of the opponent's past actions, starting with action 0
+    """
+    def __init__(self, keep_history: bool = False):
+        super().__init__(keep_history)
+        self.totals = None
+
+    def start_game(self, payoff_array: np.ndarray, seat: int, rng: np.random.Generator):
+        super().start_game(payoff_array, seat, rng)
+        # The total payoff each action would have earned against the opponent's past actions
+        self.totals = np.zeros(len(self.payoffs))
+
+    def play(self):
+        return int(self.totals.argmax())
+
+    def learn(self, their_action):
+        super().learn(their_action)
+        self.totals += self.payoffs[:, their_action]
+
+    def get_strategy(self):
+        return "Fictitious Play"
+
+
+class Game:
+    def __init__(self, simulations, player1, player2, payoffs=None, seed=None, quiet: bool = False):
+        self.simulations = simulations
+        self.player1 = player1
+        self.player2 = player2
+        self.payoffs = [[(2, 2), (-1, 3)], [(3, -1), (0, 0)]] if payoffs is None else payoffs
+        self.payoff_array = np.asarray(self.payoffs)
+        self.seed = seed
+        self.player1_score = 0
+        self.player2_score = 0
+        self.simulate()
+        if not quiet:
+            self.report()
+
+    def simulate(self):
+        # Each player draws from their own stream so a seeded game replays exactly whatever the pairing
+        player1_rng, player2_rng = np.random.default_rng(self.seed).spawn(2)
+        for player in (self.player1, self.player2):
+            if player.memoryless and not hasattr(player, "play_rounds"):
+                raise TypeError(f"{type(player).__name__} is memoryless but does not define play_rounds")
+        self.player1.start_game(self.payoff_array, 0, player1_rng)
+        self.player2.start_game(self.payoff_array, 1, player2_rng)
+        with phase("simulate", self.simulations):
+            for start in range(0, self.simulations, SIMULATION_CHUNK_SIZE):
+                rounds = min(SIMULATION_CHUNK_SIZE, self.simulations - start)
+                player1_actions, player2_actions = self.__play_rounds(rounds, player1_rng, player2_rng)
+                rewards = self.payoff_array[player1_actions, player2_actions].sum(axis=0)
+                self.player1_score += rewards[0].item()
+                self.player2_score += rewards[1].item()
+
+    def __play_rounds(self, rounds, player1_rng, player2_rng):
+        player1_actions = self.player1.play_rounds(rounds, player1_rng) if self.player1.memoryless else None
+        player2_actions = self.player2.play_rounds(rounds, player2_rng) if self.player2.memoryless else None
+        if player1_actions is not None and player2_actions is not None:
+            # Neither strategy looks at the other's actions, but the counts and histories record them like learn does
+            self.player1.learn_rounds(player2_actions)
+            self.player2.learn_rounds(player1_actions)
+            return player1_actions, player2_actions
+
+        # At least one player reacts to the other, so play round by round against any precomputed actions
+        played1 = np.empty(rounds, dtype=np.intp) if player1_actions is None else player1_actions
+        played2 = np.empty(rounds, dtype=np.intp) if player2_actions is None else player2_actions
+        for i in range(rounds):
+            player1_action = self.player1.play() if player1_actions is None else played1[i].item()
+            player2_action = self.player2.play() if player2_actions is None else played2[i].item()
+
+            self.player1.learn(player2_action)
+            self.player2.learn(player1_action)
+            played1[i] = player1_action
+            played2[i] = player2_action
+        return played1, played2
+
+    def report(self):
+        print(f"Game Over. End of {self.simulations} simulations")
+        print(f"\tPlayer 1 scored: {self.player1_score} using {self.player1.get_strategy()}")
+        print(f"\tPlayer 2 scored: {self.player2_score} using {self.player2.get_strategy()}")
+        print()
@@ -0,0 +1,83 @@
+import numpy as np
+
+from .normal_form_game import NormalFormGame
+from .tournament import run_tournament
+
+
+class Population:
+    """
+    A population of Player strategies that evolves by replicator dynamics or a Moran process
+    :var roster is the list of Player objects, one per strategy
+    :var payoff_matrix is the average per round payoff of each strategy against each other strategy. It comes from one
+    round-robin tournament and is cached, so evolving the population never plays another match
+    """
+    def __init__(self, roster, payoffs=None, rounds: int = 200, seed=None, max_workers: int = 1):
+        self.roster = roster
+        if isinstance(payoffs, NormalFormGame):
+            payoffs = payoffs.payoff_array
+        self.payoffs = [[(2, 2), (-1, 3)], [(3, -1), (0, 0)]] if payoffs is None else payoffs
+        self.rounds = rounds
+        self.seed = seed
+        self.max_workers = max_workers
+        self._payoff_matrix = None
+
+    @property
+    def payoff_matrix(self) -> np.ndarray:
+        if self._payoff_matrix is None:
+            # Every strategy has to meet every other, so one that cannot play a seat of the game leaves a gap
+            num_actions_player1, num_actions_player2 = np.asarray(self.payoffs).shape[:2]
+            for player in self.roster:
+                if not (player.can_play(num_actions_player1, num_actions_player2) and
+                        player.can_play(num_actions_player2, num_actions_player1)):
+                    raise ValueError(f"{player.get_strategy()} cannot play both seats of a "
+                                     f"{num_actions_player1}x{num_actions_player2} game")
+            scores = run_tournament(self.roster, [self.payoffs], self.rounds, self.seed, self.max_workers)[0]
+            # A strategy meets the others in either seat equally often, so average over both
+            self._payoff_matrix = (scores[:, :, 0] + scores[:, :, 1].T) / (2 * self.rounds)
+        return self._payoff_matrix
+
+    def replicator_dynamics(self, shares=None, generations: int = 1000) -> np.ndarray:
+        """
+        Evolves the population shares with discrete time replicator dynamics
+        :param shares: the starting share of each strategy, uniform by default
+        :return: a (generations + 1, strategies) array of the shares in each generation
+        """
+        payoff_matrix = self.payoff_matrix
+        # Shifting every payoff by the same amount keeps the fitness positive without changing who is fitter
+        fitness_matrix = payoff_matrix - payoff_matrix.min() + 1
+        shares = np.full(len(self.roster), 1 / len(self.roster)) if shares is None else np.asarray(shares, dtype=float)
+        history = np.empty((generations + 1, len(shares)))
+        history[0] = shares = shares / shares.sum()
+        for generation in range(1, generations + 1):
+            shares = shares * (fitness_matrix @ shares)
+            history[generation] = shares = shares / shares.sum()
+        return history
+
+    def moran_process(self, counts, generations: int = 1000, selection_intensity: float = 1.0, seed=None) -> np.ndarray:
+        """
+        Evolves a finite population where each generation one individual reproduces and replaces a random individual
+        :param counts: the starting number of individuals playing each strategy
+        :param selection_intensity: how strongly payoffs affect reproduction, 0 is neutral drift
+        :param seed: seeds the births and deaths
+        :return: a (generations + 1, strategies) array of the counts in each generation
+        """
+        payoff_matrix = self.payoff_matrix
+        counts = np.array(counts, dtype=np.int64)
+        population_size = counts.sum()
+        uniforms = np.random.default_rng(seed).random((generations, 2))
+        history = np.empty((generations + 1, len(counts)), dtype=np.int64)
+        history[0] = counts
+        for generation in range(1, generations + 1):
+            if counts.max() == population_size:
+                # One strategy has taken over and nothing can change any more
+                history[generation:] = counts
+                break
+            # Each individual meets everyone else in the population once
+            payoffs = (payoff_matrix @ counts - np.diag(payoff_matrix)) / max(population_size - 1, 1)
+            weights = counts * np.exp(selection_intensity * (payoffs - payoffs.max()))
+            parent = np.searchsorted(np.cumsum(weights), uniforms[generation - 1, 0] * weights.sum(), side='right')
+            dying = np.searchsorted(np.cumsum(counts), uniforms[generation - 1, 1] * population_size, side='right')
+            counts[min(parent, len(counts) - 1)] += 1
+            counts[dying] -= 1
+            history[generation] = counts
+        return history
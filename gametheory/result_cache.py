@@ -0,0 +1,260 @@
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from itertools import permutations
+
+import numpy as np
+
+# Bumped whenever the entry format changes, entries written by another version are ignored
+CACHE_VERSION = 1
+DEFAULT_CACHE_BYTES = 64 << 20
+# Cells refined while searching for a canonical form. Once spent, the remaining ties are broken by action index, which
+# still gives a valid key but one that a permuted copy of the game may not share
+CANONICAL_SEARCH_CELLS = 1 << 24
+
+# How each cacheable result of NormalFormGame is named in an entry and which kind of value it holds
+CACHED_RESULTS = {
+    ('elimination', True, False): ('strongly_dominated', 'trace'),
+    ('elimination', False, False): ('weakly_dominated', 'trace'),
+    ('elimination', True, True): ('mixed_dominated', 'trace'),
+    'pure_nash_mask': ('pure_equilibria', 'profiles'),
+    'pareto_optimal_mask': ('pareto_optimal', 'profiles'),
+    'minimax': ('minimax', 'actions'),
+    'maximin': ('maximin', 'valued actions'),
+}
+_RESULTS_BY_NAME = {name: (key, kind) for key, (name, kind) in CACHED_RESULTS.items()}
+
+
+def _dense_ranks(values) -> np.ndarray:
+    return np.unique(values, return_inverse=True)[1].reshape(np.shape(values))
+
+
+def _row_ranks(rows) -> np.ndarray:
+    # Dense ranks of the rows in lexicographic order, much faster than np.unique along an axis
+    order = np.lexsort(rows.T[::-1])
+    sorted_rows = rows[order]
+    new_row = np.ones(len(rows), dtype=bool)
+    new_row[1:] = (sorted_rows[1:] != sorted_rows[:-1]).any(axis=1)
+    ranks = np.empty(len(rows), dtype=np.intp)
+    ranks[order] = np.cumsum(new_row) - 1
+    return ranks
+
+
+def _refine(cell_ids, colors, budget) -> list[np.ndarray]:
+    # Splits each player's actions by the multiset of (payoffs, colors of the other players' actions) over their cells
+    # until no class splits further. Every step only looks at values that do not depend on the order of the actions
+    num_players = cell_ids.ndim
+    while True:
+        budget[0] -= cell_ids.size
+        refined = []
+        for axis in range(num_players):
+            ids = cell_ids
+            for other in range(num_players):
+                if other != axis:
+                    shape = [1] * num_players
+                    shape[other] = -1
+                    radix = colors[other].max() + 1
+                    if ids.max() >= np.iinfo(np.int64).max // radix:
+                        ids = _dense_ranks(ids)
+                    ids = ids * radix + colors[other].reshape(shape)
+            signatures = np.sort(np.moveaxis(ids, axis, 0).reshape(cell_ids.shape[axis], -1), axis=1)
+            refined.append(_row_ranks(np.column_stack((colors[axis], signatures))))
+        # Colors are dense ranks, so a class split shows up as a larger maximum
+        if all(new.max() == old.max() for new, old in zip(refined, colors)):
+            return refined
+        colors = refined
+
+
+def _search(cell_ids, colors, budget) -> tuple[bytes, list[np.ndarray]]:
+    # Refines the colors, then tries each way of singling out one action of the first class that is still tied and
+    # keeps the smallest result, as in canonical graph labelling
+    colors = _refine(cell_ids, [_dense_ranks(axis_colors) for axis_colors in colors], budget)
+    if budget[0] > 0:
+        for axis, axis_colors in enumerate(colors):
+            for color in np.flatnonzero(np.bincount(axis_colors) > 1):
+                members = np.flatnonzero(axis_colors == color)
+                slices = np.moveaxis(cell_ids, axis, 0)[members].reshape(len(members), -1)
+                # Actions with identical payoffs can be swapped without changing the game, so one of them is enough
+                slice_ranks = _row_ranks(slices)
+                representatives = members[np.sort(np.unique(slice_ranks, return_index=True)[1])]
+                if len(representatives) == 1:
+                    continue
+                best = None
+                for member in representatives:
+                    if best is not None and budget[0] <= 0:
+                        break
+                    individualized = [2 * axis_colors + 1 for axis_colors in colors]
+                    individualized[axis][member] -= 1
+                    candidate = _search(cell_ids, individualized, budget)
+                    if best is None or candidate[0] < best[0]:
+                        best = candidate
+                return best
+    orders = [np.argsort(axis_colors, kind='stable') for axis_colors in colors]
+    return np.ascontiguousarray(cell_ids[np.ix_(*orders)]).tobytes(), orders
+
+
+def canonical_form(payoff_array) -> tuple[str, tuple[int, ...], list[np.ndarray]]:
+    """
+    Puts a game in a canonical order of its players and of each player's actions, so games that only differ by how
+    their actions or players are ordered get the same key
+    :param payoff_array: a payoff array with one axis per player followed by an axis of each player's payoff
+    :return: the key, the game's player sitting in each canonical seat, and for each seat the game's action at each
+    canonical index
+    """
+    payoff_array = np.asarray(payoff_array, dtype=np.float64) + 0.0  # adding zero turns negative zeros into zeros
+    num_players = payoff_array.shape[-1]
+    seatings = {players: tuple(payoff_array.shape[player] for player in players)
+                for players in permutations(range(num_players))}
+    # The number of actions in each seat does not depend on the order, so only the seatings with the smallest shape
+    # need a search
+    shape = min(seatings.values())
+    best = None
+    for players, seating_shape in seatings.items():
+        if seating_shape != shape:
+            continue
+        seated = payoff_array.transpose(*players, num_players)[..., list(players)]
+        # Ranks of the payoff vectors in lexicographic order, combined one player at a time
+        cell_ids = _dense_ranks(seated[..., 0])
+        for player in range(1, num_players):
+            payoffs = _dense_ranks(seated[..., player])
+            cell_ids = _dense_ranks(cell_ids * (payoffs.max() + 1) + payoffs)
+        _, orders = _search(cell_ids, [np.zeros(num_actions, dtype=np.intp) for num_actions in shape],
+                            [CANONICAL_SEARCH_CELLS])
+        canonical = np.ascontiguousarray(seated[np.ix_(*orders)]).tobytes()
+        if best is None or canonical < best[0]:
+            best = canonical, players, orders
+    canonical, players, orders = best
+    key = hashlib.sha256(repr(shape).encode() + canonical).hexdigest()
+    return key, players, orders
+
+
+def _inverse(order) -> np.ndarray:
+    inverse = np.empty_like(order)
+    inverse[order] = np.arange(len(order))
+    return inverse
+
+
+def _to_canonical(kind: str, value, players, orders):
+    inverse = [_inverse(order) for order in orders]
+
+    def seat_actions(per_player):
+        return [sorted(inverse[seat][per_player[player]].tolist()) for seat, player in enumerate(players)]
+
+    if kind == 'trace':
+        return [seat_actions(eliminated) for eliminated in value]
+    if kind == 'profiles':
+        profiles = np.argwhere(value)
+        seated = np.column_stack([inverse[seat][profiles[:, player]] for seat, player in enumerate(players)])
+        return seated[np.lexsort(seated.T[::-1])].tolist()
+    if kind == 'actions':
+        return seat_actions(value)
+    return [[actions, value[player][1]]
+            for actions, player in zip(seat_actions([actions for actions, _ in value]), players)]
+
+
+def _from_canonical(kind: str, value, players, orders, action_counts):
+    def player_actions(per_seat) -> list[list[int]]:
+        actions = [None] * len(players)
+        for seat, player in enumerate(players):
+            actions[player] = sorted(orders[seat][np.asarray(per_seat[seat], dtype=np.intp)].tolist())
+        return actions
+
+    if kind == 'trace':
+        return [tuple(player_actions(eliminated)) for eliminated in value]
+    if kind == 'profiles':
+        seated = np.asarray(value, dtype=np.intp).reshape(-1, len(players))
+        profiles = [None] * len(players)
+        for seat, player in enumerate(players):
+            profiles[player] = orders[seat][seated[:, seat]]
+        mask = np.zeros(action_counts, dtype=bool)
+        mask[tuple(profiles)] = True
+        return mask
+    if kind == 'actions':
+        return tuple(player_actions(value))
+    actions = player_actions([seat_actions for seat_actions, _ in value])
+    values = [None] * len(players)
+    for (_, seat_value), player in zip(value, players):
+        values[player] = seat_value
+    return tuple(zip(actions, values))
+
+
+class ResultCache:
+    """
+    Keeps the analysis results of NormalFormGame in a directory so later runs can skip them. Entries are keyed by a
+    hash of the game's canonical form, so a game whose actions or players are only ordered differently is served from
+    the same entry. Once the entries take more than max_bytes the least recently used ones are removed
+    """
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def _read(self, key: str):
+        try:
+            with open(self._path(key)) as file:
+                entry = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return entry if entry.get("version") == CACHE_VERSION else None
+
+    def load(self, game) -> bool:
+        """
+        Fills the game's cache with the results stored for it
+        :return: whether the game had an entry
+        """
+        key, players, orders = game.canonical_form()
+        entry = self._read(key)
+        if entry is None:
+            return False
+        with contextlib.suppress(OSError):
+            # The modification time orders the entries for eviction
+            os.utime(self._path(key))
+        results = {}
+        for name, value in entry["results"].items():
+            if name in _RESULTS_BY_NAME:
+                result_key, kind = _RESULTS_BY_NAME[name]
+                results[result_key] = _from_canonical(kind, value, players, orders, game.action_counts)
+        game.restore_results(results)
+        return True
+
+    def store(self, game):
+        """
+        Adds the results the game has computed so far to its entry
+        """
+        computed = game.cached_results(CACHED_RESULTS)
+        if not computed:
+            return
+        key, players, orders = game.canonical_form()
+        entry = self._read(key) or {"version": CACHE_VERSION, "results": {}}
+        for result_key, value in computed.items():
+            name, kind = CACHED_RESULTS[result_key]
+            entry["results"][name] = _to_canonical(kind, value, players, orders)
+        data = json.dumps(entry, separators=(",", ":"))
+        if len(data) > self.max_bytes:
+            return
+        # Written to a temporary file first so a concurrent reader never sees half an entry
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(descriptor, "w") as file:
+            file.write(data)
+        os.replace(temporary, self._path(key))
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                with contextlib.suppress(OSError):
+                    status = os.stat(os.path.join(self.directory, name))
+                    entries.append((status.st_mtime_ns, status.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(os.path.join(self.directory, name))
+            total -= size
@@ -0,0 +1,136 @@
+from functools import reduce
+
+import numpy as np
+
+# Default number of self-play iterations
+DEFAULT_ITERATIONS = 100_000
+# Iterations between exploitability checks when a tolerance is given
+CHECK_INTERVAL = 1000
+SELF_PLAY_METHODS = ('regret-matching', 'cfr+', 'fictitious-play')
+
+
+def _own_axis_payoffs(payoff_array) -> list[np.ndarray]:
+    # Each player's payoffs with their own actions on the first axis and the opponent profiles flattened on the second
+    # Contiguous copies, since products with the strided payoff slices cannot use the fast matrix routines
+    return [np.ascontiguousarray(np.moveaxis(payoff_array[..., player], player, 0).reshape(payoff_array.shape[player], -1))
+            for player in range(payoff_array.shape[-1])]
+
+
+def _opponent_mixture(strategies, player: int) -> np.ndarray:
+    # The probability of each opponent profile, flattened in the same order as _own_axis_payoffs
+    opponent_strategies = strategies[:player] + strategies[player + 1:]
+    if len(opponent_strategies) == 1:
+        return opponent_strategies[0]
+    return reduce(np.multiply.outer, opponent_strategies).ravel()
+
+
+def _regret_matching_strategy(regrets) -> np.ndarray:
+    positive = np.maximum(regrets, 0)
+    total = positive.sum()
+    if total > 0:
+        positive /= total
+        return positive
+    return np.full(len(regrets), 1 / len(regrets))
+
+
+def expected_payoffs(payoff_array, strategies) -> list[np.ndarray]:
+    """
+    Computes each player's expected payoff for each of their actions when the other players follow their mixtures
+    :param payoff_array: a payoff array with one axis per player followed by an axis of each player's payoff
+    :param strategies: one probability vector per player
+    """
+    payoffs = _own_axis_payoffs(np.asarray(payoff_array, dtype=float))
+    return [payoffs[player] @ _opponent_mixture(strategies, player) for player in range(len(payoffs))]
+
+
+def exploitability(payoff_array, strategies) -> float:
+    """
+    Sums how much each player could gain by deviating from their mixture, which is zero exactly at a Nash equilibrium
+    """
+    values = expected_payoffs(payoff_array, strategies)
+    return sum(player_values.max() - player_values @ strategy for player_values, strategy in zip(values, strategies))
+
+
+def regret_matching(payoff_array, iterations: int = DEFAULT_ITERATIONS, plus: bool = False,
+                    tolerance: float = None) -> tuple[list[np.ndarray], float]:
+    """
+    Approximates an equilibrium by self-play where each player mixes in proportion to their positive regret for not
+    having played each action. The average strategies converge to a Nash equilibrium in two player zero-sum games, in
+    other games the returned exploitability tells how close they got
+    :param plus: floor the regrets at zero, update the players in turn and weigh later iterations more in the average,
+    which is CFR+ for a matrix game and converges much faster
+    :param tolerance: stop once the exploitability of the average strategies is at most this, checked every
+    CHECK_INTERVAL iterations
+    :return: the average strategy of each player and their exploitability
+    """
+    payoff_array = np.asarray(payoff_array, dtype=float)
+    payoffs = _own_axis_payoffs(payoff_array)
+    regrets = [np.zeros(len(player_payoffs)) for player_payoffs in payoffs]
+    strategies = [np.full(len(player_payoffs), 1 / len(player_payoffs)) for player_payoffs in payoffs]
+    strategy_sums = [np.zeros(len(player_payoffs)) for player_payoffs in payoffs]
+
+    for iteration in range(1, iterations + 1):
+        weight = iteration if plus else 1
+        for player, player_payoffs in enumerate(payoffs):
+            values = player_payoffs @ _opponent_mixture(strategies, player)
+            strategy_sums[player] += weight * strategies[player]
+            regrets[player] += values - values @ strategies[player]
+            if plus:
+                np.maximum(regrets[player], 0, out=regrets[player])
+                # Alternating updates: the next player already responds to this player's new strategy
+                strategies[player] = _regret_matching_strategy(regrets[player])
+        if not plus:
+            strategies = [_regret_matching_strategy(player_regrets) for player_regrets in regrets]
+        if tolerance is not None and iteration % CHECK_INTERVAL == 0:
+            averages = [strategy_sum / strategy_sum.sum() for strategy_sum in strategy_sums]
+            if exploitability(payoff_array, averages) <= tolerance:
+                break
+
+    averages = [strategy_sum / strategy_sum.sum() for strategy_sum in strategy_sums]
+    return averages, exploitability(payoff_array, averages)
+
+
+def fictitious_play(payoff_array, iterations: int = DEFAULT_ITERATIONS,
+                    tolerance: float = None) -> tuple[list[np.ndarray], float]:
+    """
+    Approximates an equilibrium by self-play where each player best responds to the others' past actions, breaking ties
+    towards the lowest action index. The empirical frequencies converge to a Nash equilibrium in two player zero-sum
+    games and in potential games
+    :param tolerance: stop once the exploitability of the empirical frequencies is at most this, checked every
+    CHECK_INTERVAL iterations
+    :return: the empirical frequencies of each player's actions and their exploitability
+    """
+    payoff_array = np.asarray(payoff_array, dtype=float)
+    num_players = payoff_array.shape[-1]
+    counts = [np.zeros(num_actions) for num_actions in payoff_array.shape[:-1]]
+    # The total payoff each action would have earned against every past profile, so a best response only needs the
+    # payoffs of the latest profile added instead of a product with the opponents' frequencies
+    totals = [np.zeros(num_actions) for num_actions in payoff_array.shape[:-1]]
+    actions = [0] * num_players
+
+    for iteration in range(1, iterations + 1):
+        for player in range(num_players):
+            counts[player][actions[player]] += 1
+            totals[player] += payoff_array[(*actions[:player], slice(None), *actions[player + 1:], player)]
+        actions = [int(player_totals.argmax()) for player_totals in totals]
+        if tolerance is not None and iteration % CHECK_INTERVAL == 0:
+            if exploitability(payoff_array, [count / iteration for count in counts]) <= tolerance:
+                break
+
+    frequencies = [count / count.sum() for count in counts]
+    return frequencies, exploitability(payoff_array, frequencies)
+
+
+def self_play(payoff_array, method: str = 'cfr+', iterations: int = DEFAULT_ITERATIONS,
+              tolerance: float = None) -> tuple[list[np.ndarray], float]:
+    """
+    Runs one of the SELF_PLAY_METHODS on the game
+    :return: each player's strategy and their exploitability
+    """
+    if method == 'regret-matching':
+        return regret_matching(payoff_array, iterations, False, tolerance)
+    if method == 'cfr+':
+        return regret_matching(payoff_array, iterations, True, tolerance)
+    if method == 'fictitious-play':
+        return fictitious_play(payoff_array, iterations, tolerance)
+    raise ValueError(f"Unknown self-play method {method}")
@@ -0,0 +1,88 @@
+import copy
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .automaton import play_automata
+from .player import Game
+
+# Matches sent to a worker process at a time, so short matches are not dominated by the cost of dispatching them
+MATCHES_PER_TASK = 16
+
+# The roster and payoffs are sent once to each worker process instead of once per match
+_worker_roster = None
+_worker_payoff_matrices = None
+
+
+def load_payoff_matrices(pattern: str = "data/*.txt") -> list[np.ndarray]:
+    # Only loading games needs the analysis module, so tournaments on given payoffs start without importing it
+    from .normal_form_game import NormalFormGame
+    return [NormalFormGame(path).payoff_array for path in sorted(glob.glob(pattern))]
+
+
+def _init_worker(roster, payoff_matrices):
+    global _worker_roster, _worker_payoff_matrices
+    _worker_roster = roster
+    _worker_payoff_matrices = payoff_matrices
+
+
+def _can_play(roster, payoff_matrices, game_index: int, player1_index: int, player2_index: int) -> bool:
+    num_actions_player1, num_actions_player2 = payoff_matrices[game_index].shape[:2]
+    return roster[player1_index].can_play(num_actions_player1, num_actions_player2) and \
+        roster[player2_index].can_play(num_actions_player2, num_actions_player1)
+
+
+def _play_match(match) -> tuple[int, int]:
+    game_index, player1_index, player2_index, simulations, seed = match
+    payoff_array = _worker_payoff_matrices[game_index]
+    try:
+        # Two deterministic strategies settle into a cycle, so their match is scored without playing every round
+        automaton1 = _worker_roster[player1_index].to_automaton(payoff_array.shape[1])
+        automaton2 = _worker_roster[player2_index].to_automaton(payoff_array.shape[0])
+    except ValueError:
+        automaton1 = automaton2 = None
+    if automaton1 is not None:
+        return play_automata(automaton1, automaton2, payoff_array, simulations)
+    # Every match starts from fresh copies of the roster's players since they learn while playing
+    player1 = copy.deepcopy(_worker_roster[player1_index])
+    player2 = copy.deepcopy(_worker_roster[player2_index])
+    game = Game(simulations, player1, player2, payoff_array, seed, quiet=True)
+    return game.player1_score, game.player2_score
+
+
+def run_tournament(roster, payoff_matrices, simulations: int = 1000, seed=None, max_workers: int = None) -> np.ndarray:
+    """
+    Plays every ordered pairing of the roster, including each player against itself, on every payoff matrix
+    :param roster: the Player objects taking part, each match plays against fresh copies of them
+    :param payoff_matrices: the games to play, as payoff lists or (rows, cols, 2) arrays
+    :param simulations: the number of rounds in each match
+    :param seed: seeds the matches so a tournament can be replayed, each match gets its own stream
+    :param max_workers: the number of worker processes, 1 plays every match in this process
+    :return: a (games, roster, roster, 2) array where [g, i, j] holds the scores of roster[i] as the row player and
+    roster[j] as the column player when they meet in game g. Pairings where a player could pick an action the game does
+    not have, such as Tit for Tat copying a column the row player lacks, are not played and hold NaN
+    """
+    payoff_matrices = [np.asarray(payoffs) for payoffs in payoff_matrices]
+    num_players = len(roster)
+    matches = [(g, i, j) for g in range(len(payoff_matrices)) for i in range(num_players) for j in range(num_players)]
+    # Every match gets its seed before the unplayable ones are dropped, so the others replay the same either way
+    seeds = np.random.SeedSequence(seed).spawn(len(matches))
+    playable = [(match, match_seed) for match, match_seed in zip(matches, seeds)
+                if _can_play(roster, payoff_matrices, *match)]
+    tasks = [(g, i, j, simulations, match_seed) for (g, i, j), match_seed in playable]
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    if max_workers == 1:
+        _init_worker(roster, payoff_matrices)
+        results = list(map(_play_match, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers, initializer=_init_worker, initargs=(roster, payoff_matrices)) as executor:
+            results = list(executor.map(_play_match, tasks, chunksize=MATCHES_PER_TASK))
+
+    scores = np.full((len(payoff_matrices), num_players, num_players, 2), np.nan)
+    for ((g, i, j), _), result in zip(playable, results):
+        scores[g, i, j] = result
+    return scores
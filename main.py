@@ -1,69 +1,104 @@
-from NormalFormGame import *
-from Player import *
+import argparse
+import contextlib
+import json
 
 
 def get_pareto_optimal_players(normal_game):
+    from gametheory.player import RandomChoice
     pareto_optimal = normal_game.find_pareto_optimal()
     choices_p1 = []
     choices_p2 = []
     for strategy in pareto_optimal:
-        choices_p1.append(get_action_index(strategy[0], len(payoff_matrix))[1])
-        choices_p2.append(get_action_index(strategy[1], len(payoff_matrix))[1])
+        choices_p1.append(normal_game.action_index(0, strategy[0]))
+        choices_p2.append(normal_game.action_index(1, strategy[1]))
     return RandomChoice(choices_p1, "Picking Pareto Optimal"), RandomChoice(choices_p2, "Picking Pareto Optimal")
 
 
 def get_nash_equilibria_players(normal_game):
-    nash_equilibria = normal_game.find_nash_equilibria()
+    from gametheory.player import RandomChoice
+    nash_equilibria = normal_game.find_pure_equilibrium_profiles()
     choices_p1 = []
     choices_p2 = []
-    for strategy in nash_equilibria:
-        choices_p1.append(get_action_index(strategy[0], len(payoff_matrix))[1])
-        choices_p2.append(get_action_index(strategy[1], len(payoff_matrix))[1])
+    for action1, action2 in nash_equilibria:
+        choices_p1.append(action1)
+        choices_p2.append(action2)
     return RandomChoice(choices_p1, "Picking Nash Equilibria"), RandomChoice(choices_p2, "Picking Nash Equilibria")
 
 
 def get_minimax_players(normal_game):
+    from gametheory.player import RandomChoice
     minimax_strategy = normal_game.find_minimax_strategy()
     choices_p1 = []
     choices_p2 = []
     for strategy in minimax_strategy[0]:
-        choices_p1.append(get_action_index(strategy, len(payoff_matrix))[1])
+        choices_p1.append(normal_game.action_index(0, strategy))
     for strategy in minimax_strategy[1]:
-        choices_p2.append(get_action_index(strategy, len(payoff_matrix))[1])
+        choices_p2.append(normal_game.action_index(1, strategy))
     return RandomChoice(choices_p1, "Picking Minimax"), RandomChoice(choices_p2, "Picking Minimax")
 
 
-if __name__ == '__main__':
-    for file in ["data/prog4A.txt", "data/prog4B.txt", "data/prog4C.txt"]:
-        normal_game = NormalFormGame(file)
-        normal_game.report(file)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyze the example games and simulate matches on them")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each analysis phase and trace peak memory, then print a summary")
+    parser.add_argument("--profile-json", default=None, help="also write the profile to this JSON file")
+    parser.add_argument("--cache", default=None, help="a directory of analysis results kept across runs")
+    args = parser.parse_args(argv)
+
+    # The analysis modules are only imported once the arguments are known to be good, so --help stays fast
+    from gametheory.instrumentation import Profile
+    from gametheory.normal_form_game import NormalFormGame
+    from gametheory.player import AlwaysCooperate, AlwaysDefect, Game, Grudge, Random, TitForTat
+    profiling = args.profile or args.profile_json is not None
+    cache = None
+    if args.cache is not None:
+        from gametheory.result_cache import ResultCache
+        cache = ResultCache(args.cache)
+    with Profile(trace_memory=True) if profiling else contextlib.nullcontext() as profile:
+        # Each game is parsed and analyzed once, the simulations below reuse its cached results
+        normal_games = {}
+        for file in ["data/prog4A.txt", "data/prog4B.txt", "data/prog4C.txt"]:
+            normal_game = NormalFormGame(file)
+            if cache is not None:
+                cache.load(normal_game)
+            normal_game.report(file)
+            if cache is not None:
+                cache.store(normal_game)
+            normal_games[file] = normal_game
+
+        Game(1000, Grudge(), AlwaysDefect())
 
-    Game(1000, Grudge(), AlwaysDefect())
+        Game(1000, AlwaysCooperate(), AlwaysDefect())
 
-    Game(1000, AlwaysCooperate(), AlwaysDefect())
+        Game(1000, Random(), AlwaysDefect())
 
-    Game(1000, Random(), AlwaysDefect())
+        Game(1000, TitForTat(), AlwaysCooperate())
 
-    Game(1000, TitForTat(), AlwaysCooperate())
+        Game(100, TitForTat(), Random())
 
-    Game(100, TitForTat(), Random())
+        for filename, normal_game in normal_games.items():
+            print(f"------------------Simulating games for {filename}-----------------")
+            print()
+            payoff_matrix = normal_game.payoff_array
 
-    for filename in ["data/prog4A.txt", "data/prog4B.txt", "data/prog4C.txt"]:
-        print(f"------------------Simulating games for {filename}-----------------")
-        print()
-        with open(filename) as file:
-            content = file.read()
-        payoff_matrix = parse_payoff(content)
-        normal_game = NormalFormGame(payoff_matrix)
+            Game(1000, Random(), Random(), payoff_matrix)
 
-        Game(1000, Random(), Random(), payoff_matrix)
+            player1, player2 = get_pareto_optimal_players(normal_game)
+            Game(1000, player1, player2, payoff_matrix)
 
-        player1, player2 = get_pareto_optimal_players(normal_game)
-        Game(1000, player1, player2, payoff_matrix)
+            player1, player2 = get_nash_equilibria_players(normal_game)
+            Game(1000, player1, player2, payoff_matrix)
 
-        player1, player2 = get_nash_equilibria_players(normal_game)
-        Game(1000, player1, player2, payoff_matrix)
+            player1, player2 = get_minimax_players(normal_game)
+            Game(1000, player1, player2, payoff_matrix)
+            print()
 
-        player1, player2 = get_minimax_players(normal_game)
-        Game(1000, player1, player2, payoff_matrix)
-        print()
+    if args.profile:
+        print(profile.report())
+    if args.profile_json is not None:
+        with open(args.profile_json, "w") as file:
+            json.dump(profile.as_dict(), file, indent=1)
+
+
+if __name__ == '__main__':
+    main()